@@ -1,6 +1,7 @@
 
 CONFIG_FILENAME = "config.json"
 INTER_FILE_TRANSLATION_DELAY_SECONDS = 5 
+MAX_CONCURRENT_CHUNK_TRANSLATIONS = 4
 
 CACHE_DIR_NAME = "translate_cache"
 CORRESPONDENCE_CACHE_FILENAME = "correspondence_cache.csv"
@@ -1,6 +1,7 @@
 from difflib import SequenceMatcher
 import os
 from pathlib import Path
+from typing import Iterable
 
 from trans_lib.helpers import read_string_from_file
 
@@ -9,18 +10,43 @@ def diff_score(a: str, b: str) -> float:
     return SequenceMatcher(None, a, b).ratio()
 
 
-def get_best_match_in_dir(dir: Path, txt: str) -> tuple[str, float]:
+def read_dir_chunks(dir: Path) -> dict[str, str]:
     """
-    Returns the best match between the provided chunk and all the chunks in the given directory.
+    Returns `file name (checksum) -> contents` of every chunk file in the given directory.
+    """
+    chunks: dict[str, str] = {}
+    with os.scandir(dir) as entries:
+        for entry in entries:
+            if entry.is_file():
+                chunks[entry.name] = read_string_from_file(Path(entry.path))
+    return chunks
+
+def get_best_match_in_chunks(chunks: Iterable[tuple[str, str]], txt: str) -> tuple[str, str, float]:
     """
-    _, _, files = list(os.walk(dir))[0]
-    best_txt, best_score = "", 0.
+    Returns the best match between the provided chunk and the given (checksum, contents) pairs.
 
-    for file in files:
-        contents = read_string_from_file(dir / file)
-        score = diff_score(contents, txt)
+    Returns:
+        checksum, contents, score
+    """
+    checksum, best_txt, best_score = "", "", 0.
+
+    # the matcher indexes its second sequence once, the candidates are swapped in as the first one
+    matcher = SequenceMatcher(None, "", txt)
+    for name, contents in chunks:
+        matcher.set_seq1(contents)
+        # cheap upper bounds of ratio(): a candidate that can't beat the best score is skipped
+        if matcher.real_quick_ratio() <= best_score or matcher.quick_ratio() <= best_score:
+            continue
+        score = matcher.ratio()
         if score > best_score:
-            best_txt, best_score = contents, score
+            checksum, best_txt, best_score = name, contents, score
+    return checksum, best_txt, best_score
+
+def get_best_match_in_dir(dir: Path, txt: str) -> tuple[str, float]:
+    """
+    Returns the best match between the provided chunk and all the chunks in the given directory.
+    """
+    _, best_txt, best_score = get_best_match_in_chunks(read_dir_chunks(dir).items(), txt)
     return best_txt, best_score
 
 def get_checksum_for_best_match_in_dir(dir: Path, txt: str) -> tuple[str, float]:
@@ -30,12 +56,5 @@ def get_checksum_for_best_match_in_dir(dir: Path, txt: str) -> tuple[str, float]
     Returns:
         checksum, score
     """
-    _, _, files = list(os.walk(dir))[0]
-    checksum, best_score = "", 0.
-
-    for file in files:
-        contents = read_string_from_file(dir / file)
-        score = diff_score(contents, txt)
-        if score > best_score:
-            checksum, best_score = file, score
+    checksum, _, best_score = get_best_match_in_chunks(read_dir_chunks(dir).items(), txt)
     return checksum, best_score
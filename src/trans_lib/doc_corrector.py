@@ -14,11 +14,23 @@ from trans_lib.translator_corrector import correct_chunk_translation
 
 def correct_jupyter_notebook_translation(root_path: Path, tgt_path: Path, tgt_lang: Language, src_lang: Language, relative_path: str) -> bool:
     nb = jupytext.read(tgt_path)
+    cells = [cell for cell in nb.cells if (cell.get("metadata") or {}).get("src_checksum") is not None]
     res = False
-    for i in range(len(nb.cells)):
-        res = correct_jupyter_cell(root_path, nb.cells[i], tgt_lang, src_lang, relative_path) or res 
+    for cell in _cells_needing_correction(root_path, cells, tgt_lang, src_lang, relative_path, lambda c: c["metadata"]["src_checksum"]):
+        res = correct_jupyter_cell(root_path, cell, tgt_lang, src_lang, relative_path) or res
     return res
 
+def _cells_needing_correction(root_path: Path, cells: list, target_language: Language, source_language: Language, relative_path: str, get_src_checksum=lambda c: c["src_checksum"]) -> list:
+    """
+    Returns the cells whose translation doesn't correspond to their source in the cache, checking all of them in one batch
+    """
+    if not cells:
+        return []
+    store = TranslationCacheCsv(root_path)
+    pairs = [(get_src_checksum(cell), cell["source"]) for cell in cells]
+    corresponds = store.do_translations_correspond_to_sources(pairs, source_language, target_language, relative_path)
+    return [cell for cell, ok in zip(cells, corresponds) if not ok]
+
 def correct_jupyter_cell(root_path: Path, cell: dict, target_language: Language, source_language: Language, relative_path: str) -> bool:
     tgt_txt = cell["source"]
     metadata = cell.get("metadata")
@@ -60,15 +72,15 @@ def correct_myst_cell(root_path: Path, cell: dict, target_language: Language, so
 def correct_latex_document_translation(root_path: Path, tgt_path: Path, tgt_lang: Language, src_lang: Language, relative_path: str) -> bool:
    cells = read_chunks_with_metadata_from_latex(tgt_path) 
    res = False
-   for i in range(len(cells)):
-       res = correct_latex_cell(root_path, cells[i], tgt_lang, src_lang, relative_path) or res 
+   for cell in _cells_needing_correction(root_path, cells, tgt_lang, src_lang, relative_path):
+       res = correct_latex_cell(root_path, cell, tgt_lang, src_lang, relative_path) or res
    return res
 
 def correct_myst_document_translation(root_path: Path, tgt_path: Path, tgt_lang: Language, src_lang: Language, relative_path: str) -> bool:
    cells = read_chunks_with_metadata_from_myst(tgt_path) 
    res = False
-   for i in range(len(cells)):
-       res = correct_myst_cell(root_path, cells[i], tgt_lang, src_lang, relative_path) or res 
+   for cell in _cells_needing_correction(root_path, cells, tgt_lang, src_lang, relative_path):
+       res = correct_myst_cell(root_path, cell, tgt_lang, src_lang, relative_path) or res
    return res
 
 def correct_file_translation(root_path: Path, translated_file_path: Path, translate_lang: Language, source_language: Language, relative_path: str) -> bool:
@@ -3,8 +3,9 @@ from unified_model_caller import LLMCaller
 
 from trans_lib.doc_translator_mod import myst_file_translator
 from trans_lib.vocab_list import VocabList
-from .enums import DocumentType, Language
-from .translator import LLM_API_KEY, LLM_REASONING_API_KEY, translate_contents_async
+from .enums import ChunkType, DocumentType, Language
+from .translator import LLM_API_KEY, LLM_REASONING_API_KEY, aclose_model_clients, translate_contents_async
+from .translator_retrieval import content_type_for
 from .helpers import read_string_from_file, analyze_document_type
 from .errors import TranslationProcessError
 from .doc_translator_mod.notebook_file_translator import translate_notebook_async
@@ -14,7 +15,8 @@ from .doc_translator_mod import latex_file_translator, typst_file_translator
 async def translate_file_async(source_path: Path, target_language: Language, vocab_list: VocabList | None) -> str:
     """Reads a file, translates its content asynchronously, and returns the translated content."""
     file_contents = read_string_from_file(source_path)
-    return await translate_contents_async(file_contents, target_language, 50, vocab_list)
+    content_type = content_type_for(analyze_document_type(source_path), ChunkType.Other, None)
+    return await translate_contents_async(file_contents, target_language, 50, vocab_list, content_type)
 
 
 async def translate_file_to_file_async(
@@ -74,3 +76,6 @@ async def translate_file_to_file_async(
             target_path.write_text(translated_content, encoding="utf-8")
     except IOError as e:
         raise TranslationProcessError(f"Failed to write translated file {target_path}: {e}", original_exception=e)
+    finally:
+        # the clients' connections are bound to this event loop, they aren't left open after the file
+        await aclose_model_clients()
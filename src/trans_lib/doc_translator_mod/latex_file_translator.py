@@ -1,9 +1,8 @@
 from unified_model_caller import LLMCaller
-from ..prompts import prompt4
 from pathlib import Path
 
 from trans_lib.doc_translator_mod.latex_chunker import split_latex_document_into_chunks
-from trans_lib.translator_retrieval import ChunkTranslator, Meta, build_translator_with_model
+from trans_lib.translator_retrieval import ChunkTranslator, Meta, build_translator_with_model, gather_bounded
 from trans_lib.vocab_list import VocabList
 from ..enums import ChunkType, DocumentType, Language
 from ..helpers import calculate_checksum
@@ -67,9 +66,15 @@ async def translate_file_async(
 
     cells = get_latex_cells(source_file_path)
 
-    for i in range(len(cells)):
-        cell = cells[i]
-        cells[i] = await translate_chunk_async(cell, source_language, target_language, relative_path, vocab_list, tr, existing_meta)
+    # the chunks are independent: they are translated concurrently, in a bounded number
+    try:
+        cells = await gather_bounded(
+            translate_chunk_async(cell, source_language, target_language, relative_path, vocab_list, tr, existing_meta)
+            for cell in cells
+        )
+    finally:
+        # writes the translations persisted so far, even when a chunk failed
+        await tr.aclose()
 
     with open(target_file_path, "w") as f:
         f.write(compile_latex_cells(cells))
@@ -86,7 +91,7 @@ async def translate_chunk_async(
 ) -> dict:
    """Handler for a latex chunk translation"""
    src_txt = cell["source"]
-   logger.debug(f"{src_txt}")
+   logger.debug("{}", src_txt)
    checksum = calculate_checksum(src_txt)
 
    cell["metadata"]["src_checksum"] = checksum
@@ -104,10 +109,6 @@ async def translate_chunk_async(
 
    return cell
 
-def get_latex_prompt_text() -> str:
-    """Returns the default prompt for translating LaTeX documents"""
-    return prompt4
-
 async def translate_any_chunk_async(
     contents: str,
     source_language: Language,
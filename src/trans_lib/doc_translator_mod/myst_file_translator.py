@@ -7,7 +7,7 @@ from trans_lib.doc_translator_mod.myst_chunker import split_myst_document_into_c
 from trans_lib.enums import ChunkType, DocumentType, Language
 from trans_lib.helpers import calculate_checksum
 from trans_lib.errors import ChunkTranslationFailed
-from trans_lib.translator_retrieval import ChunkTranslator, Meta, build_translator_with_model
+from trans_lib.translator_retrieval import ChunkTranslator, Meta, build_translator_with_model, gather_bounded
 from trans_lib.vocab_list import VocabList
 
 
@@ -68,9 +68,15 @@ async def translate_file_async(
 
     cells = get_myst_cells(source_file_path)
 
-    for i in range(len(cells)):
-        cell = cells[i]
-        cells[i] = await translate_chunk_async(cell, source_language, target_language, relative_path, vocab_list, tr, existing_meta)
+    # the chunks are independent: they are translated concurrently, in a bounded number
+    try:
+        cells = await gather_bounded(
+            translate_chunk_async(cell, source_language, target_language, relative_path, vocab_list, tr, existing_meta)
+            for cell in cells
+        )
+    finally:
+        # writes the translations persisted so far, even when a chunk failed
+        await tr.aclose()
 
     with open(target_file_path, "w") as f:
         f.write(compile_myst_cells(cells))
@@ -87,7 +93,7 @@ async def translate_chunk_async(
 ) -> dict:
    """Handler for a myst chunk translation"""
    src_txt = cell["source"]
-   logger.debug(f"{src_txt}")
+   logger.debug("{}", src_txt)
    checksum = calculate_checksum(src_txt)
 
    cell["metadata"]["src_checksum"] = checksum
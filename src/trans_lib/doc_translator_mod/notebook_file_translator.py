@@ -2,7 +2,7 @@ from unified_model_caller import LLMCaller
 from ..prompts import prompt_jupyter_code, prompt_jupyter_md 
 from pathlib import Path
 
-from trans_lib.translator_retrieval import ChunkTranslator, CodeMeta, Meta, build_translator_with_model
+from trans_lib.translator_retrieval import ChunkTranslator, CodeMeta, Meta, build_translator_with_model, gather_bounded
 from trans_lib.errors import ChunkTranslationFailed
 from trans_lib.vocab_list import VocabList
 from ..enums import ChunkType, DocumentType, Language
@@ -26,8 +26,15 @@ async def translate_notebook_async(
     tr = build_translator_with_model(root_path, llm_caller, reasoning_caller)
 
     nb = jupytext.read(source_file_path)
-    for i in range(len(nb.cells)):
-        nb.cells[i] = await translate_jupyter_cell_async(nb.cells[i], source_language, target_language, vocab_list, tr, relative_path, existing_meta)
+    # the cells are independent: they are translated concurrently, in a bounded number
+    try:
+        nb.cells = await gather_bounded(
+            translate_jupyter_cell_async(cell, source_language, target_language, vocab_list, tr, relative_path, existing_meta)
+            for cell in nb.cells
+        )
+    finally:
+        # writes the translations persisted so far, even when a chunk failed
+        await tr.aclose()
     jupytext.write(nb, target_file_path, fmt={"notebook_metadata_filter": "all"})
 
 async def translate_jupyter_cell_async(
@@ -8,6 +8,9 @@ from typst_syntax import SyntaxKind, parse_source
 
 MAX_INLINE_CHUNK_LENGTH = 600
 
+# split points for oversized text, by preference: paragraph break, newline, after a sentence, any whitespace
+_SPLIT_BOUNDARY_RE = re.compile(r"\n\s*\n+|\n|(?<=\.)\s+|\s+")
+
 _BLOCK_LEVEL_KINDS = {
     SyntaxKind.HEADING,
     SyntaxKind.RAW,
@@ -268,13 +271,12 @@ def _complete_section_chunks(
 
         # Prefer splitting near the size limit at natural boundaries.
         min_split = max(1, int(max_chars_num * 0.6))
-        boundary = re.compile(r"\n\s*\n+|\n|(?<=\.)\s+|\s+")
 
         pieces: list[str] = []
         rest = long_text
         while len(rest) > max_chars_num:
             candidate = 0
-            for match in boundary.finditer(rest[: max_chars_num + 1]):
+            for match in _SPLIT_BOUNDARY_RE.finditer(rest[: max_chars_num + 1]):
                 split_idx = match.end()
                 if split_idx >= min_split:
                     candidate = split_idx
@@ -9,7 +9,7 @@ from trans_lib.doc_translator_mod.typst_chunker import split_typst_document_into
 from trans_lib.enums import ChunkType, DocumentType, Language
 from trans_lib.errors import ChunkTranslationFailed
 from trans_lib.helpers import calculate_checksum
-from trans_lib.translator_retrieval import ChunkTranslator, Meta, build_translator_with_model
+from trans_lib.translator_retrieval import ChunkTranslator, Meta, build_translator_with_model, gather_bounded
 from trans_lib.vocab_list import VocabList
 
 
@@ -60,17 +60,23 @@ async def translate_file_async(
 
     cells = get_typst_cells(source_file_path)
 
-    for index in range(len(cells)):
-        cell = cells[index]
-        cells[index] = await translate_chunk_async(
-            cell,
-            source_language,
-            target_language,
-            relative_path,
-            vocab_list,
-            tr,
-            existing_meta,
+    # the chunks are independent: they are translated concurrently, in a bounded number
+    try:
+        cells = await gather_bounded(
+            translate_chunk_async(
+                cell,
+                source_language,
+                target_language,
+                relative_path,
+                vocab_list,
+                tr,
+                existing_meta,
+            )
+            for cell in cells
         )
+    finally:
+        # writes the translations persisted so far, even when a chunk failed
+        await tr.aclose()
 
     with open(target_file_path, "w", encoding="utf-8") as file:
         file.write(compile_typst_cells(cells))
@@ -86,7 +92,7 @@ async def translate_chunk_async(
     existing_meta: dict[str, dict] | None = None,
 ) -> dict:
     src_txt = cell["source"]
-    logger.debug(f"{src_txt}")
+    logger.debug("{}", src_txt)
     checksum = calculate_checksum(src_txt)
 
     cell["metadata"]["src_checksum"] = checksum
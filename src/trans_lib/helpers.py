@@ -4,15 +4,46 @@ from pathlib import Path
 import shutil
 from typing import List, Optional, Iterable
 import hashlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 from trans_lib.constants import CONF_DIR
 from trans_lib.enums import DocumentType
 
+# below this many texts, a thread pool costs more than it saves
+_PARALLEL_HASHING_MIN_CHUNKS = 256
+
+# the memo keeps its keys alive: 4096 entries of at most 16k characters bound it to
+# about 64M characters, longer texts are hashed without being memoized
+_MAX_MEMOIZED_CHECKSUMS = 4096
+_MAX_MEMOIZED_CHECKSUM_LENGTH = 16_000
+_EMPTY_CHECKSUM = hashlib.sha256(b"").hexdigest()
+
+def _sha256_hexdigest(contents: str) -> str:
+    return hashlib.sha256(contents.encode('utf-8')).hexdigest()
+
+_memoized_sha256_hexdigest = functools.lru_cache(maxsize=_MAX_MEMOIZED_CHECKSUMS)(_sha256_hexdigest)
+
 def calculate_checksum(contents: str) -> str:
     """
-    Returns a checksum of the provided contents
+    Returns a checksum of the provided contents (memoized, the same chunk is
+    hashed several times per translation run)
     """
-    return hashlib.sha256(contents.encode('utf-8')).hexdigest()
+    if not contents:
+        return _EMPTY_CHECKSUM
+    if len(contents) > _MAX_MEMOIZED_CHECKSUM_LENGTH:
+        return _sha256_hexdigest(contents)
+    return _memoized_sha256_hexdigest(contents)
+
+def calculate_checksums(contents: List[str]) -> List[str]:
+    """
+    Returns the checksums of the provided texts, in order. Long lists are hashed
+    on several threads: hashlib releases the GIL while hashing large inputs.
+    """
+    if len(contents) < _PARALLEL_HASHING_MIN_CHUNKS:
+        return [calculate_checksum(text) for text in contents]
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(calculate_checksum, contents, chunksize=64))
 
 def normalize_relative_path(path: Path | str) -> str:
     """Converts any Path-like input to a normalized POSIX relative string."""
@@ -132,30 +163,38 @@ def extract_translated_from_response(message: str) -> str:
     3. Returns empty string if neither are found.
     """
     
-    if "<output>" in message:
-        res_list = []
-        current_pos = 0
+    start_idx = message.find("<output>")
+    if start_idx != -1:
+        # the leading newline of a segment is skipped by index, each segment is sliced once
+        start_idx += len("<output>")
+        if message.startswith("\n", start_idx):
+            start_idx += 1
+        end_idx = message.find("</output>", start_idx)
+        # Common case: a single <output> segment, sliced out without building a list.
+        if end_idx == -1:
+            return message[start_idx:]
+        if message.find("<output>", end_idx + len("</output>")) == -1:
+            return message[start_idx:end_idx]
+
+        res_list = [message[start_idx:end_idx]]
+        current_pos = end_idx + len("</output>")
         while True:
             start_idx = message.find("<output>", current_pos)
             if start_idx == -1:
                 break
             start_idx += len("<output>")
-            
+            if message.startswith("\n", start_idx):
+                start_idx += 1
+
             end_idx = message.find("</output>", start_idx)
-            if end_idx == -1: 
+            if end_idx == -1:
                 # No closing tag: take the rest of the string
-                segment = message[start_idx:]
-                if segment.startswith("\n"):
-                     segment = segment[1:]
-                res_list.append(segment)
-                break 
+                res_list.append(message[start_idx:])
+                break
 
-            segment = message[start_idx:end_idx]
-            if segment.startswith("\n"):
-                segment = segment[1:]
-            res_list.append(segment)
+            res_list.append(message[start_idx:end_idx])
             current_pos = end_idx + len("</output>")
-            
+
         return "".join(res_list)
 
     elif "<document>" in message:
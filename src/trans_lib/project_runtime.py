@@ -8,6 +8,7 @@ from loguru import logger
 from .doc_corrector import correct_file_translation
 from .doc_translator import translate_file_to_file_async
 from .translation_cache.translation_cache import TranslationCacheCsv
+from .translation_cache.cache_backend import flush_translation_cache
 from .translation_cache.cache_cleaner import CacheClearStats, CacheDeleteStats, clear_all, clear_missing_chunks
 from .translation_cache.cache_rebuilder import collect_translation_pairs
 from .helpers import analyze_document_type, calculate_checksum
@@ -79,6 +80,8 @@ def _correct_translation_file(project: Project, target_path: Path, target_lang:
         raise CorrectTranslationError(f"Correcting process failed for {target_path.name}: {e}", e)
     except IOError as e:
         raise CorrectTranslationError(f"IO error during correction of {target_path.name}: {e}", e)
+    finally:
+        flush_translation_cache(project.root_path)
 
 
 def correct_translation_for_lang(project: Project, target_lang: Language) -> None:
@@ -232,6 +235,7 @@ def sync_translation_cache(project: Project, target_lang: Language | None = None
                 )
                 synced_pairs += 1
 
+    store.flush()
     logger.info(
         "Synced {} translation chunk pairs from {} files for {} target language(s).",
         synced_pairs,
@@ -391,6 +395,8 @@ async def translate_single_file(
         raise TranslateFileError(f"Translation process failed for {file_path.name}: {e}", e)
     except IOError as e:
         raise TranslateFileError(f"IO error during translation of {file_path.name}: {e}", e)
+    finally:
+        flush_translation_cache(project.root_path)
 
 
 async def translate_all_for_language(
@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 prompt4 = r'''
 You are a specialized translation assistant proficient in handling various document formats (e.g., LaTeX, Markdown, MyST, Typst, or Jupyter Notebooks).
 Your task is to **translate only the natural language content** into **[TARGET_LANGUAGE]**, while **preserving the input exactly as-is** — including syntax, layout, and errors.
@@ -59,21 +61,9 @@ Once the source language is identified, you **must** translate **every instance*
 *   **Natural language text appearing as arguments to commands or directives.** This is critical and non-negotiable. Translate the content inside `\text{...}`, `\textit{...}`, `\textbf{...}`, `\emph{...}`, `\caption{...}`, `\title{...}`, `\author{...}`, `\section{...}` (and its variants like `\subsection`, `\subsubsection`), `\item` (both the optional argument in `[...]` and the text following the `\item` command itself before any subsequent LaTeX command or math environment), `\footnote{...}`, `\underline{...}`.
     **Crucially, this also applies to natural language content within MyST/Sphinx directives, such as the title of an admonition (e.g., `:::{admonition} [TRANSLATE THIS TEXT]`) or the primary text argument of a `%{definiendum}` directive (e.g., `%{definiendum}`[TRANSLATE THIS TEXT] <preserve_this_label>`).**
     Every word of source language within these arguments must be translated.
-    *   Example (Source: Ukrainian, Target: English): `\textit{Це приклад}` -> `\textit{It is an example}`.
-    *   Example (Source: French, Target: Ukrainian): `\item Soit $I^+ = $ ensemble des $C \ge 0$ telle que ... alors. \\` -> `\item Нехай $I^+ = $ множина $C \ge 0$ така що ... тоді. \\`.
-    *   Example (Source: French, Target: Ukrainian): `\text{tq}` -> `\text{така що}`. (Treat common abbreviations as translatable natural language).
-    *   Example (Source: English, Target: French): `\text{st}` -> `\text{such that}`. (Treat common abbreviations as translatable natural language).
-    *   Example (Source: French, Target: Ukrainian): `\section{Introduction}` -> `\section{Вступ}`.
-    *   Example (Source: Ukrainian, Target: English): `\section{Вступ}` -> `\section{Introduction}`.
-    *   Example (Source: French, MyST, Target: Ukrainian): `:::{admonition} Définition : Programmes` -> `:::{admonition} Визначення: Програми`
-    *   Example (Source: French, MyST, Target: Ukrainian): `%{definiendum}`Programme <programme>` :` -> `%{definiendum}`Програма <програма>` :`
-    *   Example (Source: French, MyST, Target: Ukrainian): `Une {definiendum}`expression` est une combinaison de {definiendum}`valeurs <valeur>` par` -> `Вираз {definiendum}`вираз` — це поєднання {definiendum}`значень <значення>` за допомогою` (illustrating surrounding natural language translation).
+[ARGUMENT_EXAMPLES]
 *   **Short phrases or sentences of natural language from the source language, INCLUDING single words or common connecting words (e.g., 'Soit', 'donc', 'et', 'où', 'si', 'alors', 'car', 'pour', 'est', 'sont', 'Hyp:', 'preuve:', 'eg:', 'on pose:', 'distance usuelle dans').** These must be translated, even if they are immediately adjacent to or interspersed with mathematical expressions or other syntax. Do not omit them. Your goal is 100% translation of all source natural language.
-    *   Example (Source: French, Target: Ukrainian): `Soit $C \in I^+$ donc` -> `Нехай $C \in I^+$ тому`.
-    *   Example (Source: French, Target: Ukrainian): `C'est vrai si $x > 0$.` -> `Це правда якщо $x > 0$.`.
-    *   Example (Source: French, Target: English): `$d(X,Y)$ distance usuelle dans $\R^2$` -> `$d(X,Y)$ usual distance in $\R^2$`.
-    *   Example (Source: French, Target: Ukrainian): `on pose:` -> `покладемо:`.
-    *   Example (Source: French, Target: Ukrainian): `\text{ si } X, 0, Y \text{ alignés}` -> `\text{ якщо } X, 0, Y \text{ вирівняні}`. (Notice "si" and "alignés" are translated, "X,0,Y" is not as it's not in a `\text{}` here).
+[PHRASE_EXAMPLES]
 
 Do **not escape**, fix, or reformat anything. Keep:
 
@@ -503,7 +493,6 @@ Instructions:
     [CUSTOM_VOCABULARY]
     </custom_vocabulary>
 
-
 Output Format:
 <output>
 <document>
@@ -513,7 +502,7 @@ Output Format:
 </document>
 </output>
 
-Don't cover the output in any Markdown or XML environments like (```) etc. 
+Don't cover the output in any Markdown or XML environments like (```) etc.
 
 The document is provided below:
 [SRC]
@@ -552,7 +541,7 @@ You are provided with:
 </document>
 </output>
 
-Don't cover the output in any Markdown or XML environments like (```) etc. 
+Don't cover the output in any Markdown or XML environments like (```) etc.
 
 ### Provided Input:
 
@@ -565,3 +554,78 @@ Don't cover the output in any Markdown or XML environments like (```) etc.
 #### New Source:
 [SRC]
 '''
+
+
+@dataclass(frozen=True)
+class PromptExample:
+    """
+    A single few-shot example of `prompt4`. `group` names the slot it belongs to
+    and `content_type` is None for examples that are not format specific.
+    """
+    group: str
+    source_language: str
+    target_language: str
+    content_type: str | None
+    text: str
+
+    def render(self) -> str:
+        content_type = f", {self.content_type}" if self.content_type else ""
+        return f"    *   Example (Source: {self.source_language}{content_type}, Target: {self.target_language}): {self.text}"
+
+
+PROMPT4_EXAMPLES: tuple[PromptExample, ...] = (
+    PromptExample("argument", "Ukrainian", "English", None, r'`\textit{Це приклад}` -> `\textit{It is an example}`.'),
+    PromptExample("argument", "French", "Ukrainian", None, r'`\item Soit $I^+ = $ ensemble des $C \ge 0$ telle que ... alors. \\` -> `\item Нехай $I^+ = $ множина $C \ge 0$ така що ... тоді. \\`.'),
+    PromptExample("argument", "French", "Ukrainian", None, r'`\text{tq}` -> `\text{така що}`. (Treat common abbreviations as translatable natural language).'),
+    PromptExample("argument", "English", "French", None, r'`\text{st}` -> `\text{such that}`. (Treat common abbreviations as translatable natural language).'),
+    PromptExample("argument", "French", "Ukrainian", None, r'`\section{Introduction}` -> `\section{Вступ}`.'),
+    PromptExample("argument", "Ukrainian", "English", None, r'`\section{Вступ}` -> `\section{Introduction}`.'),
+    PromptExample("argument", "French", "Ukrainian", 'MyST', r'`:::{admonition} Définition : Programmes` -> `:::{admonition} Визначення: Програми`'),
+    PromptExample("argument", "French", "Ukrainian", 'MyST', r'`%{definiendum}`Programme <programme>` :` -> `%{definiendum}`Програма <програма>` :`'),
+    PromptExample("argument", "French", "Ukrainian", 'MyST', r'`Une {definiendum}`expression` est une combinaison de {definiendum}`valeurs <valeur>` par` -> `Вираз {definiendum}`вираз` — це поєднання {definiendum}`значень <значення>` за допомогою` (illustrating surrounding natural language translation).'),
+    PromptExample("phrase", "French", "Ukrainian", None, r'`Soit $C \in I^+$ donc` -> `Нехай $C \in I^+$ тому`.'),
+    PromptExample("phrase", "French", "Ukrainian", None, r"`C'est vrai si $x > 0$.` -> `Це правда якщо $x > 0$.`."),
+    PromptExample("phrase", "French", "English", None, r'`$d(X,Y)$ distance usuelle dans $\R^2$` -> `$d(X,Y)$ usual distance in $\R^2$`.'),
+    PromptExample("phrase", "French", "Ukrainian", None, r'`on pose:` -> `покладемо:`.'),
+    PromptExample("phrase", "French", "Ukrainian", None, r'''`\text{ si } X, 0, Y \text{ alignés}` -> `\text{ якщо } X, 0, Y \text{ вирівняні}`. (Notice "si" and "alignés" are translated, "X,0,Y" is not as it's not in a `\text{}` here).'''),
+)
+
+PROMPT4_EXAMPLE_SLOTS = {
+    "[ARGUMENT_EXAMPLES]": "argument",
+    "[PHRASE_EXAMPLES]": "phrase",
+}
+
+
+def select_prompt_examples(
+    group: str,
+    source_language: str | None = None,
+    target_language: str | None = None,
+    content_type: str | None = None,
+    limit: int | None = None,
+) -> list[PromptExample]:
+    """
+    Returns the examples of the group, the most relevant to the language pair
+    and the content type first. Examples are ranked by how many of these they
+    match, so a group never comes back empty for an unknown language pair.
+    Examples specific to another content type than the given one are left out.
+    `limit` keeps only that many of the best ones.
+    """
+    def score(example: PromptExample) -> int:
+        res = 0
+        if example.source_language == source_language:
+            res += 2
+        if example.target_language == target_language:
+            res += 2
+        if example.content_type is not None and example.content_type == content_type:
+            res += 1
+        return res
+
+    candidates = [
+        example
+        for example in PROMPT4_EXAMPLES
+        if example.group == group
+        and (content_type is None or example.content_type is None or example.content_type == content_type)
+    ]
+    candidates.sort(key=score, reverse=True)
+    return candidates if limit is None else candidates[:limit]
+
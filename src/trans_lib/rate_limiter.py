@@ -0,0 +1,148 @@
+import asyncio
+import re
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+
+class AsyncRateLimiter:
+    """
+    Lets at most `max_rate` requests start per `time_period` seconds, up to `burst`
+    of them at once, without blocking the event loop while waiting.
+
+    Each `acquire` reserves its start time synchronously (generic cell rate
+    algorithm), so no lock is needed and the limiter can be shared by
+    coroutines of different event loops.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0, burst: int = 1) -> None:
+        if max_rate <= 0 or time_period <= 0:
+            raise ValueError("max_rate and time_period must be positive")
+        self._interval = time_period / max_rate
+        self._tolerance = (max(1, burst) - 1) * self._interval
+        self._theoretical_arrival = 0.0
+
+    def _reserve(self) -> float:
+        """Reserves the next start slot and returns how long to wait for it."""
+        now = time.monotonic()
+        arrival = max(self._theoretical_arrival, now)
+        self._theoretical_arrival = arrival + self._interval
+        return max(0.0, arrival - self._tolerance - now)
+
+    def pause(self, seconds: float) -> None:
+        """Makes every request wait at least `seconds` from now, e.g. after the provider asked to back off."""
+        resume_at = time.monotonic() + seconds + self._tolerance
+        self._theoretical_arrival = max(self._theoretical_arrival, resume_at)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Waits for the next start slot; `tokens` is ignored, only requests are counted."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+class SlidingWindowLimiter:
+    """
+    Lets at most `max_requests` requests and `max_tokens` tokens start in any
+    `window` seconds (either limit may be None), waiting without blocking the
+    event loop until the oldest entries leave the window.
+
+    The check and the reservation are done under a lock that is never held
+    across an await, so one limiter can be shared by several translators.
+    """
+
+    def __init__(self, max_requests: int | None, max_tokens: int | None, window: float = 60.0) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self._max_requests = max_requests
+        self._max_tokens = max_tokens
+        self._window = window
+        self._entries: deque[tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Makes every request wait at least `seconds` from now, e.g. after the provider asked to back off."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _try_reserve(self, tokens: int) -> float:
+        """Reserves the request if it fits in the window and returns 0, else returns how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            entries = self._entries
+            while entries and entries[0][0] <= now - self._window:
+                self._tokens_in_window -= entries.popleft()[1]
+            fits = (
+                self._max_requests is None or len(entries) < self._max_requests
+            ) and (
+                # a request bigger than the whole budget still goes through once the window is empty
+                self._max_tokens is None or not entries or self._tokens_in_window + tokens <= self._max_tokens
+            )
+            if fits:
+                entries.append((now, tokens))
+                self._tokens_in_window += tokens
+                return 0.0
+            return entries[0][0] + self._window - now
+
+    async def acquire(self, tokens: int = 0) -> None:
+        while True:
+            delay = self._try_reserve(tokens)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+@lru_cache(maxsize=None)
+def shared_rate_limiter(requests_per_minute: int | None, tokens_per_minute: int | None) -> SlidingWindowLimiter:
+    """Returns the process-wide limiter for these limits, shared by every translator using them."""
+    return SlidingWindowLimiter(requests_per_minute, tokens_per_minute, 60.0)
+
+
+# "Please retry in 23.5s.", "'retryDelay': '23s'", "retry after 30 seconds"
+_RETRY_HINT_RE = re.compile(r"""retry[ _-]?(?:after|in|delay)['"]?\s*[:=]?\s*['"]?(\d+(?:\.\d+)?)\s*s""", re.IGNORECASE)
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """
+    Returns the delay the provider asked for before the next request, if the error
+    or one of the errors it was raised from carries one: a `Retry-After` header on
+    the HTTP response or a retry hint in the message.
+    """
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        headers = getattr(getattr(current, "response", None), "headers", None)
+        if headers is not None:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+            try:
+                return max(0.0, float(value))
+            except (TypeError, ValueError):
+                pass  # missing, or an HTTP date
+        match = _RETRY_HINT_RE.search(str(current))
+        if match:
+            return float(match.group(1))
+        current = current.__cause__ or current.__context__
+    return None
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough token count of a prompt (about four characters per token)."""
+    return len(prompt) // 4
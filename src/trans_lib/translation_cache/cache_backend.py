@@ -1,7 +1,13 @@
+import atexit
+import contextlib
+import functools
 import os
 import csv
+import sys
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable, Iterator, TextIO
 
 from trans_lib.enums import Language
 from trans_lib.helpers import (
@@ -23,25 +29,129 @@ def _ensure_path_field(fields: list[str]) -> list[str]:
     return fields
 
 
-def ensure_cache_dir(root_path: Path) -> Path:
-    cache_full_dir_path = get_config_dir_from_root(root_path).joinpath(CACHE_DIR_NAME)
+@dataclass
+class _CorrespondenceSnapshot:
+    """
+    Parsed contents of a correspondence cache file kept in memory.
+
+    `mtime_ns` is the modification time of the file the snapshot was read from
+    (or last flushed to); `dirty` means the snapshot has changes that are not on
+    disk yet.
+
+    The first `persisted_rows` rows are the ones stored in the file. As long as
+    `needs_rewrite` is False, the pending changes are only new rows and flushing
+    appends them to the file instead of rewriting it.
+
+    `has_legacy_rows` is set when the index is built if some rows have no path
+    hash; lookups only fall back to those rows when it is set.
+    """
+    mtime_ns: int | None
+    fields: list[str]
+    rows: list[dict]
+    dirty: bool = False
+    index: dict[tuple[str, str, str], list[dict]] | None = None
+    persisted_rows: int = 0
+    needs_rewrite: bool = True
+    has_legacy_rows: bool = False
+
+
+def _index_row(index: dict[tuple[str, str, str], list[dict]], row: dict) -> None:
+    row_path_hash = row.get(PATH_CHECKSUM_COLUMN, "")
+    for field, checksum in row.items():
+        if field == PATH_CHECKSUM_COLUMN or not checksum:
+            continue
+        index.setdefault((row_path_hash, field, checksum), []).append(row)
+
+def _unindex_value(index: dict[tuple[str, str, str], list[dict]], key: tuple[str, str, str], row: dict) -> None:
+    rows = index.get(key)
+    if rows is None:
+        return
+    for i, indexed_row in enumerate(rows):
+        if indexed_row is row:
+            del rows[i]
+            break
+    if not rows:
+        del index[key]
+
+def _unindex_row(index: dict[tuple[str, str, str], list[dict]], row: dict) -> None:
+    row_path_hash = row.get(PATH_CHECKSUM_COLUMN, "")
+    for field, checksum in row.items():
+        if field == PATH_CHECKSUM_COLUMN or not checksum:
+            continue
+        _unindex_value(index, (row_path_hash, field, checksum), row)
+
+def _get_correspondence_index(snapshot: _CorrespondenceSnapshot) -> dict[tuple[str, str, str], list[dict]]:
+    """
+    Returns the `(path_hash, lang, checksum) -> rows` index of the snapshot,
+    building it on first use. Rows are kept in file order for each key.
+    """
+    if snapshot.index is None:
+        index: dict[tuple[str, str, str], list[dict]] = {}
+        has_legacy_rows = False
+        for row in snapshot.rows:
+            _index_row(index, row)
+            if not row.get(PATH_CHECKSUM_COLUMN):
+                has_legacy_rows = True
+        snapshot.index = index
+        snapshot.has_legacy_rows = has_legacy_rows
+    return snapshot.index
+
+def _find_row(snapshot: _CorrespondenceSnapshot, checksum: str, lang: str, path_hash: str) -> dict | None:
+    """
+    Returns the row holding the checksum for the given language and path, falling
+    back to legacy rows that were stored without a path hash.
+    """
+    index = _get_correspondence_index(snapshot)
+    rows = index.get((path_hash, lang, checksum))
+    if rows is None and path_hash and snapshot.has_legacy_rows:
+        rows = index.get(("", lang, checksum))
+    if rows is None:
+        return None
+    return rows[0]
+
+
+_CORRESPONDENCE_LOCK = threading.RLock()
+_CORRESPONDENCE_CACHE: dict[Path, _CorrespondenceSnapshot] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_cache_dir_cached(root_path_str: str) -> Path:
+    cache_full_dir_path = get_config_dir_from_root(Path(root_path_str)).joinpath(CACHE_DIR_NAME)
     ensure_dir_exists(cache_full_dir_path)
     return cache_full_dir_path
 
-def ensure_lang_cache_dir(root_path: Path, lang: Language) -> Path:
-    cache_full_dir_path = ensure_cache_dir(root_path)
-    lang_full_path = cache_full_dir_path.joinpath(str(lang))
+@functools.lru_cache(maxsize=None)
+def _ensure_lang_cache_dir_cached(root_path_str: str, lang_name: str) -> Path:
+    lang_full_path = _ensure_cache_dir_cached(root_path_str).joinpath(lang_name)
     ensure_dir_exists(lang_full_path)
     return lang_full_path
 
+@functools.lru_cache(maxsize=None)
+def _ensure_lang_cache_path_dir_cached(root_path_str: str, lang_name: str, path_hash: str) -> Path:
+    path_dir = _ensure_lang_cache_dir_cached(root_path_str, lang_name).joinpath(path_hash)
+    ensure_dir_exists(path_dir)
+    return path_dir
+
+def reset_ensured_cache_dirs() -> None:
+    """
+    Forgets which cache directories were already created by the `ensure_*`
+    functions. Must be called after cache directories are deleted.
+    """
+    _ensure_cache_dir_cached.cache_clear()
+    _ensure_lang_cache_dir_cached.cache_clear()
+    _ensure_lang_cache_path_dir_cached.cache_clear()
+
+def ensure_cache_dir(root_path: Path) -> Path:
+    return _ensure_cache_dir_cached(str(root_path))
+
+def ensure_lang_cache_dir(root_path: Path, lang: Language) -> Path:
+    return _ensure_lang_cache_dir_cached(str(root_path), str(lang))
+
 def ensure_lang_cache_dirs(root_path: Path, langs: Iterable[Language]) -> list[Path]:
     return [ensure_lang_cache_dir(root_path, lang) for lang in langs]
 
 def ensure_lang_cache_path_dir(root_path: Path, lang: Language, path_hash: str) -> Path:
-    lang_full_path = ensure_lang_cache_dir(root_path, lang)
-    path_dir = lang_full_path.joinpath(path_hash)
-    ensure_dir_exists(path_dir)
-    return path_dir
+    return _ensure_lang_cache_path_dir_cached(str(root_path), str(lang), path_hash)
 
 def get_lang_cache_path_dir(root_path: Path, lang: Language, path_hash: str) -> Path:
     lang_full_path = ensure_lang_cache_dir(root_path, lang)
@@ -54,47 +164,170 @@ def ensure_path_map(root_path: Path) -> Path:
     path = get_path_map_path(root_path)
     ensure_cache_dir(root_path)
     if not os.path.exists(path):
-        with open(path, "w", newline="") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=PATH_MAP_COLUMNS)
-            writer.writeheader()
+        _write_csv_header(path, PATH_MAP_COLUMNS)
     return path
 
+def _temporary_path(file_path: Path) -> Path:
+    return file_path.with_name(file_path.name + ".tmp")
+
+def _write_csv_header(file_path: Path, fields: list[str]) -> None:
+    """
+    Creates a header-only CSV file, written aside and renamed into place so
+    that a reader never sees a partially written file.
+    """
+    tmp_path = _temporary_path(file_path)
+    with open(tmp_path, "w", newline="") as csvfile:
+        csv.writer(csvfile).writerow(fields)
+    os.replace(tmp_path, file_path)
+
+@dataclass
+class _PathMapSnapshot:
+    """
+    In-memory `path_hash -> relative_path` map of a path map file; `pending`
+    holds the entries registered since the last flush.
+    """
+    mtime_ns: int | None
+    paths: dict[str, str]
+    pending: list[tuple[str, str]]
+
+
+_PATH_MAP_LOCK = threading.RLock()
+_PATH_MAP_CACHE: dict[Path, _PathMapSnapshot] = {}
+# one "a+" handle per path map, used both to (re)read the map and to append to it
+_PATH_MAP_HANDLES: dict[Path, TextIO] = {}
+
+def _path_map_handle(path_map: Path, stat: os.stat_result) -> TextIO:
+    """
+    Returns the shared handle of the path map, reopening it if the file was
+    replaced since it was opened. Must be called with `_PATH_MAP_LOCK` held.
+    """
+    handle = _PATH_MAP_HANDLES.get(path_map)
+    if handle is not None:
+        if os.path.samestat(os.fstat(handle.fileno()), stat):
+            return handle
+        handle.close()
+    handle = open(path_map, "a+", newline="")
+    _PATH_MAP_HANDLES[path_map] = handle
+    return handle
+
+def close_path_map_handles() -> None:
+    with _PATH_MAP_LOCK:
+        for handle in _PATH_MAP_HANDLES.values():
+            handle.close()
+        _PATH_MAP_HANDLES.clear()
+
+def _load_path_map_snapshot(root_path: Path) -> _PathMapSnapshot:
+    """
+    Returns the in-memory path map, (re)reading the file only if it changed on
+    disk since it was loaded. Must be called with `_PATH_MAP_LOCK` held.
+    """
+    path_map = get_path_map_path(root_path)
+    snapshot = _PATH_MAP_CACHE.get(path_map)
+    if snapshot is not None and snapshot.pending:
+        return snapshot
+
+    try:
+        stat = os.stat(path_map)
+    except FileNotFoundError:
+        stat = os.stat(ensure_path_map(root_path))
+    if snapshot is not None and snapshot.mtime_ns == stat.st_mtime_ns:
+        return snapshot
+
+    paths: dict[str, str] = {}
+    csvfile = _path_map_handle(path_map, stat)
+    csvfile.seek(0)
+    reader = csv.reader(csvfile)
+    header = next(reader, [])
+    if PATH_CHECKSUM_COLUMN in header and "relative_path" in header:
+        hash_pos = header.index(PATH_CHECKSUM_COLUMN)
+        path_pos = header.index("relative_path")
+        for values in reader:
+            if len(values) <= hash_pos or not values[hash_pos]:
+                continue
+            relative_path = values[path_pos] if len(values) > path_pos else ""
+            paths.setdefault(sys.intern(values[hash_pos]), relative_path)
+    snapshot = _PathMapSnapshot(stat.st_mtime_ns, paths, [])
+    _PATH_MAP_CACHE[path_map] = snapshot
+    return snapshot
+
 def register_path_hash(root_path: Path, relative_path: str | Path) -> str:
     normalized = normalize_relative_path(relative_path)
     path_hash = calculate_path_checksum(normalized)
-    path_map = ensure_path_map(root_path)
-
-    with open(path_map, "r", newline="") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            if row.get(PATH_CHECKSUM_COLUMN) == path_hash:
-                existing = row.get("relative_path", "")
-                if existing and existing != normalized:
-                    raise ValueError(
-                        f"Path hash collision: {path_hash} already mapped to {existing}, got {normalized}",
-                    )
-                return path_hash
-
-    with open(path_map, "a", newline="") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=PATH_MAP_COLUMNS)
-        writer.writerow({PATH_CHECKSUM_COLUMN: path_hash, "relative_path": normalized})
+
+    with _PATH_MAP_LOCK:
+        snapshot = _load_path_map_snapshot(root_path)
+        existing = snapshot.paths.get(path_hash)
+        if existing is not None:
+            if existing and existing != normalized:
+                raise ValueError(
+                    f"Path hash collision: {path_hash} already mapped to {existing}, got {normalized}",
+                )
+            return path_hash
+
+        snapshot.paths[path_hash] = normalized
+        snapshot.pending.append((path_hash, normalized))
 
     return path_hash
 
+def flush_path_map(root_path: Path) -> None:
+    """
+    Appends the paths registered since the last flush to the path map file.
+    """
+    with _PATH_MAP_LOCK:
+        _flush_path_map_snapshot(get_path_map_path(root_path))
+
+def _flush_path_map_snapshot(path_map: Path) -> None:
+    snapshot = _PATH_MAP_CACHE.get(path_map)
+    if snapshot is None or not snapshot.pending:
+        return
+    try:
+        stat = os.stat(path_map)
+        write_header = stat.st_size == 0
+    except FileNotFoundError:
+        ensure_dir_exists(path_map.parent)
+        open(path_map, "a").close()
+        stat = os.stat(path_map)
+        write_header = True
+    csvfile = _path_map_handle(path_map, stat)
+    writer = csv.writer(csvfile)
+    if write_header:
+        writer.writerow(PATH_MAP_COLUMNS)
+    writer.writerows(snapshot.pending)
+    csvfile.flush()
+    snapshot.pending.clear()
+    snapshot.mtime_ns = os.fstat(csvfile.fileno()).st_mtime_ns
+
 def add_contents_to_cache(root_path: Path, contents: str, lang: Language, path_hash: str) -> str:
     """
     Adds the given contents to the translation cache for the appropriate language/path and returns the contents checksum.
     """
+    checksum = calculate_checksum(contents)
+    write_contents_to_cache(root_path, contents, checksum, lang, path_hash)
+    return checksum
+
+def write_contents_to_cache(root_path: Path, contents: str, checksum: str, lang: Language, path_hash: str) -> None:
+    """
+    Stores the contents under an already known checksum (the caller guarantees it is the checksum of the contents),
+    unless a chunk with this checksum is already stored.
+    """
     ensure_cache_dir(root_path)
     lang_dir_full_path = ensure_lang_cache_path_dir(root_path, lang, path_hash)
-    checksum = calculate_checksum(contents)
     file_path = lang_dir_full_path.joinpath(checksum)
     if os.path.exists(file_path): # if the checksum file already exists, then no need to write it
-        return checksum
+        return
 
-    with open(file_path, "w") as f:
-        f.write(contents)
-    return checksum
+    try:
+        with open(file_path, "w") as f:
+            f.write(contents)
+    except FileNotFoundError: # the directory was removed since it was ensured
+        reset_ensured_cache_dirs()
+        file_path = ensure_lang_cache_path_dir(root_path, lang, path_hash).joinpath(checksum)
+        with open(file_path, "w") as f:
+            f.write(contents)
+
+    locations = _CHECKSUM_LOCATIONS.get(str(root_path))
+    if locations is not None:
+        locations.setdefault(checksum, (str(lang), path_hash))
 
 def read_cached_contents_by_lang(root_path: Path, checksum: str, lang: Language, path_hash: str) -> str | None:
     """
@@ -103,42 +336,65 @@ def read_cached_contents_by_lang(root_path: Path, checksum: str, lang: Language,
     Note: better performance than a full cache scan via read_contents_from_cache_by_checksum.
     """
     lang_dir_full_path = get_lang_cache_path_dir(root_path, lang, path_hash)
-    if not lang_dir_full_path.exists():
-        return None
     return _read_contents_from_cache_by_checksum_in_dir(checksum, lang_dir_full_path)
 
 def _read_contents_from_cache_by_checksum_in_dir(checksum: str, dir: Path) -> str | None:
-    if not os.path.exists(dir) or not dir.is_dir():
+    file_path = dir.joinpath(checksum)
+    if not file_path.is_file():
         return None
-    for file in dir.iterdir():
-        if not file.is_file():
-            continue
-        file_name = file.name
-        if file_name == checksum:
-            return read_string_from_file(file.absolute())
-    return None
+    return read_string_from_file(file_path)
+
+_CHECKSUM_LOCATIONS: dict[str, dict[str, tuple[str, str]]] = {}
+
+def _scan_checksum_locations(cache_dir_path: Path) -> dict[str, tuple[str, str]]:
+    """
+    Walks the chunk files of every language and returns `checksum -> (lang, path_hash)`.
+    """
+    locations: dict[str, tuple[str, str]] = {}
+    with os.scandir(cache_dir_path) as lang_entries:
+        lang_dirs = [(entry.name, entry.path) for entry in lang_entries if entry.is_dir()]
+
+    for lang_name, lang_dir in lang_dirs:
+        with os.scandir(lang_dir) as path_entries:
+            path_dirs = [(entry.name, entry.path) for entry in path_entries if entry.is_dir()]
+        for path_hash, path_dir in path_dirs:
+            with os.scandir(path_dir) as file_entries:
+                for file_entry in file_entries:
+                    if file_entry.is_file():
+                        locations.setdefault(file_entry.name, (lang_name, path_hash))
+    return locations
+
+def reset_checksum_locations(root_path: Path) -> None:
+    """
+    Drops the checksum index used by `read_contents_from_cache_by_checksum`.
+    Must be called after chunk files are deleted.
+    """
+    _CHECKSUM_LOCATIONS.pop(str(root_path), None)
 
 def read_contents_from_cache_by_checksum(root_path: Path, checksum: str) -> str | None:
     """
-    Iterates through all the files in all the lang directories and searches for the checksum and returns the contents if it finds such file and None if it doesn't
+    Searches all the lang directories for the checksum and returns the contents if it finds such file and None if it doesn't
+
+    The location of every chunk is indexed on the first call; the cache is only
+    walked again when a checksum is not found through the index.
     """
     cache_dir_path = ensure_cache_dir(root_path)
     if not os.path.exists(cache_dir_path):
         return None
 
-    for lang_dir in cache_dir_path.iterdir():
-        if not lang_dir.is_dir():
-            continue
-
-        for path_dir in lang_dir.iterdir():
-            if not path_dir.is_dir():
-                continue
+    locations = _CHECKSUM_LOCATIONS.get(str(root_path))
+    if locations is not None and checksum in locations:
+        lang_name, path_hash = locations[checksum]
+        res = _read_contents_from_cache_by_checksum_in_dir(checksum, cache_dir_path.joinpath(lang_name, path_hash))
+        if res is not None:
+            return res
 
-            res = _read_contents_from_cache_by_checksum_in_dir(checksum, path_dir.absolute())
-            if res is not None:
-                return res
-
-    return None
+    locations = _scan_checksum_locations(cache_dir_path)
+    _CHECKSUM_LOCATIONS[str(root_path)] = locations
+    if checksum not in locations:
+        return None
+    lang_name, path_hash = locations[checksum]
+    return _read_contents_from_cache_by_checksum_in_dir(checksum, cache_dir_path.joinpath(lang_name, path_hash))
 
 # correspondence cache
 def get_correspondence_cache_path(root_path: Path) -> Path:
@@ -154,22 +410,21 @@ def ensure_correspondence_cache(root_path: Path) -> None:
     ensure_cache_dir(root_path)
     if os.path.exists(file_path):
         return
-    with open(file_path, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=[PATH_CHECKSUM_COLUMN])
-        writer.writeheader()
+    _write_csv_header(file_path, [PATH_CHECKSUM_COLUMN])
 
 def add_lang_to_cache_data(fields: list[str], data_list: list[dict], lang: Language) -> tuple[list[str], list[dict]]:
     """
     Helper function to add a language column to cached correspondence rows.
+
+    Rows are left untouched: a field missing from a row is an empty value, so a
+    new column costs nothing until a row gets a checksum for it.
     """
     fields = _ensure_path_field(fields)
-    if str(lang) in fields:
+    lang_name = str(lang)
+    if lang_name in fields:
         return (fields, data_list)
 
-    fields.append(str(lang)) 
-
-    for i in range(len(data_list)):
-        data_list[i][str(lang)] = ""
+    fields.append(lang_name) 
 
     return (fields, data_list)
 
@@ -178,12 +433,13 @@ def remove_lang_from_cache_data(fields: list[str], data_list: list[dict], lang:
     Helper function to drop a language column from cached correspondence rows.
     """
     fields = _ensure_path_field(fields)
-    if str(lang) not in fields:
+    lang_name = str(lang)
+    if lang_name not in fields:
         return (fields, data_list)
 
-    fields.remove(str(lang))
-    for i in range(len(data_list)):
-        data_list[i].pop(str(lang))
+    fields.remove(lang_name)
+    for row in data_list:
+        row.pop(lang_name, None)
 
     return (fields, data_list)
 
@@ -235,27 +491,33 @@ def find_correspondent_checksum(
     """
     if src_lang == tgt_lang:
         return None
-    cache_data = read_correspondence_cache(root_path)
-    if cache_data is None: # if the db doesn't exist, then do nothing
-        ensure_correspondence_cache(root_path)
+    with _CORRESPONDENCE_LOCK:
+        snapshot = _load_correspondence_snapshot(root_path)
+        if snapshot is None: # if the db doesn't exist, then do nothing
+            ensure_correspondence_cache(root_path)
+            return None
+        return _find_correspondent_checksum_in_rows(snapshot, src_checksum, src_lang, tgt_lang, path_hash)
+
+def _find_correspondent_checksum_in_rows(
+    snapshot: _CorrespondenceSnapshot,
+    src_checksum: str,
+    src_lang: Language,
+    tgt_lang: Language,
+    path_hash: str,
+) -> str | None:
+    fields = snapshot.fields
+    src_name = str(src_lang)
+    tgt_name = str(tgt_lang)
+    if src_name not in fields or tgt_name not in fields:
         return None
 
-    (fields, data_list) = cache_data
-    fields = _ensure_path_field(fields)
-    if str(src_lang) not in fields or str(tgt_lang) not in fields:
+    data = _find_row(snapshot, src_checksum, src_name, path_hash)
+    if data is None:
         return None
-
-    for data in data_list:
-        row_path_hash = data.get(PATH_CHECKSUM_COLUMN, "")
-        if row_path_hash and row_path_hash != path_hash:
-            continue
-        if data[str(src_lang)] == src_checksum:
-            tgt_checksum = data[str(tgt_lang)]
-            if tgt_checksum == "": # if target checksum is an empty string, it means that for such source checksum and these languages there's no correspondence pair, return None
-                return None 
-            return tgt_checksum
-
-    return None
+    tgt_checksum = data.get(tgt_name, "")
+    if tgt_checksum == "": # if target checksum is an empty string, it means that for such source checksum and these languages there's no correspondence pair, return None
+        return None
+    return tgt_checksum
 
 def do_translation_checksum_correspond_to_source(
     root_path: Path,
@@ -287,8 +549,30 @@ def do_translation_correspond_to_source(
     """
     Returns true if the given translation corresponds to the given source checksum and false otherwise
     """
-    tgt_checksum = calculate_checksum(tgt_contents)
-    return do_translation_checksum_correspond_to_source(root_path, src_checksum, src_lang, tgt_checksum, tgt_lang, path_hash)
+    return do_translations_correspond_to_sources(
+        root_path, [(src_checksum, src_lang, tgt_contents, tgt_lang, path_hash)]
+    )[0]
+
+def do_translations_correspond_to_sources(
+    root_path: Path,
+    pairs: Iterable[tuple[str, Language, str, Language, str]],
+) -> list[bool]:
+    """
+    Batched version of `do_translation_correspond_to_source`: takes (src_checksum, src_lang, tgt_contents, tgt_lang, path_hash) tuples
+    and returns a bool for each of them, loading the correspondence cache only once
+    """
+    with _CORRESPONDENCE_LOCK:
+        snapshot = _load_correspondence_snapshot(root_path)
+        if snapshot is None:
+            ensure_correspondence_cache(root_path)
+        results: list[bool] = []
+        for src_checksum, src_lang, tgt_contents, tgt_lang, path_hash in pairs:
+            if snapshot is None or src_lang == tgt_lang:
+                results.append(False)
+                continue
+            true_tgt_checksum = _find_correspondent_checksum_in_rows(snapshot, src_checksum, src_lang, tgt_lang, path_hash)
+            results.append(true_tgt_checksum is not None and true_tgt_checksum == calculate_checksum(tgt_contents))
+        return results
 
 def set_checksum_pair_in_correspondence_cache(
     root_path: Path,
@@ -300,90 +584,375 @@ def set_checksum_pair_in_correspondence_cache(
 ) -> None:
     if src_lang == tgt_lang:
         return None
+    src_name = str(src_lang)
+    tgt_name = str(tgt_lang)
+
+    with _CORRESPONDENCE_LOCK:
+        snapshot = _load_correspondence_snapshot(root_path)
+        if snapshot is None: # if the db doesn't exist, then create it
+            ensure_correspondence_cache(root_path)
+            snapshot = _CorrespondenceSnapshot(None, [PATH_CHECKSUM_COLUMN], [])
+            _CORRESPONDENCE_CACHE[get_correspondence_cache_path(root_path)] = snapshot
+
+        fields = _ensure_path_field(snapshot.fields)
+        data_list = snapshot.rows
+
+        if src_name not in fields:
+            (fields, data_list) = add_lang_to_cache_data(fields, data_list, src_lang)
+            snapshot.needs_rewrite = True
+        if tgt_name not in fields:
+            (fields, data_list) = add_lang_to_cache_data(fields, data_list, tgt_lang)
+            snapshot.needs_rewrite = True
+
+        snapshot.dirty = True
+        index = _get_correspondence_index(snapshot)
+        row = _find_row(snapshot, src_checksum, src_name, path_hash)
+        if row is not None:
+            if not any(pending is row for pending in data_list[snapshot.persisted_rows:]):
+                snapshot.needs_rewrite = True
+            if row.get(PATH_CHECKSUM_COLUMN, "") != path_hash: # legacy row, gets the path hash from now on
+                _unindex_row(index, row)
+                row[PATH_CHECKSUM_COLUMN] = path_hash
+                _index_row(index, row)
+            old_tgt_checksum = row.get(tgt_name, "")
+            if old_tgt_checksum:
+                _unindex_value(index, (path_hash, tgt_name, old_tgt_checksum), row)
+            row[tgt_name] = tgt_checksum
+            if tgt_checksum:
+                index.setdefault((path_hash, tgt_name, tgt_checksum), []).append(row)
+            return
 
-    cache_data = read_correspondence_cache(root_path)
-    if cache_data is None: # if the db doesn't exist, then create it
-        ensure_correspondence_cache(root_path)
-
-    (fields, data_list) = ([], [])
-    if cache_data is not None:
-        (fields, data_list) = cache_data
-
-    fields = _ensure_path_field(fields)
+        # if the source checksum isn't present in the db, then we create a new row with the pair
+        new_row = {}
+        for field in fields:
+            new_row[field] = ""
+        new_row[PATH_CHECKSUM_COLUMN] = path_hash
+        new_row[src_name] = src_checksum
+        new_row[tgt_name] = tgt_checksum
+        data_list.append(new_row)
+        _index_row(index, new_row)
+        if not path_hash:
+            snapshot.has_legacy_rows = True
+
+def _scan_checksum_path_hashes(lang_dir: str) -> dict[str, set[str]]:
+    """
+    Returns `checksum -> path hashes` for the chunk files stored in the path directories of a language.
+    """
+    path_hashes: dict[str, set[str]] = {}
+    try:
+        with os.scandir(lang_dir) as path_entries:
+            path_dirs = [(entry.name, entry.path) for entry in path_entries if entry.is_dir()]
+    except FileNotFoundError:
+        return path_hashes
+    for path_hash, path_dir in path_dirs:
+        with os.scandir(path_dir) as file_entries:
+            for file_entry in file_entries:
+                if file_entry.is_file():
+                    path_hashes.setdefault(file_entry.name, set()).add(path_hash)
+    return path_hashes
+
+def migrate_legacy_correspondence_rows(root_path: Path) -> int:
+    """
+    Gives the rows stored without a path hash the path hash of the directory
+    holding their chunks, when every checksum of the row is found in the same
+    single path directory, and writes them to disk. Returns the number of
+    migrated rows; rows that can't be resolved are left as they are.
+    """
+    with _CORRESPONDENCE_LOCK:
+        snapshot = _load_correspondence_snapshot(root_path)
+        if snapshot is None:
+            return 0
+        index = _get_correspondence_index(snapshot)
+        if not snapshot.has_legacy_rows:
+            return 0
+
+        cache_dir = ensure_cache_dir(root_path)
+        lang_fields = [field for field in snapshot.fields if field != PATH_CHECKSUM_COLUMN]
+        locations = {
+            lang_name: _scan_checksum_path_hashes(os.path.join(cache_dir, lang_name))
+            for lang_name in lang_fields
+        }
+
+        migrated = 0
+        has_legacy_rows = False
+        for row in snapshot.rows:
+            if row.get(PATH_CHECKSUM_COLUMN):
+                continue
+            candidates: set[str] | None = None
+            for lang_name in lang_fields:
+                checksum = row.get(lang_name)
+                if not checksum:
+                    continue
+                found = locations[lang_name].get(checksum, set())
+                candidates = set(found) if candidates is None else candidates & found
+                if not candidates:
+                    break
+            if candidates is None or len(candidates) != 1:
+                has_legacy_rows = True
+                continue
+            _unindex_row(index, row)
+            row[PATH_CHECKSUM_COLUMN] = candidates.pop()
+            _index_row(index, row)
+            migrated += 1
 
-    if str(src_lang) not in fields:
-        (fields, data_list) = add_lang_to_cache_data(fields, data_list, src_lang)
-    if str(tgt_lang) not in fields:
-        (fields, data_list) = add_lang_to_cache_data(fields, data_list, tgt_lang)
+        snapshot.has_legacy_rows = has_legacy_rows
+        if migrated:
+            snapshot.dirty = True
+            snapshot.needs_rewrite = True
+            _flush_correspondence_snapshot(get_correspondence_cache_path(root_path))
+        return migrated
 
-    for i in range(len(data_list)):
-        row = data_list[i]
-        row_path_hash = row.get(PATH_CHECKSUM_COLUMN, "")
-        if row_path_hash and row_path_hash != path_hash:
-            continue
-        if row[str(src_lang)] == src_checksum:
-            row[PATH_CHECKSUM_COLUMN] = path_hash
-            data_list[i][str(tgt_lang)] = tgt_checksum
-            write_correspondence_cache(root_path, data_list, fields)
-            return
 
-    # if the source checksum isn't present in the db, then we create a new row with the pair
-    new_row = {}
-    for field in fields:
-        new_row[field] = ""
-    new_row[PATH_CHECKSUM_COLUMN] = path_hash
-    new_row[str(src_lang)] = src_checksum
-    new_row[str(tgt_lang)] = tgt_checksum
-    data_list.append(new_row)
-    write_correspondence_cache(root_path, data_list, fields)
+def _parse_correspondence_cache(file_path: Path) -> tuple[list[str], list[dict], bool]:
+    """
+    Returns (fields, rows, whether the header on disk already matches the fields).
+    """
+    with open(file_path, mode='r', newline='') as file:
+        csv_reader = csv.reader(file)
+        header = [sys.intern(field) for field in next(csv_reader, [])]
+        # rows are zipped with the header directly, which is much cheaper than csv.DictReader.
+        # Values are interned: the path hash repeats on every row of a file and equal
+        # checksums then share one object, so comparisons hit the identity fast path
+        data_list = [dict(zip(header, map(sys.intern, values))) for values in csv_reader if values]
+
+    header_complete = PATH_CHECKSUM_COLUMN in header
+    field_names = _ensure_path_field(list(header))
+    return (field_names, data_list, header_complete)
+
+def _load_correspondence_snapshot(root_path: Path) -> _CorrespondenceSnapshot | None:
+    """
+    Returns the in-memory snapshot of the correspondence cache, (re)reading the
+    file only if it changed on disk since it was loaded. Unflushed changes always
+    take precedence over the file. Must be called with `_CORRESPONDENCE_LOCK` held.
+    """
+    file_path = get_correspondence_cache_path(root_path)
+    snapshot = _CORRESPONDENCE_CACHE.get(file_path)
+    if snapshot is not None and snapshot.dirty:
+        return snapshot
+
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+    except FileNotFoundError:
+        _CORRESPONDENCE_CACHE.pop(file_path, None)
+        return None
 
+    if snapshot is not None and snapshot.mtime_ns == mtime_ns:
+        return snapshot
 
-    
+    (fields, data_list, header_complete) = _parse_correspondence_cache(file_path)
+    snapshot = _CorrespondenceSnapshot(
+        mtime_ns,
+        fields,
+        data_list,
+        persisted_rows=len(data_list),
+        needs_rewrite=not header_complete,
+    )
+    _CORRESPONDENCE_CACHE[file_path] = snapshot
+    return snapshot
 
 def read_correspondence_cache(root_path: Path) -> tuple[list[str], list[dict]] | None:
     """
     Returns (list of fields, data in dictionary format) or None if the cache file doesn't exist
-    """
 
-    file_path = get_correspondence_cache_path(root_path)
-
-    if not os.path.exists(file_path):
-        return None
+    The rows are copies holding every field, the caller is free to modify them.
+    """
+    with _CORRESPONDENCE_LOCK:
+        snapshot = _load_correspondence_snapshot(root_path)
+        if snapshot is None:
+            return None
+        fields = list(snapshot.fields)
+        return (fields, [{field: row.get(field) or "" for field in fields} for row in snapshot.rows])
 
-    data_list = []
-    field_names = []
-    
-    with open(file_path, mode='r', newline='') as file:
-        csv_reader = csv.DictReader(file)
-        raw_fields = list(csv_reader.fieldnames or [])
-        field_names = _ensure_path_field(raw_fields)
+def write_correspondence_cache(root_path: Path, data_list: list[dict], fields: list[str] = []) -> None:
+    """
+    Replaces the correspondence cache; if no data is provided we only keep the headers.
 
-        for row in csv_reader:
-            row.setdefault(PATH_CHECKSUM_COLUMN, "")
-            data_list.append(row)
+    The change is kept in memory until `flush_correspondence_cache` is called
+    (or the interpreter exits).
+    """
+    ensure_cache_dir(root_path)
+    file_path = get_correspondence_cache_path(root_path)
+    fields = _ensure_path_field(list(fields))
 
-    return (field_names, data_list)
+    with _CORRESPONDENCE_LOCK:
+        previous = _CORRESPONDENCE_CACHE.get(file_path)
+        mtime_ns = previous.mtime_ns if previous is not None else None
+        _CORRESPONDENCE_CACHE[file_path] = _CorrespondenceSnapshot(mtime_ns, fields, list(data_list), dirty=True)
 
-def write_correspondence_cache(root_path: Path, data_list: list[dict], fields: list[str] = []) -> None:
+def read_correspondence_cache_fields(root_path: Path) -> list[str] | None:
     """
-    Writes the correspondence cache to disk; if no data is provided we only write the headers.
+    Returns the fields of the correspondence cache file (pending changes are flushed first) or None if it doesn't exist.
     """
+    with _CORRESPONDENCE_LOCK:
+        flush_correspondence_cache(root_path)
+        file_path = get_correspondence_cache_path(root_path)
+        try:
+            with open(file_path, mode='r', newline='') as file:
+                header = next(csv.reader(file), [])
+        except FileNotFoundError:
+            return None
+        return _ensure_path_field(header)
+
+def stream_correspondence_cache(root_path: Path) -> Iterator[dict]:
+    """
+    Yields the rows of the correspondence cache file one by one, without loading the whole cache in memory.
+    Pending changes are flushed first.
+    """
+    with _CORRESPONDENCE_LOCK:
+        flush_correspondence_cache(root_path)
+    file_path = get_correspondence_cache_path(root_path)
+    try:
+        file = open(file_path, mode='r', newline='')
+    except FileNotFoundError:
+        return
+    with file:
+        csv_reader = csv.reader(file)
+        header = next(csv_reader, [])
+        for values in csv_reader:
+            if values:
+                yield dict(zip(header, values))
+
+def stream_correspondence_cache_rows(root_path: Path, fields: list[str]) -> Iterator[list[str]]:
+    """
+    Yields the rows of the correspondence cache file as lists of values ordered like `fields`
+    (missing columns are empty), so that callers can access columns by index. Pending changes are flushed first.
+    """
+    with _CORRESPONDENCE_LOCK:
+        flush_correspondence_cache(root_path)
+    file_path = get_correspondence_cache_path(root_path)
+    try:
+        file = open(file_path, mode='r', newline='')
+    except FileNotFoundError:
+        return
+    with file:
+        csv_reader = csv.reader(file)
+        header = next(csv_reader, [])
+        width = len(fields)
+        if header == fields:
+            for values in csv_reader:
+                if values:
+                    if len(values) < width:
+                        values.extend([""] * (width - len(values)))
+                    yield values
+            return
+        positions = {field: index for index, field in enumerate(header)}
+        indexes = [positions.get(field, -1) for field in fields]
+        for values in csv_reader:
+            if values:
+                count = len(values)
+                yield [values[index] if 0 <= index < count else "" for index in indexes]
+
+@contextlib.contextmanager
+def _open_correspondence_cache_replacement(root_path: Path) -> Iterator[TextIO]:
     ensure_cache_dir(root_path)
     file_path = get_correspondence_cache_path(root_path)
+    tmp_path = _temporary_path(file_path)
+    with _CORRESPONDENCE_LOCK:
+        flush_correspondence_cache(root_path)
+        try:
+            with open(tmp_path, 'w', newline='', buffering=_CSV_WRITE_BUFFER_SIZE) as csvfile:
+                yield csvfile
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_path, file_path)
+        _CORRESPONDENCE_CACHE.pop(file_path, None)
+
+@contextlib.contextmanager
+def open_correspondence_cache_writer(root_path: Path, fields: list[str]) -> Iterator[csv.DictWriter]:
+    """
+    Yields a writer for a new version of the correspondence cache. The rows are written to a temporary
+    file that replaces the cache when the block exits without error; the in-memory snapshot is dropped.
+    The cache lock is held for the whole block, so the rows can be streamed from the current file.
+    """
     fields = _ensure_path_field(list(fields))
+    with _open_correspondence_cache_replacement(root_path) as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        yield writer
+
+@contextlib.contextmanager
+def open_correspondence_cache_row_writer(root_path: Path, fields: list[str]) -> Iterator[Any]:
+    """
+    Same as `open_correspondence_cache_writer`, but the rows are lists of values ordered like `fields`
+    (as yielded by `stream_correspondence_cache_rows`). `fields` must contain the path checksum column.
+    """
+    with _open_correspondence_cache_replacement(root_path) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(fields)
+        yield writer
+
+# large buffer so that a full rewrite of the correspondence cache is a handful of write syscalls
+_CSV_WRITE_BUFFER_SIZE = 1 << 20
+
+def _write_csv_rows(csvfile: TextIO, data_list: list[dict], fields: list[str]) -> None:
+    # plain csv.writer: DictWriter checks every row for extra keys, which we never have
+    writer = csv.writer(csvfile)
+    writer.writerows([row.get(field, "") for field in fields] for row in data_list)
+
+def _write_correspondence_file(file_path: Path, data_list: list[dict], fields: list[str]) -> None:
+    # the file is rewritten aside and renamed over the old one: a crash mid-write leaves the previous cache intact
+    tmp_path = _temporary_path(file_path)
+    with open(tmp_path, 'w', newline='', buffering=_CSV_WRITE_BUFFER_SIZE) as csvfile:
+        csv.writer(csvfile).writerow(fields)
+        _write_csv_rows(csvfile, data_list, fields)
+    os.replace(tmp_path, file_path)
+
+def flush_correspondence_cache(root_path: Path) -> None:
+    """
+    Writes pending changes of the correspondence cache of the given project to disk.
+    """
+    with _CORRESPONDENCE_LOCK:
+        file_path = get_correspondence_cache_path(root_path)
+        _flush_correspondence_snapshot(file_path)
 
-    if len(data_list) == 0:
-        with open(file_path, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fields)
-            writer.writeheader()
+def _flush_correspondence_snapshot(file_path: Path) -> None:
+    snapshot = _CORRESPONDENCE_CACHE.get(file_path)
+    if snapshot is None or not snapshot.dirty:
         return
+    ensure_dir_exists(file_path.parent)
+    if snapshot.needs_rewrite or not _file_unchanged_since(file_path, snapshot.mtime_ns):
+        _write_correspondence_file(file_path, snapshot.rows, snapshot.fields)
+    else:
+        _append_correspondence_rows(file_path, snapshot.rows[snapshot.persisted_rows:], snapshot.fields)
+    snapshot.mtime_ns = os.stat(file_path).st_mtime_ns
+    snapshot.persisted_rows = len(snapshot.rows)
+    snapshot.needs_rewrite = False
+    snapshot.dirty = False
+
+def _file_unchanged_since(file_path: Path, mtime_ns: int | None) -> bool:
+    if mtime_ns is None:
+        return False
+    try:
+        return os.stat(file_path).st_mtime_ns == mtime_ns
+    except FileNotFoundError:
+        return False
 
-    for row in data_list:
-        row.setdefault(PATH_CHECKSUM_COLUMN, "")
-        for field in fields:
-            row.setdefault(field, "")
+def _append_correspondence_rows(file_path: Path, data_list: list[dict], fields: list[str]) -> None:
+    if not data_list:
+        return
+    with open(file_path, 'a', newline='', buffering=_CSV_WRITE_BUFFER_SIZE) as csvfile:
+        _write_csv_rows(csvfile, data_list, fields)
 
-    with open(file_path, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fields)
-        writer.writeheader()
-        writer.writerows(data_list)
+def flush_translation_cache(root_path: Path) -> None:
+    """
+    Writes every pending change of the translation cache of the given project
+    (registered paths and correspondence rows) to disk.
+    """
+    flush_path_map(root_path)
+    flush_correspondence_cache(root_path)
+
+def flush_all_translation_caches() -> None:
+    """
+    Writes pending changes of every translation cache loaded in this process to disk.
+    """
+    with _PATH_MAP_LOCK:
+        for path_map in list(_PATH_MAP_CACHE):
+            _flush_path_map_snapshot(path_map)
+    close_path_map_handles()
+    with _CORRESPONDENCE_LOCK:
+        for file_path in list(_CORRESPONDENCE_CACHE):
+            _flush_correspondence_snapshot(file_path)
+
+
+atexit.register(flush_all_translation_caches)
@@ -1,20 +1,28 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Iterator
 
 from trans_lib.constants import CACHE_DIR_NAME
 from trans_lib.enums import Language
 from trans_lib.helpers import calculate_path_checksum, get_config_dir_from_root, normalize_relative_path
 from trans_lib.translation_cache.cache_backend import (
     PATH_CHECKSUM_COLUMN,
+    flush_correspondence_cache,
+    open_correspondence_cache_row_writer,
     read_correspondence_cache,
+    read_correspondence_cache_fields,
+    reset_checksum_locations,
+    reset_ensured_cache_dirs,
+    stream_correspondence_cache_rows,
     write_correspondence_cache,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheClearStats:
     removed_rows: int = 0
     cleared_fields: int = 0
@@ -22,7 +30,7 @@ class CacheClearStats:
     removed_target_chunks: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheDeleteStats:
     removed_rows: int = 0
     cleared_fields: int = 0
@@ -32,64 +40,45 @@ class CacheDeleteStats:
 def _iter_lang_cache_files(
     cache_dir: Path,
     lang_name: str,
-) -> Iterable[tuple[str, str, Path]]:
+) -> Iterator[tuple[str, str, Path]]:
     lang_dir = cache_dir / lang_name
-    if not lang_dir.exists() or not lang_dir.is_dir():
-        return []
-
-    def _iter() -> Iterable[tuple[str, str, Path]]:
-        for entry in lang_dir.iterdir():
-            if entry.is_dir():
-                path_hash = entry.name
-                for file_path in entry.iterdir():
-                    if file_path.is_file():
-                        yield path_hash, file_path.name, file_path
-            elif entry.is_file():
-                yield "", entry.name, entry
-
-    return list(_iter())
-
-
-def _checksum_file_exists(
-    cache_dir: Path,
-    lang_name: str,
-    path_hash: str,
-    checksum: str,
-) -> bool:
-    if not checksum:
-        return False
-    lang_dir = cache_dir / lang_name
-    if not lang_dir.exists():
-        return False
-    file_path = lang_dir / path_hash / checksum if path_hash else lang_dir / checksum
-    return file_path.is_file()
+    if not lang_dir.is_dir():
+        return
+    # scandir entries carry the file type from readdir, no extra stat per entry
+    with os.scandir(lang_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                with os.scandir(entry.path) as chunk_entries:
+                    for chunk_entry in chunk_entries:
+                        if chunk_entry.is_file(follow_symlinks=False):
+                            yield entry.name, chunk_entry.name, Path(chunk_entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield "", entry.name, Path(entry.path)
 
 
 def _delete_dir_contents(dir_path: Path, remove_dir: bool = True) -> int:
-    if not dir_path.exists() or not dir_path.is_dir():
+    if not os.path.isdir(dir_path):
         return 0
     removed_files = 0
-    for entry in dir_path.iterdir():
-        if entry.is_dir():
-            removed_files += _delete_dir_contents(entry, remove_dir=True)
-        elif entry.is_file():
-            entry.unlink()
+    for current_dir, dir_names, file_names in os.walk(dir_path, topdown=False):
+        for file_name in file_names:
+            os.unlink(os.path.join(current_dir, file_name))
             removed_files += 1
+        for dir_name in dir_names:
+            try:
+                os.rmdir(os.path.join(current_dir, dir_name))
+            except OSError:
+                pass
     if remove_dir:
         try:
-            dir_path.rmdir()
+            os.rmdir(dir_path)
         except OSError:
             pass
     return removed_files
 
 
-def _row_has_any_language_values(row: dict, fields: list[str]) -> bool:
-    for field in fields:
-        if field == PATH_CHECKSUM_COLUMN:
-            continue
-        if row.get(field, ""):
-            return True
-    return False
+def _row_has_any_language_values(row: dict, lang_fields: tuple[str, ...]) -> bool:
+    return any(row.get(field) for field in lang_fields)
 
 
 def _chunk_contains_keyword(file_path: Path, keyword: str) -> bool:
@@ -107,85 +96,90 @@ def clear_missing_chunks(root_path: Path, source_lang: Language) -> CacheClearSt
         return stats
 
     source_lang_name = str(source_lang)
-    lang_files: dict[str, list[tuple[str, str, Path]]] = {}
-    for entry in cache_dir.iterdir():
-        if not entry.is_dir():
-            continue
-        lang_name = entry.name
-        lang_files[lang_name] = _iter_lang_cache_files(cache_dir, lang_name)
+    lang_names = [entry.name for entry in cache_dir.iterdir() if entry.is_dir()]
+    # directory listings are pure syscalls (the GIL is released), walk the languages concurrently
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(lang_names)))) as executor:
+        lang_files: dict[str, list[tuple[str, str, Path]]] = dict(
+            zip(lang_names, executor.map(lambda lang_name: list(_iter_lang_cache_files(cache_dir, lang_name)), lang_names))
+        )
+    # every chunk on disk keyed by (lang, path_hash, checksum), checked by membership instead of a stat per chunk
+    present: dict[tuple[str, str, str], Path] = {
+        (lang_name, path_hash, checksum): file_path
+        for lang_name, files in lang_files.items()
+        for path_hash, checksum, file_path in files
+    }
 
     referenced_chunks: set[tuple[str, str, str]] = set()
 
-    cache_data = read_correspondence_cache(root_path)
-    if cache_data is None:
-        for lang_name, files in lang_files.items():
-            for _, _, file_path in files:
-                if file_path.exists():
-                    file_path.unlink()
-                    if lang_name == source_lang_name:
-                        stats.removed_source_chunks += 1
-                    else:
-                        stats.removed_target_chunks += 1
+    fields = read_correspondence_cache_fields(root_path)
+    if fields is None:
+        _remove_unreferenced_chunks(present, referenced_chunks, source_lang_name, stats)
         return stats
 
-    fields, data_list = cache_data
     src_col = source_lang_name
-    target_cols = [field for field in fields if field not in {PATH_CHECKSUM_COLUMN, src_col}]
-    remaining_rows: list[dict] = []
+    # rows are lists ordered like `fields`, columns are read by index instead of a dict lookup per cell
+    idx_path = fields.index(PATH_CHECKSUM_COLUMN)
+    # without a source column every row is dropped
+    idx_src = fields.index(src_col) if src_col in fields else -1
+    # one bit per target column: a row's present and missing targets are two ints, no lists per row
+    target_cols = [(col, index) for index, col in enumerate(fields) if col not in {PATH_CHECKSUM_COLUMN, src_col}]
+    target_idxs = [(col, index, 1 << bit) for bit, (col, index) in enumerate(target_cols)]
+
+    # rows are streamed from the cache file into its new version, the cache is never held in memory as a whole
+    with open_correspondence_cache_row_writer(root_path, fields) as writer:
+        for row in stream_correspondence_cache_rows(root_path, fields):
+            path_hash = row[idx_path]
+            src_checksum = row[idx_src] if idx_src >= 0 else ""
+            if not src_checksum:
+                stats.removed_rows += 1
+                continue
+            if (src_col, path_hash, src_checksum) not in present:
+                stats.removed_rows += 1
+                continue
 
-    for row in data_list:
-        path_hash = row.get(PATH_CHECKSUM_COLUMN, "")
-        src_checksum = row.get(src_col, "")
-        if not src_checksum:
-            stats.removed_rows += 1
-            continue
-        if not _checksum_file_exists(cache_dir, src_col, path_hash, src_checksum):
-            stats.removed_rows += 1
-            continue
+            present_mask = 0
+            missing_mask = 0
+            for col, index, bit in target_idxs:
+                tgt_checksum = row[index]
+                if not tgt_checksum:
+                    continue
+                if (col, path_hash, tgt_checksum) in present:
+                    present_mask |= bit
+                else:
+                    missing_mask |= bit
 
-        present_targets = 0
-        missing_targets: list[str] = []
-        for col in target_cols:
-            tgt_checksum = row.get(col, "")
-            if not tgt_checksum:
+            if not present_mask:
+                stats.removed_rows += 1
                 continue
-            if _checksum_file_exists(cache_dir, col, path_hash, tgt_checksum):
-                present_targets += 1
-            else:
-                missing_targets.append(col)
-
-        if present_targets == 0:
-            stats.removed_rows += 1
-            continue
 
-        for col in missing_targets:
-            row[col] = ""
-        stats.cleared_fields += len(missing_targets)
-        remaining_rows.append(row)
-        if _checksum_file_exists(cache_dir, src_col, path_hash, src_checksum):
+            for col, index, bit in target_idxs:
+                if present_mask & bit:
+                    referenced_chunks.add((col, path_hash, row[index]))
+                elif missing_mask & bit:
+                    row[index] = ""
+            stats.cleared_fields += missing_mask.bit_count()
+            writer.writerow(row)
             referenced_chunks.add((src_col, path_hash, src_checksum))
-        for col in target_cols:
-            tgt_checksum = row.get(col, "")
-            if not tgt_checksum:
-                continue
-            if _checksum_file_exists(cache_dir, col, path_hash, tgt_checksum):
-                referenced_chunks.add((col, path_hash, tgt_checksum))
 
-    if stats.removed_rows > 0 or stats.cleared_fields > 0:
-        write_correspondence_cache(root_path, remaining_rows, fields)
+    _remove_unreferenced_chunks(present, referenced_chunks, source_lang_name, stats)
+    reset_checksum_locations(root_path)
+    return stats
 
-    for lang_name, files in lang_files.items():
-        for path_hash, checksum, file_path in files:
-            if (lang_name, path_hash, checksum) in referenced_chunks:
-                continue
-            if file_path.exists():
-                file_path.unlink()
-                if lang_name == source_lang_name:
-                    stats.removed_source_chunks += 1
-                else:
-                    stats.removed_target_chunks += 1
 
-    return stats
+def _remove_unreferenced_chunks(
+    present: dict[tuple[str, str, str], Path],
+    referenced_chunks: set[tuple[str, str, str]],
+    source_lang_name: str,
+    stats: CacheClearStats,
+) -> None:
+    # the files were just listed, no need to stat them again before unlinking
+    for chunk in present.keys() - referenced_chunks:
+        present[chunk].unlink(missing_ok=True)
+        lang_name = chunk[0]
+        if lang_name == source_lang_name:
+            stats.removed_source_chunks += 1
+        else:
+            stats.removed_target_chunks += 1
 
 
 def clear_all(
@@ -241,12 +235,15 @@ def clear_all(
                 stats.removed_chunk_files += 1
                 deleted_checksums.add((lang_name, row_path_hash, checksum))
 
+    reset_ensured_cache_dirs()
+    reset_checksum_locations(root_path)
     cache_data = read_correspondence_cache(root_path)
     if cache_data is None:
         return stats
 
     fields, data_list = cache_data
     lang_field = str(lang) if lang is not None else ""
+    lang_fields = tuple(field for field in fields if field != PATH_CHECKSUM_COLUMN)
     remaining_rows: list[dict] = []
 
     for row in data_list:
@@ -260,7 +257,7 @@ def clear_all(
                 if lang_field in fields and row.get(lang_field, ""):
                     row[lang_field] = ""
                     stats.cleared_fields += 1
-                if _row_has_any_language_values(row, fields):
+                if _row_has_any_language_values(row, lang_fields):
                     remaining_rows.append(row)
                 else:
                     stats.removed_rows += 1
@@ -268,32 +265,39 @@ def clear_all(
                 stats.removed_rows += 1
             continue
 
-        row_changed = False
+        # rows without deleted chunks are kept as they are, only the changed ones may end up empty
         if lang_field:
             checksum = row.get(lang_field, "")
-            if checksum and (lang_field, row_path_hash, checksum) in deleted_checksums:
-                row[lang_field] = ""
-                stats.cleared_fields += 1
-                row_changed = True
+            if not checksum or (lang_field, row_path_hash, checksum) not in deleted_checksums:
+                remaining_rows.append(row)
+                continue
+            row[lang_field] = ""
+            stats.cleared_fields += 1
+            row_is_empty = not _row_has_any_language_values(row, lang_fields)
         else:
-            for field in fields:
-                if field == PATH_CHECKSUM_COLUMN:
-                    continue
+            nonempty_langs = 0
+            cleared_langs = 0
+            for field in lang_fields:
                 checksum = row.get(field, "")
-                if checksum and (field, row_path_hash, checksum) in deleted_checksums:
+                if not checksum:
+                    continue
+                nonempty_langs += 1
+                if (field, row_path_hash, checksum) in deleted_checksums:
                     row[field] = ""
-                    stats.cleared_fields += 1
-                    row_changed = True
+                    cleared_langs += 1
+            if cleared_langs == 0:
+                remaining_rows.append(row)
+                continue
+            stats.cleared_fields += cleared_langs
+            row_is_empty = nonempty_langs == cleared_langs
 
-        if _row_has_any_language_values(row, fields):
-            remaining_rows.append(row)
+        if row_is_empty:
+            stats.removed_rows += 1
         else:
-            if row_changed:
-                stats.removed_rows += 1
-            else:
-                remaining_rows.append(row)
+            remaining_rows.append(row)
 
     if stats.removed_rows > 0 or stats.cleared_fields > 0:
         write_correspondence_cache(root_path, remaining_rows, fields)
+        flush_correspondence_cache(root_path)
 
     return stats
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, Tuple
@@ -16,7 +17,7 @@ from trans_lib.doc_translator_mod.myst_file_translator import (
 from trans_lib.doc_translator_mod.typst_chunker import read_chunks_with_metadata_from_typst
 from trans_lib.doc_translator_mod.typst_file_translator import get_typst_cells
 from trans_lib.enums import DocumentType
-from trans_lib.helpers import calculate_checksum
+from trans_lib.helpers import calculate_checksums
 
 
 @dataclass
@@ -42,13 +43,18 @@ def collect_translation_pairs(
         )
         return []
 
-    src_chunks = _build_source_chunk_map(source_path, doc_type)
+    # the target chunks are read first so that only the source texts they reference are kept
+    target_chunks = list(_iter_target_chunks(target_path, doc_type))
+    if not target_chunks:
+        return []
+
+    src_chunks = _build_source_chunk_map(source_path, doc_type, {checksum for checksum, _ in target_chunks})
     if not src_chunks:
-        logger.warning("No chunks detected for {}, skipping rebuild.", source_path)
+        logger.warning("No chunks of {} are referenced by {}, skipping rebuild.", source_path, target_path)
         return []
 
     recovered: list[RecoveredChunkPair] = []
-    for checksum, tgt_text in _iter_target_chunks(target_path, doc_type):
+    for checksum, tgt_text in target_chunks:
         src_text = src_chunks.get(checksum)
         if src_text is None:
             logger.warning(
@@ -61,52 +67,58 @@ def collect_translation_pairs(
     return recovered
 
 
-def _build_source_chunk_map(source_path: Path, doc_type: DocumentType) -> Dict[str, str]:
-    builders: dict[DocumentType, callable[[Path], Dict[str, str]]] = {
-        DocumentType.JupyterNotebook: _build_notebook_source_map,
-        DocumentType.Markdown: _build_myst_source_map,
-        DocumentType.LaTeX: _build_latex_source_map,
-        DocumentType.Typst: _build_typst_source_map,
+def _build_source_chunk_map(source_path: Path, doc_type: DocumentType, needed: set[str] | None = None) -> Dict[str, str]:
+    """Returns checksum -> source text of the file, restricted to the `needed` checksums if given."""
+    readers: dict[DocumentType, callable[[Path], Iterable[str]]] = {
+        DocumentType.JupyterNotebook: _iter_notebook_source_texts,
+        DocumentType.Markdown: _iter_myst_source_texts,
+        DocumentType.LaTeX: _iter_latex_source_texts,
+        DocumentType.Typst: _iter_typst_source_texts,
     }
-    builder = builders.get(doc_type)
-    if builder is None:
+    reader = readers.get(doc_type)
+    if reader is None:
         return {}
-    return builder(source_path)
+    return _map_sources_by_checksum(reader(source_path), needed)
 
 
-def _build_notebook_source_map(source_path: Path) -> Dict[str, str]:
-    nb = jupytext.read(source_path)
-    chunks: Dict[str, str] = {}
-    for cell in nb.cells:
-        src_txt = _extract_notebook_cell_source(cell)
-        checksum = calculate_checksum(src_txt)
-        chunks.setdefault(checksum, src_txt)
-    return chunks
+def _read_notebook_cells(path: Path) -> list[dict]:
+    # only the cell sources and metadata are needed: .ipynb files are plain JSON,
+    # jupytext is kept for the paired text formats
+    if path.suffix == ".ipynb":
+        with open(path, "rb") as file:
+            return json.load(file).get("cells", [])
+    return jupytext.read(path).cells
 
 
-def _build_myst_source_map(source_path: Path) -> Dict[str, str]:
-    chunks: Dict[str, str] = {}
-    for cell in get_myst_cells(source_path):
-        src_txt = cell.get("source", "")
-        checksum = calculate_checksum(src_txt)
-        chunks.setdefault(checksum, src_txt)
-    return chunks
+def _iter_notebook_source_texts(source_path: Path) -> Iterable[str]:
+    return (_extract_notebook_cell_source(cell) for cell in _read_notebook_cells(source_path))
 
 
-def _build_latex_source_map(source_path: Path) -> Dict[str, str]:
-    chunks: Dict[str, str] = {}
-    for cell in get_latex_cells(source_path):
-        src_txt = cell.get("source", "")
-        checksum = calculate_checksum(src_txt)
-        chunks.setdefault(checksum, src_txt)
-    return chunks
+def _iter_myst_source_texts(source_path: Path) -> Iterable[str]:
+    return (cell.get("source", "") for cell in get_myst_cells(source_path))
+
+
+def _iter_latex_source_texts(source_path: Path) -> Iterable[str]:
+    return (cell.get("source", "") for cell in get_latex_cells(source_path))
+
 
+def _iter_typst_source_texts(source_path: Path) -> Iterable[str]:
+    return (cell.get("source", "") for cell in get_typst_cells(source_path))
+
+
+def _map_sources_by_checksum(texts: Iterable[str], needed: set[str] | None = None) -> Dict[str, str]:
+    """
+    Returns checksum -> source text, keeping the first text for a repeated checksum
+    and only the `needed` checksums if given.
+    """
+    # duplicated cells (empty or boilerplate ones) are hashed once
+    unique_texts = list(dict.fromkeys(texts))
+    checksums = calculate_checksums(unique_texts)
 
-def _build_typst_source_map(source_path: Path) -> Dict[str, str]:
     chunks: Dict[str, str] = {}
-    for cell in get_typst_cells(source_path):
-        src_txt = cell.get("source", "")
-        checksum = calculate_checksum(src_txt)
+    for checksum, src_txt in zip(checksums, unique_texts):
+        if needed is not None and checksum not in needed:
+            continue
         chunks.setdefault(checksum, src_txt)
     return chunks
 
@@ -140,9 +152,8 @@ def read_existing_target_metadata(
 
 
 def _read_notebook_target_metadata(target_path: Path) -> Dict[str, dict]:
-    nb = jupytext.read(target_path)
     result: Dict[str, dict] = {}
-    for cell in nb.cells:
+    for cell in _read_notebook_cells(target_path):
         metadata = cell.get("metadata") or {}
         checksum = metadata.get("src_checksum")
         if checksum:
@@ -192,8 +203,7 @@ def _iter_target_chunks(target_path: Path, doc_type: DocumentType) -> Iterable[T
 
 
 def _iter_notebook_target_chunks(target_path: Path) -> Iterable[Tuple[str, str]]:
-    nb = jupytext.read(target_path)
-    for cell in nb.cells:
+    for cell in _read_notebook_cells(target_path):
         metadata = cell.get("metadata") or {}
         checksum = metadata.get("src_checksum")
         if not checksum:
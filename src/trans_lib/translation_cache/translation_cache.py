@@ -1,18 +1,22 @@
+import itertools
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
 
-from trans_lib.diff import get_best_match_in_dir, get_checksum_for_best_match_in_dir
+from trans_lib.diff import get_best_match_in_chunks, read_dir_chunks
 from trans_lib.enums import Language
 from trans_lib.translation_cache.cache_backend import (
-    add_contents_to_cache,
     do_translation_correspond_to_source,
+    do_translations_correspond_to_sources,
     ensure_cache_dir,
     ensure_lang_cache_dirs,
     find_correspondent_checksum,
+    flush_translation_cache,
     get_lang_cache_path_dir,
     read_cached_contents_by_lang,
     register_path_hash,
     set_checksum_pair_in_correspondence_cache,
+    write_contents_to_cache,
 )
 
 
@@ -66,17 +70,89 @@ class TranslationCache(ABC):
     def do_translation_correspond_to_source(self, src_checksum: str, src_lang: Language, tgt_contents: str, tgt_lang: Language, relative_path: str) -> bool:
         pass
 
+    def do_translations_correspond_to_sources(
+        self,
+        pairs: list[tuple[str, str]],
+        src_lang: Language,
+        tgt_lang: Language,
+        relative_path: str,
+    ) -> list[bool]:
+        """
+        Checks a batch of (src_checksum, tgt_contents) pairs of the same file, returns a bool for each of them.
+        """
+        return [
+            self.do_translation_correspond_to_source(src_checksum, src_lang, tgt_contents, tgt_lang, relative_path)
+            for src_checksum, tgt_contents in pairs
+        ]
+
+    def flush(self) -> None:
+        """Writes pending changes to the underlying storage."""
+        pass
+
 class TranslationCacheCsv(TranslationCache):
+    # correspondence rows are kept in memory and written to disk once this many pairs were persisted
+    FLUSH_EVERY_PAIRS = 64
+
     def __init__(self, root_path: Path) -> None:
         cache_path = ensure_cache_dir(root_path)
         super().__init__(root_path, cache_path)
+        self._path_hash_cache: dict[str, str] = {}
+        # chunk contents of the (lang, path_hash) directories and path hashes of the
+        # language directories, loaded on first use and kept up to date by persist_pair
+        self._chunk_index: dict[tuple[str, str], dict[str, str]] = {}
+        self._lang_path_hashes: dict[str, list[str]] = {}
+        self._index_lock = threading.Lock()
+        self._unflushed_pairs = 0
+
+    def _dir_chunks(self, lang: Language, path_hash: str) -> dict[str, str]:
+        key = (str(lang), path_hash)
+        chunks = self._chunk_index.get(key)
+        if chunks is None:
+            with self._index_lock:
+                chunks = self._chunk_index.get(key)
+                if chunks is None:
+                    dir = get_lang_cache_path_dir(self.root_path, lang, path_hash)
+                    chunks = read_dir_chunks(dir) if dir.is_dir() else {}
+                    self._chunk_index[key] = chunks
+        return chunks
+
+    def _index_persisted_chunk(self, lang: Language, path_hash: str, checksum: str, contents: str) -> None:
+        # pairs may be persisted from worker threads while the index is searched:
+        # the entries are replaced by updated copies instead of being mutated in place
+        with self._index_lock:
+            key = (str(lang), path_hash)
+            chunks = self._chunk_index.get(key)
+            if chunks is not None and checksum not in chunks:
+                self._chunk_index[key] = {**chunks, checksum: contents}
+            path_hashes = self._lang_path_hashes.get(str(lang))
+            if path_hashes is not None and path_hash not in path_hashes:
+                self._lang_path_hashes[str(lang)] = [*path_hashes, path_hash]
+
+    def _path_hash(self, relative_path: str) -> str:
+        """Registers the relative path once per store and returns its path hash."""
+        path_hash = self._path_hash_cache.get(relative_path)
+        if path_hash is None:
+            path_hash = register_path_hash(self.root_path, relative_path)
+            self._path_hash_cache[relative_path] = path_hash
+        return path_hash
+
+    def lookup_checksum(self, src_checksum: str, src_lang: Language, tgt_lang: Language, relative_path: str) -> str | None:
+        """Return the checksum of the cached target if the pair exists, else *None*."""
+        return find_correspondent_checksum(self.root_path, src_checksum, src_lang, tgt_lang, self._path_hash(relative_path))
 
     def lookup(self, src_checksum: str, src_lang: Language, tgt_lang: Language, relative_path: str) -> str | None:
         """Return the cached *target text* if the pair exists, else *None*."""
-        path_hash = register_path_hash(self.root_path, relative_path)
+        path_hash = self._path_hash(relative_path)
         tgt_checksum = find_correspondent_checksum(self.root_path, src_checksum, src_lang, tgt_lang, path_hash)
         if tgt_checksum is None:
             return None
+        # the target directory is often indexed already (examples, persisted pairs):
+        # the contents are then taken from memory instead of being read from disk
+        chunks = self._chunk_index.get((str(tgt_lang), path_hash))
+        if chunks is not None:
+            contents = chunks.get(tgt_checksum)
+            if contents is not None:
+                return contents
         return read_cached_contents_by_lang(self.root_path, tgt_checksum, tgt_lang, path_hash)
 
     def persist_pair(
@@ -91,10 +167,14 @@ class TranslationCacheCsv(TranslationCache):
     ) -> None:
         """
         Adds translation pair to the on-disk cache.
+        The checksums must be the checksums of the given texts.
         """
-        path_hash = register_path_hash(self.root_path, relative_path)
-        src_checksum = add_contents_to_cache(self.root_path, src_text, src_lang, path_hash)
-        tgt_checksum = add_contents_to_cache(self.root_path, tgt_text, tgt_lang, path_hash)
+        path_hash = self._path_hash(relative_path)
+        # the checksums were computed by the caller, the texts aren't hashed again
+        write_contents_to_cache(self.root_path, src_text, src_checksum, src_lang, path_hash)
+        write_contents_to_cache(self.root_path, tgt_text, tgt_checksum, tgt_lang, path_hash)
+        self._index_persisted_chunk(src_lang, path_hash, src_checksum, src_text)
+        self._index_persisted_chunk(tgt_lang, path_hash, tgt_checksum, tgt_text)
         set_checksum_pair_in_correspondence_cache(
             self.root_path,
             src_checksum,
@@ -103,21 +183,25 @@ class TranslationCacheCsv(TranslationCache):
             tgt_lang,
             path_hash,
         )
+        with self._index_lock:
+            self._unflushed_pairs += 1
+            should_flush = self._unflushed_pairs >= self.FLUSH_EVERY_PAIRS
+        if should_flush:
+            self.flush()
 
     def get_best_pair_example_from_cache(self, lang: Language, tgt_lang: Language, txt: str, relative_path: str) -> tuple[str, str, float] | None:
         """
         Returns the triplet (src, tgt, score) of the best match between the provided text and the found source text in the cache.
         """
-        path_hash = register_path_hash(self.root_path, relative_path)
-        dir = get_lang_cache_path_dir(self.root_path, lang, path_hash)
-        if not dir.exists():
+        path_hash = self._path_hash(relative_path)
+        chunks = self._dir_chunks(lang, path_hash)
+        if not chunks:
             return None
-        src_checksum, score = get_checksum_for_best_match_in_dir(dir, txt)
+        src_checksum, src, score = get_best_match_in_chunks(chunks.items(), txt)
         if not src_checksum:
             return None
-        src = self.get_contents_by_checksum(src_checksum, lang, relative_path)
         tgt = self.lookup(src_checksum, lang, tgt_lang, relative_path)
-        if tgt is None or src is None:
+        if tgt is None:
             return None
         return src, tgt, score
 
@@ -125,20 +209,41 @@ class TranslationCacheCsv(TranslationCache):
         """
         Returns the best match and the score between the provided chunk and all the chunks of the provided language.
         """
-        lang_dir = ensure_lang_cache_dirs(self.root_path, [lang])[0]
-        best_txt, best_score = "", 0.0
-        for path_dir in lang_dir.iterdir():
-            if not path_dir.is_dir():
-                continue
-            candidate_txt, score = get_best_match_in_dir(path_dir, txt)
-            if score > best_score:
-                best_txt, best_score = candidate_txt, score
+        path_hashes = self._lang_path_hashes.get(str(lang))
+        if path_hashes is None:
+            with self._index_lock:
+                path_hashes = self._lang_path_hashes.get(str(lang))
+                if path_hashes is None:
+                    lang_dir = ensure_lang_cache_dirs(self.root_path, [lang])[0]
+                    path_hashes = [path_dir.name for path_dir in lang_dir.iterdir() if path_dir.is_dir()]
+                    self._lang_path_hashes[str(lang)] = path_hashes
+        candidates = itertools.chain.from_iterable(self._dir_chunks(lang, path_hash).items() for path_hash in path_hashes)
+        _, best_txt, best_score = get_best_match_in_chunks(candidates, txt)
         return best_txt, best_score
 
     def do_translation_correspond_to_source(self, src_checksum: str, src_lang: Language, tgt_contents: str, tgt_lang: Language, relative_path: str) -> bool:
-        path_hash = register_path_hash(self.root_path, relative_path)
+        path_hash = self._path_hash(relative_path)
         return do_translation_correspond_to_source(self.root_path, src_checksum, src_lang, tgt_contents, tgt_lang, path_hash)
 
+    def do_translations_correspond_to_sources(
+        self,
+        pairs: list[tuple[str, str]],
+        src_lang: Language,
+        tgt_lang: Language,
+        relative_path: str,
+    ) -> list[bool]:
+        path_hash = self._path_hash(relative_path)
+        return do_translations_correspond_to_sources(
+            self.root_path,
+            [(src_checksum, src_lang, tgt_contents, tgt_lang, path_hash) for src_checksum, tgt_contents in pairs],
+        )
+
     def get_contents_by_checksum(self, checksum: str, lang: Language, relative_path: str) -> str | None:
-        path_hash = register_path_hash(self.root_path, relative_path)
+        path_hash = self._path_hash(relative_path)
         return read_cached_contents_by_lang(self.root_path, checksum, lang, path_hash)
+
+    def flush(self) -> None:
+        """Writes the pending path map and correspondence cache changes to disk."""
+        with self._index_lock:
+            self._unflushed_pairs = 0
+        flush_translation_cache(self.root_path)
@@ -1,21 +1,32 @@
 import asyncio
+import functools
+import json
 import os
+import re
+import weakref
 from pathlib import Path
 
 from google import genai
 from google.genai import types as g_types
+import httpx
 
 from loguru import logger
 
+try: # HTTP/2 multiplexes the concurrent chunk requests on one connection, it needs the optional `h2` package
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 from trans_lib.vocab_list import VocabList
 
-from .constants import INTER_FILE_TRANSLATION_DELAY_SECONDS 
-from .prompts import prompt4
+from .constants import INTER_FILE_TRANSLATION_DELAY_SECONDS, MAX_CONCURRENT_CHUNK_TRANSLATIONS
+from .prompts import prompt4, PROMPT4_EXAMPLE_SLOTS, select_prompt_examples
 
 from .enums import Language
 from .helpers import divide_into_chunks, extract_translated_from_response
 from .errors import TranslationProcessError
-import requests
+from .rate_limiter import AsyncRateLimiter
 
 
 # TODO:
@@ -57,31 +68,99 @@ def get_default_prompt_text() -> str:
 
 def_prompt_template = get_default_prompt_text()
 
-def _prepare_prompt_for_content_type(prompt_template: str, content_type: str) -> str:
+_PROMPT_PLACEHOLDER_RE = re.compile(r"\[(TARGET_LANGUAGE|SOURCE_LANGUAGE|CONTENT_TYPE|CUSTOM_VOCABULARY|OLD_SRC|OLD_TGT)\]")
+
+def _fill_prompt_placeholders(prompt_template: str, values: dict[str, str]) -> str:
     """
-    Replaces the content type placeholder with the given document type
+    Replaces the `[NAME]` placeholders given in `values` in a single pass over the prompt.
+    Placeholders without a value are left as they are, and placeholders appearing in the
+    inserted values (e.g. in a translation example) are never substituted.
     """
-    return prompt_template.replace("[CONTENT_TYPE]", str(content_type))
-
-def _prepare_prompt_for_translation_example(prompt_template: str, src_ex: str, tgt_ex: str) -> str:
-    """Replaces the language placeholder in the prompt."""
-    return prompt_template.replace("[OLD_SRC]", src_ex).replace("[OLD_TGT]", tgt_ex)
-
-def _prepare_prompt_for_language(prompt_template: str, target_language: Language, source_language: Language | None = None) -> str:
-    """Replaces the language placeholder in the prompt."""
+    return _PROMPT_PLACEHOLDER_RE.sub(lambda match: values.get(match.group(1), match.group(0)), prompt_template)
+
+def _vocab_list_text(vocab_list: VocabList | None) -> str:
+    return "" if vocab_list is None else vocab_list.compile_into_llm_vocab_list()
+
+@functools.lru_cache(maxsize=256)
+def build_prompt(
+    prompt_template: str,
+    target_language: Language,
+    source_language: Language | None = None,
+    custom_vocabulary: str = "",
+    content_type: str | None = None,
+    old_src: str | None = None,
+    old_tgt: str | None = None,
+) -> str:
+    """
+    Returns the prompt with its examples and placeholders filled, without the chunk to translate.
+    Consecutive chunks of a file share the same arguments, so the finished prompt is cached.
+    """
+    prompt = _prepare_prompt_for_examples(prompt_template, target_language, source_language, content_type)
+    values = {"TARGET_LANGUAGE": str(target_language), "CUSTOM_VOCABULARY": custom_vocabulary}
     if source_language is not None:
-        prompt_template = prompt_template.replace("[SOURCE_LANGUAGE]", str(source_language))
-    return prompt_template.replace("[TARGET_LANGUAGE]", str(target_language))
-
-def _prepare_prompt_for_vocab_list(prompt: str, vocab_list: VocabList | None) -> str:
-    """Replaces the language placeholder in the prompt."""
-    str_to_put = ""
-    if vocab_list is not None:
-        str_to_put = vocab_list.compile_into_llm_vocab_list()
-    return _paste_vocabulary_into_prompt(prompt, str_to_put)
-
-def _paste_vocabulary_into_prompt(prompt_template: str, vocabulary: str) -> str:
-    return prompt_template.replace("[CUSTOM_VOCABULARY]", str(vocabulary))
+        values["SOURCE_LANGUAGE"] = str(source_language)
+    if content_type is not None:
+        values["CONTENT_TYPE"] = content_type
+    if old_src is not None and old_tgt is not None:
+        values["OLD_SRC"] = old_src
+        values["OLD_TGT"] = old_tgt
+    return _fill_prompt_placeholders(prompt, values)
+
+def _prepare_prompt_for_examples(prompt_template: str, target_language: Language, source_language: Language | None = None, content_type: str | None = None) -> str:
+    """
+    Fills the few-shot example slots with the examples that fit the content type,
+    the ones for the same language pair first.
+    """
+    for slot, group in PROMPT4_EXAMPLE_SLOTS.items():
+        if slot not in prompt_template:
+            continue
+        examples = select_prompt_examples(
+            group,
+            None if source_language is None else str(source_language),
+            str(target_language),
+            content_type,
+        )
+        prompt_template = prompt_template.replace(slot, "\n".join(example.render() for example in examples))
+    return prompt_template
+
+# clients keep connections open between calls; async connections are bound to the
+# event loop they were opened in, so there is one client per running loop
+_GEMINI_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, genai.Client]" = weakref.WeakKeyDictionary()
+_ARISTOTE_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+# one call per delay, as when each call slept for the delay, without blocking the other chunks meanwhile
+_GEMINI_RATE_LIMITER = AsyncRateLimiter(1, INTER_FILE_TRANSLATION_DELAY_SECONDS)
+
+async def aclose_model_clients() -> None:
+    """Closes the model clients opened in the running event loop, the next call opens new ones."""
+    loop = asyncio.get_running_loop()
+    gemini_client = _GEMINI_CLIENTS.pop(loop, None)
+    if gemini_client is not None:
+        await gemini_client.aio.aclose()
+    aristote_client = _ARISTOTE_CLIENTS.pop(loop, None)
+    if aristote_client is not None:
+        await aristote_client.aclose()
+
+def _get_gemini_client() -> genai.Client:
+    loop = asyncio.get_running_loop()
+    client = _GEMINI_CLIENTS.get(loop)
+    if client is None:
+        client = genai.Client(api_key=LLM_API_KEY)
+        _GEMINI_CLIENTS[loop] = client
+    return client
+
+def _get_aristote_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _ARISTOTE_CLIENTS.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            base_url=ARISTOTE_API_BASE_URL,
+            http2=_HTTP2_AVAILABLE,
+            timeout=ARISTOTE_TIMEOUT,
+            limits=httpx.Limits(max_connections=MAX_CONCURRENT_CHUNK_TRANSLATIONS, max_keepalive_connections=MAX_CONCURRENT_CHUNK_TRANSLATIONS),
+        )
+        _ARISTOTE_CLIENTS[loop] = client
+    return client
 
 async def _ask_gemini_model(full_prompt_message: str, model_name: str = "gemini-2.5-flash-preview-05-20") -> str:
     """
@@ -91,7 +170,7 @@ async def _ask_gemini_model(full_prompt_message: str, model_name: str = "gemini-
     if not LLM_API_KEY: # Re-check in case it wasn't set at module load
         raise EnvironmentError("LLM_API_KEY environment variable must be set for translation.")
 
-    client = genai.Client(api_key=LLM_API_KEY)
+    client = _get_gemini_client()
 
     try:
         contents = g_types.Content(
@@ -102,8 +181,8 @@ async def _ask_gemini_model(full_prompt_message: str, model_name: str = "gemini-
 
         # print(f"DEBUG: Sending to Gemini: {full_prompt_message[:200]}...") # Log request start
 
-        await asyncio.sleep(INTER_FILE_TRANSLATION_DELAY_SECONDS)
-        response = client.models.generate_content(
+        await _GEMINI_RATE_LIMITER.acquire()
+        response = await client.aio.models.generate_content(
                 model=model_name,
                 contents=contents
         )
@@ -116,22 +195,42 @@ async def _ask_gemini_model(full_prompt_message: str, model_name: str = "gemini-
         logger.error(f"Error communicating with Gemini API: {e}")
         raise TranslationProcessError(f"Gemini API call failed: {e}", original_exception=e)
 
-async def _ask_aristote(full_prompt_message: str) -> str:
-    aristote_API_ENDPOINT = "https://aristote-dispatcher.mydocker-run-vd.centralesupelec.fr/v1/chat/completions"
-    model = "casperhansen/llama-3.3-70b-instruct-awq" # Nom du modèle à utiliser
+ARISTOTE_API_BASE_URL = "https://aristote-dispatcher.mydocker-run-vd.centralesupelec.fr"
+ARISTOTE_API_ENDPOINT = "/v1/chat/completions"
+ARISTOTE_MODEL = "casperhansen/llama-3.3-70b-instruct-awq" # Nom du modèle à utiliser
+# a completion takes a while to be generated, but a stalled connection mustn't hang the translation forever
+ARISTOTE_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+_JSON_UTF8_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+def _encode_chat_request(model: str, full_prompt_message: str) -> bytes:
+    """
+    Serializes a chat completion request to UTF-8 JSON once.
+    Non-ASCII text is kept as-is instead of being escaped to \\uXXXX, which
+    roughly triples the body size of non-Latin prompts.
+    """
     data = {
     "model": model, 
     "messages": [{"role": "user", "content":full_prompt_message}],  #remplir content avec votre message
     }
-    response = requests.post(aristote_API_ENDPOINT, json=data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+async def _ask_aristote(full_prompt_message: str) -> str:
+    body = _encode_chat_request(ARISTOTE_MODEL, full_prompt_message)
+    response = await _get_aristote_client().post(ARISTOTE_API_ENDPOINT, content=body, headers=_JSON_UTF8_HEADERS)
     return response.json().get("choices")[0].get("message").get("content")
 
 def finalize_prompt(prompt: str, contents_to_translate: str) -> str:
    return f"{prompt}\n<document>\n{contents_to_translate}\n</document>"
 
+@functools.lru_cache(maxsize=256)
+def _split_at_source_slots(prompt: str) -> tuple[str, ...]:
+   # built prompts come from build_prompt's cache, the same string (and its cached hash) is seen for every chunk
+   return tuple(prompt.split("[SRC]"))
+
 def finalize_xml_prompt(prompt: str, contents_to_translate: str) -> str:
    # return f"{prompt}\n{contents_to_translate}\n"
-   return prompt.replace("[SRC]", contents_to_translate)
+   # same as prompt.replace("[SRC]", contents), without scanning the prompt again for each chunk
+   return contents_to_translate.join(_split_at_source_slots(prompt))
 
 async def translate_chunk_with_prompt(prompt: str, chunk: str, is_xml: bool = False) -> str:
     """
@@ -145,39 +244,31 @@ async def translate_chunk_with_prompt(prompt: str, chunk: str, is_xml: bool = Fa
     return extract_translated_from_response(translated_response_text)
 
 
-async def translate_chunk_async(text_chunk: str, target_language: Language, vocab_list: VocabList | None) -> str:
-    """Translates a single chunk of text asynchronously."""
-    prompt_for_lang = _prepare_prompt_for_language(def_prompt_template, target_language)
-    prompt_for_lang = _prepare_prompt_for_vocab_list(prompt_for_lang, vocab_list)
+async def translate_chunk_async(text_chunk: str, target_language: Language, vocab_list: VocabList | None, content_type: str | None = None) -> str:
+    """Translates a single chunk of text asynchronously, `content_type` selects the prompt examples."""
+    prompt_for_lang = build_prompt(def_prompt_template, target_language, custom_vocabulary=_vocab_list_text(vocab_list), content_type=content_type)
     
     return await translate_chunk_with_prompt(prompt_for_lang, text_chunk)
 
-async def translate_contents_async(contents: str, target_language: Language, lines_per_chunk: int = 50, vocab_list: VocabList | None = None) -> str:
+async def translate_contents_async(contents: str, target_language: Language, lines_per_chunk: int = 50, vocab_list: VocabList | None = None, content_type: str | None = None) -> str:
     """
     Translates the given string contents asynchronously, handling chunking.
-    Includes a delay between chunk translations for rate limiting.
+    Chunks are translated concurrently, at most MAX_CONCURRENT_CHUNK_TRANSLATIONS at a time.
     """
-    if not contents.strip():
+    if not contents or contents.isspace():
         return ""
 
     chunks = divide_into_chunks(contents, lines_per_chunk)
-    translated_chunks: list[str] = []
-
-    # Rate limiting: Delay between chunks
-    # The Rust code had sleep(5) inside ask_gemini_model (for each chunk indirectly)
-    # and then an additional sleep(8) in translate_file_helper (after each file).
-    # This suggests a need for delays.
-    INTER_CHUNK_DELAY_SECONDS = 5 # Corresponds to the sleep in ask_gemini_model
-
-    for i, chunk in enumerate(chunks):
-        if not chunk.strip(): # Skip empty chunks
-            translated_chunks.append(chunk) # Preserve empty lines if they form a chunk
-            continue
-
-        translated_chunk = await translate_chunk_async(chunk, target_language, vocab_list)
-        translated_chunks.append(translated_chunk)
-        
-        if i < len(chunks) - 1: # If not the last chunk
-            print(f"Translated chunk {i+1}/{len(chunks)}. Waiting for {INTER_CHUNK_DELAY_SECONDS}s...")
-            
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHUNK_TRANSLATIONS)
+
+    async def translate_bounded(i: int, chunk: str) -> str:
+        if not chunk or chunk.isspace(): # Preserve empty lines if they form a chunk
+            return chunk
+        async with semaphore:
+            translated_chunk = await translate_chunk_async(chunk, target_language, vocab_list, content_type)
+        logger.debug("Translated chunk {}/{}.", i + 1, len(chunks))
+        return translated_chunk
+
+    # gather keeps the results in the order of the chunks
+    translated_chunks = await asyncio.gather(*(translate_bounded(i, chunk) for i, chunk in enumerate(chunks)))
     return "".join(translated_chunks)
@@ -19,10 +19,11 @@ def correct_chunk_translation(root_path: Path, src_checksum: str, src_lang: Lang
     if _src_contents is None:
         raise ChecksumNotFoundError(f"Given source checksum ({src_checksum}) isn't found in the cache")
 
-    if store.do_translation_correspond_to_source(src_checksum, src_lang, new_translation, tgt_lang, relative_path):
-        return 
-
     tgt_checksum = calculate_checksum(new_translation)
+    # the pair is already recorded: nothing to persist
+    if src_lang != tgt_lang and store.lookup_checksum(src_checksum, src_lang, tgt_lang, relative_path) == tgt_checksum:
+        return
+
     logger.debug(f"Correcting: src({src_checksum}) and tgt({tgt_checksum})")
     store.persist_pair(src_checksum, tgt_checksum, src_lang, tgt_lang, _src_contents, new_translation, relative_path)
     
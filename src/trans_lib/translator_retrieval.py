@@ -1,14 +1,22 @@
 import asyncio
+import inspect
+import json
+import random
 import re
+import threading
+import weakref
 from dataclasses import dataclass
-from typing import Callable
+from functools import lru_cache
+from typing import Awaitable, Callable, ClassVar, Iterable, TypeVar
 import xml.etree.ElementTree as ET
 from loguru import logger
 from trans_lib.helpers import calculate_checksum, extract_translated_from_response
 from pathlib import Path
+from trans_lib.constants import MAX_CONCURRENT_CHUNK_TRANSLATIONS
+from trans_lib.rate_limiter import AsyncRateLimiter, SlidingWindowLimiter, estimate_tokens, retry_after_seconds, shared_rate_limiter
 from trans_lib.enums import ChunkType, DocumentType, Language
 from trans_lib.translation_cache.translation_cache import TranslationCache, TranslationCacheCsv
-from trans_lib.translator import finalize_prompt, finalize_xml_prompt, _prepare_prompt_for_language, _prepare_prompt_for_vocab_list, _prepare_prompt_for_content_type, _prepare_prompt_for_translation_example
+from trans_lib.translator import build_prompt, finalize_prompt, finalize_xml_prompt, _vocab_list_text
 from trans_lib.vocab_list import VocabList
 from trans_lib.xml_manipulator_mod.xml import reconstruct_from_xml
 from trans_lib.xml_manipulator_mod.mod import chunk_contains_ph_only, chunk_to_xml, chunk_to_xml_with_placeholders, code_to_xml
@@ -33,6 +41,9 @@ def is_whitespace(text: str) -> bool:
 
 TYPST_INTERNAL_SUBCHUNK_MAX_CHARS = 2000
 
+# split points, by preference: paragraph break, newline, after a sentence, any whitespace
+_SPLIT_BOUNDARY_RE = re.compile(r"\n\s*\n+|\n|(?<=\.)\s+|\s+")
+
 
 def _split_long_text_by_boundary(long_text: str, max_chars_num: int) -> list[str]:
     """Split an oversized plain-text fragment near natural boundaries.
@@ -46,13 +57,12 @@ def _split_long_text_by_boundary(long_text: str, max_chars_num: int) -> list[str
         return [long_text]
 
     min_split = max(1, int(max_chars_num * 0.6))
-    boundary = re.compile(r"\n\s*\n+|\n|(?<=\.)\s+|\s+")
 
     pieces: list[str] = []
     rest = long_text
     while len(rest) > max_chars_num:
         candidate = 0
-        for match in boundary.finditer(rest[: max_chars_num + 1]):
+        for match in _SPLIT_BOUNDARY_RE.finditer(rest[: max_chars_num + 1]):
             split_idx = match.end()
             if split_idx >= min_split:
                 candidate = split_idx
@@ -134,8 +144,16 @@ def _split_typst_chunk_for_internal_translation(
 
     return chunk_parts
 
-@dataclass
+T = TypeVar("T")
+
+# values of `Meta.kind`, compared on the hot path instead of isinstance checks
+_PLAIN_META = 0
+_CODE_META = 1
+_EXAMPLE_META = 2
+
+@dataclass(slots=True, frozen=True)
 class Meta:
+    kind: ClassVar[int] = _PLAIN_META
     chunk: str
     src_lang: Language
     tgt_lang: Language
@@ -144,26 +162,14 @@ class Meta:
     vocab: VocabList | None
     rel_path: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CodeMeta(Meta):
-    chunk: str
-    src_lang: Language
-    tgt_lang: Language
-    doc_type: DocumentType
-    chunk_type: ChunkType
-    vocab: VocabList | None
-    rel_path: str
+    kind: ClassVar[int] = _CODE_META
     prog_lang: str
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WithExampleMeta(Meta):
-    chunk: str
-    src_lang: Language
-    tgt_lang: Language
-    doc_type: DocumentType
-    chunk_type: ChunkType
-    vocab: VocabList | None
-    rel_path: str
+    kind: ClassVar[int] = _EXAMPLE_META
     ex_src: str
     ex_tgt: str
 
@@ -180,22 +186,23 @@ class TranslateStrategy:
     def __init__(
         self,
         prompt_builder: Callable[[Meta], tuple[str, PromptContext]],
-        call_model: Callable[[str], str],
         postprocess: Callable[[str, PromptContext], str],
     ) -> None:
         self._prompt_builder = prompt_builder
-        self._call_model = call_model
         self._post = postprocess
 
-    def set_call_model(self, call_mode: Callable[[str], str]) -> None:
-        self._call_model = call_mode
-
     async def run(
         self,
-        params: Meta
+        params: Meta,
+        call_model: Callable[[str], str | Awaitable[str]] | None = None,
     ) -> str:
+        """Translates one chunk with the given model call, without one the prompt itself is post-processed."""
         prompt, context = self._prompt_builder(params)
-        raw = self._call_model(prompt)
+        if call_model is None:
+            return self._post(prompt, context)
+        raw = call_model(prompt)
+        if inspect.isawaitable(raw):
+            raw = await raw
         return self._post(raw, context)
 
 
@@ -207,16 +214,35 @@ def _plain_prompt_builder(template: str):
         tgt = params.tgt_lang
         src = params.src_lang
         vocab = params.vocab
-        p = _prepare_prompt_for_language(template, tgt, src)
-        p = _prepare_prompt_for_vocab_list(p, vocab)
+        # the content type only picks the examples, prompt4 has no [CONTENT_TYPE] slot
+        content_type = content_type_for(params.doc_type, params.chunk_type, params.prog_lang if params.kind == _CODE_META else None)
+        p = build_prompt(template, tgt, src, _vocab_list_text(vocab), content_type)
         p = finalize_prompt(p, chunk)
         return p, PromptContext(is_xml=False)
 
     return _builder
 
 
-def _xml_prompt_builder(doc_type: DocumentType, chunk_type: ChunkType):
-    def _builder(params: Meta):
+@lru_cache(maxsize=64)
+def content_type_for(doc_type: DocumentType, chunk_type: ChunkType, prog_lang: str | None) -> str:
+    """Name of the content given to the prompts, `prog_lang` is only set for code metas."""
+    if doc_type == DocumentType.LaTeX:
+        return "LaTeX"
+    if doc_type == DocumentType.Typst:
+        return "Typst"
+    if (doc_type == DocumentType.JupyterNotebook and chunk_type == ChunkType.Myst) or doc_type == DocumentType.Markdown:
+        return "MyST"
+    if doc_type == DocumentType.JupyterNotebook and chunk_type == ChunkType.Code and prog_lang is not None:
+        return f"{prog_lang} code"
+    return "any document"
+
+
+def _xml_prompt_parts_builder(doc_type: DocumentType, chunk_type: ChunkType):
+    """Builds `(prompt with its [SRC] slot, xml chunk, context)`, the prompt only depends on the languages, vocabulary and example."""
+    # only code chunks name their language, the other strategies always use the same content type
+    default_content_type = content_type_for(doc_type, chunk_type, None)
+
+    def _parts(params: Meta) -> tuple[str, str, PromptContext]:
         chunk = params.chunk
         tgt = params.tgt_lang
         src = params.src_lang
@@ -224,38 +250,36 @@ def _xml_prompt_builder(doc_type: DocumentType, chunk_type: ChunkType):
         placeholders: dict[str, str] = {}
         vocab = params.vocab
 
-        # lang = None
+        kind = params.kind
+        prog_lang = None
         if chunk_type == ChunkType.Code:
-            if isinstance(params, CodeMeta):
+            if kind == _CODE_META:
                 logger.debug("Preparing XML chunk for code translation.")
-                xml_chunk, placeholders, _ = code_to_xml(chunk, params.prog_lang)
+                prog_lang = params.prog_lang
+                xml_chunk, placeholders, _ = code_to_xml(chunk, prog_lang)
         else:
             xml_chunk, placeholders = chunk_to_xml_with_placeholders(chunk, chunk_type)
 
         prompt = xml_translation_prompt
-        if isinstance(params, WithExampleMeta) and chunk_type != ChunkType.Code:
+        ex_src = ex_tgt = None
+        if kind == _EXAMPLE_META and chunk_type != ChunkType.Code:
             prompt = xml_with_previous_translation_prompt
             ex_src = chunk_to_xml(params.ex_src, chunk_type)
             ex_tgt = chunk_to_xml(params.ex_tgt, chunk_type)
-            prompt = _prepare_prompt_for_translation_example(prompt, ex_src, ex_tgt)
-
-        prompt = _prepare_prompt_for_language(prompt, tgt, src)
-        def get_content_type() -> str:
-            if doc_type == DocumentType.LaTeX:
-                return "LaTeX"
-            if doc_type == DocumentType.Typst:
-                return "Typst"
-            if (doc_type == DocumentType.JupyterNotebook and chunk_type == ChunkType.Myst) or doc_type == DocumentType.Markdown:
-                return "MyST"
-            if doc_type == DocumentType.JupyterNotebook and chunk_type == ChunkType.Code and type(params) is CodeMeta:
-                prog_lang = params.prog_lang
-                return f"{prog_lang} code"
-            else:
-                return "any document"
-        prompt = _prepare_prompt_for_content_type(prompt, get_content_type())
-        prompt = _prepare_prompt_for_vocab_list(prompt, vocab)
-        prompt = finalize_xml_prompt(prompt, xml_chunk)
-        return prompt, PromptContext(is_xml=True, placeholders=placeholders)
+
+        content_type = default_content_type if prog_lang is None else content_type_for(doc_type, chunk_type, prog_lang)
+        prompt = build_prompt(prompt, tgt, src, _vocab_list_text(vocab), content_type, ex_src, ex_tgt)
+        return prompt, xml_chunk, PromptContext(is_xml=True, placeholders=placeholders)
+
+    return _parts
+
+
+def _xml_prompt_builder(doc_type: DocumentType, chunk_type: ChunkType):
+    parts = _xml_prompt_parts_builder(doc_type, chunk_type)
+
+    def _builder(params: Meta):
+        prompt, xml_chunk, context = parts(params)
+        return finalize_xml_prompt(prompt, xml_chunk), context
 
     return _builder
 
@@ -266,23 +290,18 @@ def _identity_prompt_builder():
     return _builder
 
 async def _call_model_func(text: str) -> str:
-    # print("=======================")
-    # print("prompt:")
-    # print(text)
+    # formatted only when trace logging is enabled
+    logger.trace("prompt:\n{}", text)
     return await _ask_gemini_model(text, model_name="gemini-2.0-flash")
 
-def _dont_call_model(text: str) -> str:
-    return text
-
 # ---- Strategies map ------------------------------------------------ #
-LATEX_STRATEGY   = TranslateStrategy(_xml_prompt_builder(DocumentType.LaTeX, ChunkType.LaTeX), _dont_call_model, lambda r, ctx: reconstruct_from_xml(extract_translated_from_response(r), ctx.placeholders))
-MYST_STRATEGY    = TranslateStrategy(_xml_prompt_builder(DocumentType.JupyterNotebook, ChunkType.Myst), _dont_call_model,  lambda r, ctx: reconstruct_from_xml(extract_translated_from_response(r), ctx.placeholders))
-PLAIN_STRATEGY   = TranslateStrategy(_plain_prompt_builder(prompt4), _dont_call_model,                    lambda r, ctx: extract_translated_from_response(r))
-CODE_STRATEGY    = TranslateStrategy(_identity_prompt_builder(), _dont_call_model,  lambda r, ctx: r)
-MD_STRATEGY    = TranslateStrategy(_xml_prompt_builder(DocumentType.Markdown, ChunkType.Myst), _dont_call_model,  lambda r, ctx: reconstruct_from_xml(extract_translated_from_response(r), ctx.placeholders))
+LATEX_STRATEGY   = TranslateStrategy(_xml_prompt_builder(DocumentType.LaTeX, ChunkType.LaTeX), lambda r, ctx: reconstruct_from_xml(extract_translated_from_response(r), ctx.placeholders))
+MYST_STRATEGY    = TranslateStrategy(_xml_prompt_builder(DocumentType.JupyterNotebook, ChunkType.Myst), lambda r, ctx: reconstruct_from_xml(extract_translated_from_response(r), ctx.placeholders))
+PLAIN_STRATEGY   = TranslateStrategy(_plain_prompt_builder(prompt4), lambda r, ctx: extract_translated_from_response(r))
+CODE_STRATEGY    = TranslateStrategy(_identity_prompt_builder(), lambda r, ctx: r)
+MD_STRATEGY    = TranslateStrategy(_xml_prompt_builder(DocumentType.Markdown, ChunkType.Myst), lambda r, ctx: reconstruct_from_xml(extract_translated_from_response(r), ctx.placeholders))
 TYPST_STRATEGY = TranslateStrategy(
     _xml_prompt_builder(DocumentType.Typst, ChunkType.Typst),
-    _dont_call_model,
     lambda r, ctx: reconstruct_from_xml(extract_translated_from_response(r), ctx.placeholders),
 )
 
@@ -295,6 +314,118 @@ STRATEGY_MAP: dict[tuple[DocumentType, ChunkType], TranslateStrategy] = {
     (DocumentType.Other,            ChunkType.Other): PLAIN_STRATEGY,
 }
 
+# strategies indexed by document type then chunk type: two dict hits on enum members, no key tuple per chunk
+_STRATEGIES_BY_TYPE: dict[DocumentType, dict[ChunkType, TranslateStrategy]] = {}
+for (_doc_type, _chunk_type), _strategy in STRATEGY_MAP.items():
+    _STRATEGIES_BY_TYPE.setdefault(_doc_type, {})[_chunk_type] = _strategy
+del _doc_type, _chunk_type, _strategy
+
+
+def _strategy_for(meta: Meta) -> TranslateStrategy:
+    return _STRATEGIES_BY_TYPE[meta.doc_type][meta.chunk_type]
+
+
+def _translation_key(meta: Meta) -> tuple[str, Language, Language, str]:
+    return calculate_checksum(meta.chunk), meta.src_lang, meta.tgt_lang, meta.rel_path
+
+
+def _needs_internal_subchunks(meta: Meta) -> bool:
+    """Typst chunks above the size limit are translated piece by piece."""
+    return (
+        meta.doc_type == DocumentType.Typst
+        and meta.chunk_type == ChunkType.Typst
+        and len(meta.chunk) > TYPST_INTERNAL_SUBCHUNK_MAX_CHARS
+    )
+
+
+# shorter chunks (titles, labels) aren't given a translation example: their similarity scores are noisy
+MIN_EXAMPLE_CHUNK_LENGTH = 64
+
+
+def _is_already_in_target_language(meta: Meta) -> bool:
+    """
+    Cheap check for chunks that the model would only echo back: the source and
+    target languages are the same, or the chunk has no letters at all (numbers,
+    punctuation, math symbols), so there is no natural language to translate.
+    """
+    if meta.src_lang == meta.tgt_lang:
+        return True
+    return not any(ch.isalpha() for ch in meta.chunk)
+
+
+# substrings of provider errors that report a transient overload rather than a failed request
+_TRANSIENT_ERROR_MARKERS = ("overloaded", "malformed")
+
+
+def _is_transient_model_error(exc: Exception) -> bool:
+    """
+    Tells whether a failed model call is worth resubmitting: providers report overloads
+    either with a typed error, with a generic API error or with a truncated JSON body.
+    Broken XML is left to the translator's own fallback chain.
+    """
+    if isinstance(exc, (ModelOverloadedError, json.JSONDecodeError)):
+        return True
+    if isinstance(exc, ApiCallError):
+        message = str(exc).lower()
+        return any(marker in message for marker in _TRANSIENT_ERROR_MARKERS)
+    return False
+
+
+# one lock per caller: without a configured rate limit, its calls and their cooldowns are serialized
+_CALLER_LOCKS: "weakref.WeakKeyDictionary[LLMCaller, threading.Lock]" = weakref.WeakKeyDictionary()
+_CALLER_LOCKS_GUARD = threading.Lock()
+
+
+def _caller_lock(caller: LLMCaller) -> threading.Lock:
+    with _CALLER_LOCKS_GUARD:
+        lock = _CALLER_LOCKS.get(caller)
+        if lock is None:
+            lock = _CALLER_LOCKS[caller] = threading.Lock()
+        return lock
+
+
+def _caller_model_function(
+    caller: LLMCaller,
+    rate_limiter: AsyncRateLimiter | SlidingWindowLimiter | None = None,
+) -> Callable[[str], Awaitable[str]]:
+    if rate_limiter is not None:
+        # the limiter spaces the calls out, the caller's blocking cooldown isn't needed
+        async def f_call_model(t: str) -> str:
+            await rate_limiter.acquire(estimate_tokens(t))
+            return await asyncio.to_thread(caller.call, t)
+    else:
+        lock = _caller_lock(caller)
+
+        def call_and_cool_down(t: str) -> str:
+            # LLMCaller.call isn't meant to be called concurrently and its cooldown is the
+            # provider's rate limit: the chunks translated at once take turns, each call
+            # followed by its cooldown before the next one starts
+            with lock:
+                res = caller.call(t)
+                caller.wait_cooldown()
+                return res
+
+        async def f_call_model(t: str) -> str:
+            # the caller and its cooldown block, run them in a worker thread so that
+            # other chunks keep translating meanwhile
+            return await asyncio.to_thread(call_and_cool_down, t)
+
+    return f_call_model
+
+
+async def gather_bounded(
+    awaitables: Iterable[Awaitable[T]],
+    max_concurrency: int = MAX_CONCURRENT_CHUNK_TRANSLATIONS,
+) -> list[T]:
+    """Awaits the awaitables with at most `max_concurrency` of them running at once, returns the results in order."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def bounded(awaitable: Awaitable[T]) -> T:
+        async with semaphore:
+            return await awaitable
+
+    return list(await asyncio.gather(*(bounded(awaitable) for awaitable in awaitables)))
+
 
 class ChunkTranslator:
     """Facade: one method replaces legacy free‑function."""
@@ -308,14 +439,39 @@ class ChunkTranslator:
         overload_retry_attempts: int = 5,
         overload_retry_initial_delay: float = 1.0,
         overload_retry_max_delay: float = 16.0,
+        overload_retry_jitter: bool = True,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: int | None = None,
     ):
+        """Without a rate limit, the model calls made through one caller are serialized,
+        each followed by the caller's cooldown, even when several chunks are being
+        translated at once.
+        `requests_per_minute`, when given, rate limits the model calls of this
+        translator instead of the caller's blocking cooldown after each call, and
+        lets them run concurrently.
+        With `tokens_per_minute`, both limits are enforced over a sliding window
+        by a limiter shared with every translator using the same limits.
+        With `overload_retry_jitter`, each overload retry waits a
+        random time up to the exponential backoff delay, so that chunks failing
+        together don't all retry at the same moment."""
         self._store = store
         self._caller: LLMCaller | None = model_caller
         self._reasoning_caller: LLMCaller | None = reasoning_caller
         self._overload_attempts = max(1, overload_retry_attempts)
         self._overload_initial_delay = max(0.0, overload_retry_initial_delay)
         self._overload_max_delay = max(self._overload_initial_delay, overload_retry_max_delay)
+        self._overload_jitter = overload_retry_jitter
         self._session_checksums: set[str] = set()
+        self._rate_limiter: AsyncRateLimiter | SlidingWindowLimiter | None = None
+        if tokens_per_minute:
+            rpm = int(requests_per_minute) if requests_per_minute else None
+            self._rate_limiter = shared_rate_limiter(rpm, tokens_per_minute)
+        elif requests_per_minute:
+            self._rate_limiter = AsyncRateLimiter(requests_per_minute, 60.0)
+        # cache hits already read from the store, keyed by (src_checksum, src_lang, tgt_lang, rel_path)
+        self._known_translations: dict[tuple[str, Language, Language, str], str] = {}
+        # chunks being translated right now, with the same keys
+        self._in_flight: dict[tuple[str, Language, Language, str], asyncio.Future[tuple[str, bool]]] = {}
 
     async def _translate_oversized_typst_chunk_async(
         self,
@@ -356,14 +512,10 @@ class ChunkTranslator:
         return "".join(translated_parts), all_from_cache
 
     async def _run_with_caller(self, strategy: TranslateStrategy, meta: Meta, caller: LLMCaller | None) -> str:
-        """Sets up the caller on the strategy and runs it with overload retry."""
-        if caller is not None and strategy != CODE_STRATEGY:
-            def f_call_model(t):
-                res = caller.call(t)
-                caller.wait_cooldown()
-                return res
-            strategy.set_call_model(f_call_model)
-        return await self._translate_with_retry(strategy, meta)
+        """Runs the strategy with the given caller as its model, with overload retry."""
+        # strategies are shared by every translator: the model call is passed along, never stored on them
+        call_model = _caller_model_function(caller, self._rate_limiter) if caller is not None and strategy is not CODE_STRATEGY else None
+        return await self._translate_with_retry(strategy, meta, call_model)
 
     async def translate_or_fetch(self, meta: Meta) -> tuple[str, bool]:
         """Translate one chunk or return it from cache.
@@ -375,60 +527,136 @@ class ChunkTranslator:
         - oversized Typst chunks are internally subchunked and translated piece
           by piece,
         - final persistence is still done at full original chunk granularity.
+
+        Concurrent requests for the same chunk are coalesced: only the first one
+        translates it, the others wait for its result. When the first one is
+        cancelled, a waiting duplicate translates the chunk instead.
+        """
+        if is_whitespace(meta.chunk):
+            return meta.chunk, True  # whitespace → passthrough, before any hashing
+        key = _translation_key(meta)
+        while (pending := self._in_flight.get(key)) is not None:
+            # asyncio.wait: a cancelled duplicate must not cancel the translation it waits for
+            await asyncio.wait((pending,))
+            if not pending.cancelled():
+                return pending.result()
+            # the translating request was cancelled: one of its duplicates takes over
+
+        future: asyncio.Future[tuple[str, bool]] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            done = await self._fetch_without_model(meta, key)
+            if done is None:
+                done = await self._translate_with_model(await self._with_example(meta))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # marks it as retrieved when nobody else waits for it
+            raise
+        finally:
+            del self._in_flight[key]
+        future.set_result(done)
+        return done
+
+    async def aclose(self) -> None:
+        """Writes the translations persisted so far by this translator to disk."""
+        await asyncio.to_thread(self._store.flush)
+
+    async def _fetch_without_model(
+        self,
+        meta: Meta,
+        key: tuple[str, Language, Language, str] | None = None,
+    ) -> tuple[str, bool] | None:
+        """Returns the chunk's translation when no model call is needed (whitespace, cache hit, placeholders only), else None.
+
+        `key` is the chunk's `_translation_key` when the caller already computed it.
         """
         chunk = meta.chunk
-        if not chunk.strip():
+        if is_whitespace(chunk):
             return chunk, True  # whitespace → passthrough
 
-        src_checksum = calculate_checksum(chunk)
-        cached = self._store.lookup(src_checksum, meta.src_lang, meta.tgt_lang, meta.rel_path)
+        if key is None:
+            key = _translation_key(meta)
+        src_checksum = key[0]
+        cached = self._known_translations.get(key)
+        if cached is None:
+            # the store reads chunk files, keep the event loop free for the other chunks meanwhile
+            cached = await asyncio.to_thread(self._store.lookup, src_checksum, meta.src_lang, meta.tgt_lang, meta.rel_path)
+            if cached is not None:
+                self._known_translations[key] = cached
         if cached is not None:
             from_cache = src_checksum not in self._session_checksums
-            logger.debug(f"cache hit ({meta.src_lang} -> {meta.tgt_lang}), from_cache={from_cache}")
+            logger.debug("cache hit ({} -> {}), from_cache={}", meta.src_lang, meta.tgt_lang, from_cache)
             return cached, from_cache
 
-        strategy = STRATEGY_MAP[(meta.doc_type, meta.chunk_type)]
-        ph_only = chunk_contains_ph_only(chunk, meta.chunk_type)
-        caller = self._caller
+        if meta.chunk_type == ChunkType.Code:
+            # code isn't translated yet: passthrough without scanning the chunk for letters
+            ph_only = True
+        elif _is_already_in_target_language(meta):
+            logger.trace("chunk is already in the target language")
+            ph_only = True
+        else:
+            ph_only = chunk_contains_ph_only(chunk, meta.chunk_type)
 
-        example = self._store.get_best_pair_example_from_cache(meta.src_lang, meta.tgt_lang, meta.chunk, meta.rel_path)
+        if ph_only:
+            logger.trace("ph only")
+            logger.trace(chunk)
+            logger.trace("=======")
+            await self._persist_translation(meta, chunk, from_cache=True)
+            # repeated passthrough chunks (code fences, separators) skip the lookup and the write next time
+            self._known_translations[key] = chunk
+            return chunk, True  # no LLM called — passthrough, never needs review
+        return None
+
+    async def _with_example(self, meta: Meta) -> Meta:
+        """Attaches the closest already translated chunk as an example when it is similar enough."""
+        if len(meta.chunk) < MIN_EXAMPLE_CHUNK_LENGTH:
+            return meta
+        # the similarity search compares the chunk with every cached chunk of the file, off the event loop
+        example = await asyncio.to_thread(
+            self._store.get_best_pair_example_from_cache, meta.src_lang, meta.tgt_lang, meta.chunk, meta.rel_path
+        )
         if example is not None:
             src_ex, tgt_ex, score = example
             if score > 0.7:
                 logger.debug("Found an example for a chunk")
-                meta = WithExampleMeta(
-                    meta.chunk,
-                    meta.src_lang,
-                    meta.tgt_lang,
-                    meta.doc_type,
-                    meta.chunk_type,
-                    meta.vocab,
-                    meta.rel_path,
-                    src_ex,
-                    tgt_ex,
+                return WithExampleMeta(
+                    chunk=meta.chunk,
+                    src_lang=meta.src_lang,
+                    tgt_lang=meta.tgt_lang,
+                    doc_type=meta.doc_type,
+                    chunk_type=meta.chunk_type,
+                    vocab=meta.vocab,
+                    rel_path=meta.rel_path,
+                    ex_src=src_ex,
+                    ex_tgt=tgt_ex,
                 )
+        return meta
+
+    async def _persist_translation(self, meta: Meta, translated: str, from_cache: bool = False) -> None:
+        src_checksum = calculate_checksum(meta.chunk)
+        if not from_cache:
+            self._session_checksums.add(src_checksum)
+        await asyncio.to_thread(
+            self._store.persist_pair,
+            src_checksum,
+            calculate_checksum(translated),
+            meta.src_lang,
+            meta.tgt_lang,
+            meta.chunk,
+            translated,
+            meta.rel_path,
+        )
 
-        if ph_only:
-            logger.trace("ph only")
-            logger.trace(chunk)
-            logger.trace("=======")
-            tgt_checksum = calculate_checksum(chunk)
-            self._store.persist_pair(
-                src_checksum,
-                tgt_checksum,
-                meta.src_lang,
-                meta.tgt_lang,
-                chunk,
-                chunk,
-                meta.rel_path,
-            )
-            return chunk, True  # no LLM called — passthrough, never needs review
+    async def _translate_with_model(self, meta: Meta) -> tuple[str, bool]:
+        """Translates a chunk that isn't in the cache and needs the model."""
+        chunk = meta.chunk
+        strategy = _strategy_for(meta)
+        caller = self._caller
 
-        if (
-            meta.doc_type == DocumentType.Typst
-            and meta.chunk_type == ChunkType.Typst
-            and len(chunk) > TYPST_INTERNAL_SUBCHUNK_MAX_CHARS
-        ):
+        if _needs_internal_subchunks(meta):
             subchunks = _split_typst_chunk_for_internal_translation(
                 chunk,
                 TYPST_INTERNAL_SUBCHUNK_MAX_CHARS,
@@ -440,18 +668,7 @@ class ChunkTranslator:
                     root_exc = exc.original_exception if exc.original_exception is not None else exc
                     raise ChunkTranslationFailed(chunk, root_exc) from exc
 
-                tgt_checksum = calculate_checksum(translated)
-                if not from_cache:
-                    self._session_checksums.add(src_checksum)
-                self._store.persist_pair(
-                    src_checksum,
-                    tgt_checksum,
-                    meta.src_lang,
-                    meta.tgt_lang,
-                    chunk,
-                    translated,
-                    meta.rel_path,
-                )
+                await self._persist_translation(meta, translated, from_cache)
                 return translated, from_cache
 
         try:
@@ -481,25 +698,22 @@ class ChunkTranslator:
             )
             raise ChunkTranslationFailed(chunk, exc) from exc
 
-        tgt_checksum = calculate_checksum(translated)
-        self._session_checksums.add(src_checksum)
-        self._store.persist_pair(
-            src_checksum,
-            tgt_checksum,
-            meta.src_lang,
-            meta.tgt_lang,
-            chunk,
-            translated,
-            meta.rel_path,
-        )
+        await self._persist_translation(meta, translated)
         return translated, False
 
-    async def _translate_with_retry(self, strategy: TranslateStrategy, meta: Meta) -> str:
+    async def _translate_with_retry(
+        self,
+        strategy: TranslateStrategy,
+        meta: Meta,
+        call_model: Callable[[str], str | Awaitable[str]] | None = None,
+    ) -> str:
         delay = self._overload_initial_delay or 1.0
         for attempt in range(1, self._overload_attempts + 1):
             try:
-                return await strategy.run(meta)
-            except ModelOverloadedError as exc:
+                return await strategy.run(meta, call_model)
+            except Exception as exc:
+                if not _is_transient_model_error(exc):
+                    raise
                 if attempt >= self._overload_attempts:
                     logger.error(
                         f"Model overloaded after {attempt} attempts, giving up.",
@@ -507,6 +721,15 @@ class ChunkTranslator:
                     raise exc
 
                 wait_seconds = min(delay, self._overload_max_delay)
+                if self._overload_jitter:
+                    wait_seconds = random.uniform(0, wait_seconds)
+                retry_after = retry_after_seconds(exc)
+                if retry_after is not None:
+                    # the provider said when it has capacity again: wait that long and hold
+                    # back the other chunks sharing the limiter instead of letting them hit it too
+                    wait_seconds = max(wait_seconds, retry_after)
+                    if self._rate_limiter is not None:
+                        self._rate_limiter.pause(retry_after)
                 logger.warning(
                     f"Model overloaded (attempt {attempt}/{self._overload_attempts}). Retrying in {wait_seconds:.2f}s...",
                 )
@@ -7,20 +7,22 @@ class VocabList:
         assert len(source_lang_terms) == len(target_lang_terms)
         self.source_lang_terms = source_lang_terms
         self.target_lang_terms = target_lang_terms
+        self._compiled: str | None = None
 
     def compile_into_llm_vocab_list(self) -> str:
         """
         Returns the vocabulary list in the form convenient for the LLM input.
-        """
-        res = ""
-
-        for i in range(len(self.source_lang_terms)):
-            src = self.source_lang_terms[i]
-            tgt = self.target_lang_terms[i]
-            line = f"{src}={tgt}\n"
-            res += line
 
-        return res
+        The vocabulary is the same for every chunk of a translation job, so the
+        compiled block is built once and reused. Keeping it byte-identical across
+        prompts also lets providers reuse their prompt prefix cache.
+        """
+        if self._compiled is None:
+            self._compiled = "".join(
+                f"{src}={tgt}\n"
+                for src, tgt in zip(self.source_lang_terms, self.target_lang_terms)
+            )
+        return self._compiled
 
 def vocab_list_from_vocab_db(db: list[dict], source_lang: Language, target_lang: Language) -> VocabList:
     """
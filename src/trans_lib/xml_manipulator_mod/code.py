@@ -1,4 +1,5 @@
 import re
+from typing import Iterator
 
 # Ensure you have the necessary library installed:
 # pip install tree-sitter-language-pack
@@ -14,6 +15,33 @@ class CodeParser:
     separate translatable content from syntax markers.
     """
 
+    # Tier 1 Config: Structural analysis.
+    # Defines child node types that are pure translatable content.
+    translatable_child_types = {
+        'python': {'string_content'},
+        # Other languages might be added here if their parsers are as granular.
+    }
+
+    # Tier 2 Config: Regex-based analysis for leaf nodes or less granular nodes.
+    # The key is a (language, node_type) tuple. The value is a compiled regex that
+    # must match the whole node text, with the groups (syntax_markers, content) or
+    # (opener, content, closer). Compiled once per process.
+    dissection_regex = {
+        ('python', 'comment'): re.compile(r'(#+)(.*)', re.DOTALL),
+        ('rust', 'line_comment'): re.compile(r'(//+!?)(.*)', re.DOTALL),
+        ('rust', 'block_comment'): re.compile(r'(/\*+!?)(.*?)(\*/)', re.DOTALL),
+        ('java', 'line_comment'): re.compile(r'(//)(.*)', re.DOTALL),
+        ('java', 'block_comment'): re.compile(r'(/\*+)(.*?)(\*/)', re.DOTALL),
+        ('java', 'string_literal'): re.compile(r'(")(.*?)(")')
+    }
+
+    # Candidate nodes that contain text we want to process.
+    candidate_node_types = {
+        'python': {'comment', 'string'},
+        'java': {'line_comment', 'block_comment', 'string_literal'},
+        'rust': {'line_comment', 'block_comment', 'string_literal'},
+    }
+
     def __init__(self, language: str):
         self.language_name = language
         try:
@@ -22,38 +50,25 @@ class CodeParser:
         except Exception as e:
             raise ValueError(f"Could not load parser for language '{language}'.") from e
 
-        # Tier 1 Config: Structural analysis.
-        # Defines child node types that are pure translatable content.
-        self.translatable_child_types = {
-            'python': {'string_content'},
-            # Other languages might be added here if their parsers are as granular.
-        }
-
-        # Tier 2 Config: Regex-based analysis for leaf nodes or less granular nodes.
-        # The key is a (language, node_type) tuple. The value is a compiled regex.
-        # The regex should have two capture groups: (syntax_markers, content).
-        self.dissection_regex = {
-            ('python', 'comment'): re.compile(r'^(#+)(.*)'),
-            ('rust', 'line_comment'): re.compile(r'^(//+!?)(.*)'),
-            ('rust', 'block_comment'): re.compile(r'(/\*+!?)(.*?)(\*/)', re.DOTALL),
-            ('java', 'line_comment'): re.compile(r'(//)(.*)'),
-            ('java', 'block_comment'): re.compile(r'(/\*+)(.*?)(\*/)', re.DOTALL),
-            ('java', 'string_literal'): re.compile(r'(")(.*?)(")')
-        }
-
-        # Candidate nodes that contain text we want to process.
-        self.candidate_node_types = {
-            'python': {'comment', 'string'},
-            'java': {'line_comment', 'block_comment', 'string_literal'},
-            'rust': {'line_comment', 'block_comment', 'string_literal'},
-        }
-
-    def _find_candidate_nodes(self, node, nodes_list):
-        if node.type in self.candidate_node_types.get(self.language_name, {}):
-            nodes_list.append(node)
+    def _iter_candidate_nodes(self, root) -> Iterator:
+        """
+        Yields the outermost candidate nodes under `root` in document order. The tree
+        is walked lazily with a cursor, without a Python call or a children list per
+        node, and without collecting the candidates first.
+        """
+        candidate_types = self.candidate_node_types.get(self.language_name, set())
+        if not candidate_types:
             return
-        for child in node.children:
-            self._find_candidate_nodes(child, nodes_list)
+        cursor = root.walk()
+        while True:
+            node = cursor.node
+            if node.type in candidate_types:
+                yield node
+            elif cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return
 
     def _dissect_node(self, node):
         """
@@ -77,10 +92,11 @@ class CodeParser:
                 return child_segments
 
         # --- Strategy 2: Pattern-Based Dissection (using regex) ---
+        node_text = node.text.decode('utf8')
         key = (self.language_name, node_type)
         if key in self.dissection_regex:
             regex = self.dissection_regex[key]
-            match = regex.match(node.text.decode('utf8'))
+            match = regex.fullmatch(node_text)
             if match:
                 groups = match.groups()
                 if len(groups) == 2: # e.g., (marker, content)
@@ -93,27 +109,25 @@ class CodeParser:
                     ]
 
         # --- Fallback: Treat the whole node as text if no rules apply ---
-        return [('text', node.text.decode('utf8'))]
+        return [('text', node_text)]
 
     def parse(self, source_code: str) -> list[tuple[str, str]]:
-        tree = self.parser.parse(bytes(source_code, "utf8"))
-        candidate_nodes = []
-        self._find_candidate_nodes(tree.root_node, candidate_nodes)
-        candidate_nodes.sort(key=lambda n: n.start_byte)
+        # node positions are byte offsets: the gaps are sliced from the encoded source
+        # and each one decoded once (slicing the str would shift after non-ASCII characters)
+        source_bytes = source_code.encode("utf8")
+        tree = self.parser.parse(source_bytes)
 
         segments = []
         current_pos = 0
-        for node in candidate_nodes:
-            placeholder_content = source_code[current_pos:node.start_byte]
-            if placeholder_content:
-                segments.append(('placeholder', placeholder_content))
+        for node in self._iter_candidate_nodes(tree.root_node):
+            if node.start_byte > current_pos:
+                segments.append(('placeholder', source_bytes[current_pos:node.start_byte].decode('utf8')))
             
             segments.extend(self._dissect_node(node))
             current_pos = node.end_byte
 
-        final_placeholder = source_code[current_pos:]
-        if final_placeholder:
-            segments.append(('placeholder', final_placeholder))
+        if current_pos < len(source_bytes):
+            segments.append(('placeholder', source_bytes[current_pos:].decode('utf8')))
             
         return segments
 
@@ -2,6 +2,40 @@ import re
 import uuid
 from pylatexenc.latexwalker import (LatexCommentNode, LatexWalker, LatexCharsNode, LatexMacroNode,
                                     LatexEnvironmentNode, LatexMathNode, LatexGroupNode)
+
+# trailing newline and indentation left in front of an environment's body
+_TRAILING_LINE_INDENT = re.compile(r'\n[ \t]*$')
+
+# \verb|content| and \verb*|content| with any delimiter character
+_VERB_RE = re.compile(r'\\verb\*?(.)(.*?)\1')
+# unknown commands with pipe delimiters, \command|content|
+_PIPE_RE = re.compile(r'\\([a-zA-Z]+)(\*?)\|([\s\S]*?)\|', re.DOTALL)
+
+# anything pylatexenc would turn into something else than a single chars node:
+# macros, math, comments, groups, and the default specials (&, ~, --, '', ``, !`, ?`)
+_LATEX_SYNTAX_RE = re.compile(r"[\\$%{}&~]|--|''|``|[!?]`")
+
+# default configuration, shared by every parser (a parser is created per chunk)
+_PLACEHOLDER_COMMANDS = frozenset({'ref', 'autoref', 'cite', 'label', 'includegraphics', 'input', 'include', 'frac', 'sqrt', 'path', 'url', 'href', '\\', 'verb'})
+_PLACEHOLDER_ENVS = frozenset({'verbatim', 'Verbatim', 'lstlisting', 'minted'})
+_MATH_ENVS = frozenset({
+        'equation', 'equation*', 'align', 'align*', 'aligned', 'gather', 'gather*', 
+        'gathered', 'flalign', 'flalign*', 'alignat', 'alignat*', 'multline', 'multline*',
+        'displaymath', 'math', 'eqnarray', 'eqnarray*'
+        })
+_MATH_TEXT_MACROS = frozenset({'text', 'mathrm','mathbf', 'operatorname',
+                               'mathit', 'textrm', 'textit', 'mathsf',
+                               'mathtt', 'boldsymbol' })
+_DEFINITION_MACROS = frozenset({'newcommand', 'renewcommand', 'newenvironment', 'renewenvironment', 'def'})
+_ALIGNMENT_ENVS = frozenset({'tabular', 'tabular*', 'array', 'align', 'align*',
+                             'aligned', 'flalign', 'flalign*', 'alignat',
+                             'alignat*', 'gather', 'gather*'})
+
+
+def _with_extra_names(defaults: frozenset, extra) -> frozenset:
+    """Returns `defaults` itself when there is nothing to add, else a new set with `extra` added."""
+    return defaults.union(extra) if extra else defaults
+
 class LatexParser:
     """
     Unified LaTeX parser that combines all functionality:
@@ -12,28 +46,13 @@ class LatexParser:
     """
     
     def __init__(self, placeholder_commands: list = [], placeholder_envs: list = [], placeholders_with_text: list = []):
-        # Configuration attributes
-        self.placeholder_commands = {'ref', 'autoref', 'cite', 'label', 'includegraphics', 'input', 'include', 'frac', 'sqrt', 'path', 'url', 'href', '\\', 'verb'}
-        self.placeholder_envs = {'verbatim', 'Verbatim', 'lstlisting', 'minted'}
-        self.math_envs = {
-                'equation', 'equation*', 'align', 'align*', 'aligned', 'gather', 'gather*', 
-                'gathered', 'flalign', 'flalign*', 'alignat', 'alignat*', 'multline', 'multline*',
-                'displaymath', 'math', 'eqnarray', 'eqnarray*'
-                }
-        self.math_text_macros = {'text', 'mathrm','mathbf', 'operatorname',
-                                 'mathit', 'textrm', 'textit', 'mathsf',
-                                 'mathtt', 'boldsymbol' }
-        self.definition_macros = {'newcommand', 'renewcommand', 'newenvironment', 'renewenvironment', 'def'}
-        self.alignment_envs = {'tabular', 'tabular*', 'array', 'align', 'align*',
-                               'aligned', 'flalign', 'flalign*', 'alignat',
-                               'alignat*', 'gather', 'gather*'}
-        # Allow customization
-        if len(placeholder_commands) != 0:
-            self.placeholder_commands.update(placeholder_commands)
-        if len(placeholder_envs) != 0:
-            self.placeholder_envs.update(placeholder_envs)
-        if len(placeholders_with_text) != 0:
-            self.math_text_macros.update(placeholders_with_text)
+        # Configuration attributes: the shared defaults, copied only when customized
+        self.placeholder_commands = _with_extra_names(_PLACEHOLDER_COMMANDS, placeholder_commands)
+        self.placeholder_envs = _with_extra_names(_PLACEHOLDER_ENVS, placeholder_envs)
+        self.math_envs = _MATH_ENVS
+        self.math_text_macros = _with_extra_names(_MATH_TEXT_MACROS, placeholders_with_text)
+        self.definition_macros = _DEFINITION_MACROS
+        self.alignment_envs = _ALIGNMENT_ENVS
         # State attributes
         self.segments = []
         self.latex_content = ""
@@ -44,6 +63,12 @@ class LatexParser:
         Main parsing method that handles all special cases.
         Returns list of (type, content) tuples where type is 'text' or 'placeholder'.
         """
+        if not _LATEX_SYNTAX_RE.search(latex_content):
+            # plain prose: the walker would only return it as one chars node
+            self.segments = []
+            self._add_text(latex_content)
+            return self.segments
+
         # Extract verb commands first (highest priority) (causing the most problems ahah)
         verb_info = self._extract_verb_commands(latex_content)
         processed_content = verb_info['processed_text']
@@ -68,7 +93,7 @@ class LatexParser:
         return self.segments
     def add_math_text_macros(self, *names: str):
         """Register additional text‑in‑math macros at runtime."""
-        self.math_text_macros.update(names)
+        self.math_text_macros = _with_extra_names(self.math_text_macros, names)
     # === PREPROCESSING METHODS ===
     def _make_placeholder(self, tag: str) -> str:
         """
@@ -82,14 +107,13 @@ class LatexParser:
         """Extract \\verb and \\verb* commands to avoid parsing issues."""
         verb_commands = []
         
-        verb_pattern = r'\\verb\*?(.)(.*?)\1'
-        
         def collect_verb(match):
             placeholder = self._make_placeholder("VERB")
             self._verb_map[placeholder] = match.group(0)
             return placeholder
         
-        processed_text = re.sub(verb_pattern, collect_verb, text)
+        # a substring check is much cheaper than a regex scan, and most chunks have no \verb
+        processed_text = _VERB_RE.sub(collect_verb, text) if '\\verb' in text else text
         
         return {
             'processed_text': processed_text,
@@ -100,9 +124,6 @@ class LatexParser:
         """Extract unknown commands that use pipe delimiters \\command|content|."""
         pipe_commands = []
         
-        # Pattern for commands with pipe delimiters (excluding verb which is handled separately)
-        pipe_pattern = r'\\([a-zA-Z]+)(\*?)\|([\s\S]*?)\|'
-        
         def collect_pipe(match):
             command_name = match.group(1)
             # star = match.group(2)
@@ -116,7 +137,8 @@ class LatexParser:
             self._pipe_map[placeholder] = match.group(0)
             return placeholder
         
-        processed_text = re.sub(pipe_pattern, collect_pipe, text, flags=re.DOTALL)
+        # verb commands match the pattern too and are returned unchanged, they're handled separately
+        processed_text = _PIPE_RE.sub(collect_pipe, text) if '|' in text else text
         
         return {
             'processed_text': processed_text,
@@ -134,41 +156,42 @@ class LatexParser:
             self.segments.append(('placeholder', content))
     def _process_chars_node(self, node, in_alignment=False):
         """Process character nodes, handling & specially."""
-        if in_alignment:
-            parts = re.split(r'(&)', node.chars)
-        else:
-            parts = [node.chars]  
-        for part in parts:
-            if not part: 
-                continue
-            if part == '&': 
-                self._add_placeholder(part)
-            else: 
+        if not in_alignment:
+            if node.chars:
+                self._add_text(node.chars)
+            return
+        for i, part in enumerate(node.chars.split('&')):
+            if i:
+                self._add_placeholder('&')
+            if part:
                 self._add_text(part)
     def _walk_text_nodes(self, nodelist, env_stack=[]):
         """Main node walker for text mode - handles asterisk preservation."""
         if nodelist is None: 
             return
+        # bound methods are looked up once per node list rather than once per node
+        add_placeholder = self._add_placeholder
+        add_text = self._add_text
         for node in nodelist:
-            if node.isNodeType(LatexCharsNode):
-                self._process_chars_node(node, in_alignment=(len(env_stack)>0) and env_stack[-1] in self.alignment_envs)
-            elif node.isNodeType(LatexCommentNode):
-                self._add_placeholder('% ')
-                self._add_text(node.comment)
-                self._add_placeholder(node.comment_post_space or '\n')
-            elif node.isNodeType(LatexMathNode):
-                self._add_placeholder(node.delimiters[0])
+            if isinstance(node, LatexCharsNode):
+                self._process_chars_node(node, in_alignment=bool(env_stack) and env_stack[-1] in self.alignment_envs)
+            elif isinstance(node, LatexCommentNode):
+                add_placeholder('% ')
+                add_text(node.comment)
+                add_placeholder(node.comment_post_space or '\n')
+            elif isinstance(node, LatexMathNode):
+                add_placeholder(node.delimiters[0])
                 self._walk_math_nodes(node.nodelist)
-                self._add_placeholder(node.delimiters[1])
-            elif node.isNodeType(LatexGroupNode):
-                self._add_placeholder('{')
+                add_placeholder(node.delimiters[1])
+            elif isinstance(node, LatexGroupNode):
+                add_placeholder('{')
                 self._walk_text_nodes(node.nodelist)
-                self._add_placeholder('}')
-            elif node.isNodeType(LatexMacroNode):
+                add_placeholder('}')
+            elif isinstance(node, LatexMacroNode):
                 if node.macroname in self.definition_macros:
                     self._process_definition_macro(node)
                 elif node.macroname in self.placeholder_commands:
-                    self._add_placeholder(node.latex_verbatim())
+                    add_placeholder(node.latex_verbatim())
                 else:
                     # ASTERISK PRESERVATION: Use latex_verbatim() and extract command part
                     full_command = node.latex_verbatim()
@@ -180,22 +203,22 @@ class LatexParser:
                                 arg_start = arg_node.pos - node.pos
                                 command_part = full_command[:arg_start]
                                 break
-                        self._add_placeholder(command_part)
+                        add_placeholder(command_part)
                         for arg_node in node.nodeargs:
                             if arg_node is None:
                                 continue
                             self._walk_text_nodes([arg_node])
                     else:
                         # No arguments, use the full command
-                        self._add_placeholder(full_command)
-            elif node.isNodeType(LatexEnvironmentNode):
+                        add_placeholder(full_command)
+            elif isinstance(node, LatexEnvironmentNode):
                 envname = node.environmentname
                 env_stack.append(envname)
                 if envname in self.placeholder_envs:
-                    self._add_placeholder(node.latex_verbatim())
+                    add_placeholder(node.latex_verbatim())
                 else:
                     if not node.nodelist:
-                        self._add_placeholder(node.latex_verbatim())
+                        add_placeholder(node.latex_verbatim())
                         continue
                     # find the first node that lies *after* the \begin argument list
                     header_end_pos = self._env_header_end(node)
@@ -211,8 +234,8 @@ class LatexParser:
                     content_end_pos = last_node.pos + last_node.len
 
                     begin_placeholder = self.latex_content[node.pos:content_start_pos]
-                    begin_placeholder = re.sub(r'\n[ \t]*$', '', begin_placeholder)
-                    self._add_placeholder(begin_placeholder)
+                    begin_placeholder = _TRAILING_LINE_INDENT.sub('', begin_placeholder)
+                    add_placeholder(begin_placeholder)
 
                     if envname in self.math_envs:
                         self._walk_math_nodes(node.nodelist) 
@@ -220,10 +243,10 @@ class LatexParser:
                         self._walk_text_nodes(node.nodelist)
 
                     end_placeholder = self.latex_content[content_end_pos:(node.pos + node.len)]
-                    self._add_placeholder(end_placeholder)
+                    add_placeholder(end_placeholder)
                 env_stack.pop()
             else:
-                self._add_placeholder(node.latex_verbatim())
+                add_placeholder(node.latex_verbatim())
 
     def _process_definition_macro(self, node):
         """Process definition macros like \\newcommand with asterisk preservation."""
@@ -260,18 +283,18 @@ class LatexParser:
         if nodelist is None: 
             return
         for node in nodelist:
-            if node.isNodeType(LatexMacroNode) and node.macroname == '#':
+            if isinstance(node, LatexMacroNode) and node.macroname == '#':
                 self._add_placeholder(node.latex_verbatim())
             else:
-                if node.isNodeType(LatexCharsNode): 
+                if isinstance(node, LatexCharsNode): 
                     self._process_chars_node(node)
-                elif node.isNodeType(LatexMathNode): 
+                elif isinstance(node, LatexMathNode): 
                     self._add_placeholder(node.latex_verbatim())
-                elif node.isNodeType(LatexGroupNode):
+                elif isinstance(node, LatexGroupNode):
                     self._add_placeholder(node.delimiters[0])
                     self._walk_definition_nodes(node.nodelist)
                     self._add_placeholder(node.delimiters[1])
-                elif node.isNodeType(LatexMacroNode):
+                elif isinstance(node, LatexMacroNode):
                     self._walk_text_nodes([node])
                 else:
                     self._add_placeholder(node.latex_verbatim())
@@ -281,7 +304,7 @@ class LatexParser:
         if nodelist is None: 
             return
         for node in nodelist:
-            if node.isNodeType(LatexMacroNode) and node.macroname in self.math_text_macros:
+            if isinstance(node, LatexMacroNode) and node.macroname in self.math_text_macros:
                 # Extract command part to preserve asterisks
                 full_command = node.latex_verbatim()
                 if node.nodeargs:
@@ -315,29 +338,25 @@ class LatexParser:
         """
         Generic helper that replaces every placeholder found in *lookup* with its
         original text, handling any number of occurrences inside a segment.
+        Each segment is split once on all the placeholders, the pieces around them
+        becoming text or placeholder segments depending on their contents.
         """
-        i = 0
-        while i < len(self.segments):
-            seg_type, content = self.segments[i]
-            made_changes = False
-            for placeholder, original in lookup.items():
-                if placeholder in content:
-                    # Split *every* occurrence, not just the first two.
-                    parts = content.split(placeholder)
-                    new_segments = []
-                    for k, part in enumerate(parts):
-                        if part:
-                            new_segments.append(
-                                ('text' if part.strip() else 'placeholder', part)
-                            )
-                        if k < len(parts) - 1:
-                            new_segments.append(('placeholder', original))
-                    # Replace current segment with the expanded list
-                    self.segments[i:i+1] = new_segments
-                    made_changes = True
-                    break  # restart outer loop because list length changed
-            if not made_changes:
-                i += 1
+        if not lookup:
+            return
+        token_re = re.compile("(" + "|".join(map(re.escape, lookup)) + ")")
+        restored = []
+        for segment in self.segments:
+            parts = token_re.split(segment[1])
+            if len(parts) == 1:
+                restored.append(segment)
+                continue
+            for k, part in enumerate(parts):
+                if k % 2:  # odd parts are the captured placeholders
+                    restored.append(('placeholder', lookup[part]))
+                elif part:
+                    restored.append(('text' if part.strip() else 'placeholder', part))
+        self.segments = restored
+
     # === UTILITIES ===
     def _env_header_end(self, env_node):
         """
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from trans_lib.enums import ChunkType
 from trans_lib.xml_manipulator_mod.code import CodeParser
 from trans_lib.xml_manipulator_mod.latex import parse_latex
@@ -5,10 +7,10 @@ from trans_lib.xml_manipulator_mod.myst import parse_myst
 from trans_lib.xml_manipulator_mod.typst import typst_to_xml
 from trans_lib.xml_manipulator_mod.xml import create_translation_xml
 
-def chunk_to_xml_bis(source: str, chunk_type: ChunkType) -> tuple[str, dict, bool]:
-    """
-    Takes a chunk and the document type and returns the XML tagged version of the chunk
-    """
+# a translated chunk is tagged by the placeholder-only check, by its prompt and again on every
+# retry, and examples repeat across chunks: the results are memoized on the chunk itself
+@lru_cache(maxsize=1024)
+def _chunk_to_xml_cached(source: str, chunk_type: ChunkType) -> tuple[str, dict, bool]:
     match chunk_type:
         case ChunkType.LaTeX:
             res = latex_to_xml(source)
@@ -22,17 +24,24 @@ def chunk_to_xml_bis(source: str, chunk_type: ChunkType) -> tuple[str, dict, boo
         case _:
             raise RuntimeError("Not implemented yet")
 
+def chunk_to_xml_bis(source: str, chunk_type: ChunkType) -> tuple[str, dict, bool]:
+    """
+    Takes a chunk and the document type and returns the XML tagged version of the chunk
+    """
+    xml, placeholders, ph_only = _chunk_to_xml_cached(source, chunk_type)
+    return xml, dict(placeholders), ph_only
+
 def chunk_to_xml(source: str, chunk_type: ChunkType) -> str:
-    return chunk_to_xml_bis(source, chunk_type)[0]
+    return _chunk_to_xml_cached(source, chunk_type)[0]
 
 def chunk_to_xml_with_placeholders(source: str, chunk_type: ChunkType) -> tuple[str, dict]:
-    xml, placeholders, _ = chunk_to_xml_bis(source, chunk_type)
-    return xml, placeholders
+    xml, placeholders, _ = _chunk_to_xml_cached(source, chunk_type)
+    return xml, dict(placeholders)
 
 def chunk_contains_ph_only(source: str, chunk_type: ChunkType) -> bool:
     if chunk_type == ChunkType.Code: # temp while code not implemented yet
         return True
-    return chunk_to_xml_bis(source, chunk_type)[2]
+    return _chunk_to_xml_cached(source, chunk_type)[2]
 
 def latex_to_xml(source: str) -> tuple[str, dict, bool]:
     return create_translation_xml(parse_latex(source))
@@ -41,9 +50,14 @@ def code_to_xml(source: str, language: str) -> tuple[str, dict, bool]:
     """
     Main function that takes a code and the language it is written in and returns an XML for translating.
     """
+    xml, placeholders, ph_only = _code_to_xml_cached(source, language)
+    return xml, dict(placeholders), ph_only
+
+@lru_cache(maxsize=1024)
+def _code_to_xml_cached(source: str, language: str) -> tuple[str, dict, bool]:
     segments = []
     try:
-        parser = CodeParser(language=language)
+        parser = _code_parser(language)
         segments = parser.parse(source)
     except Exception: # if a language is not supported
         segments = [
@@ -52,6 +66,11 @@ def code_to_xml(source: str, language: str) -> tuple[str, dict, bool]:
     
     return create_translation_xml(segments)
 
+@lru_cache(maxsize=None)
+def _code_parser(language: str) -> CodeParser:
+    """One parser per language: loading the grammar and compiling the rules is done once."""
+    return CodeParser(language=language)
+
 def myst_to_xml(source: str) -> tuple[str, dict, bool]:
     segments = parse_myst(source)
     def handle_segment(segment: tuple[str, str]) -> tuple[str, str]:
@@ -68,6 +68,17 @@ def reconstruct_from_xml(translated_xml: str, phs: dict[str, str] | None = None)
     return "".join(reconstructed_parts)
 
 
+def _escape_text(text: str) -> str:
+    """Escapes text content like ElementTree does."""
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
 def create_translation_xml(segments: list[tuple[str, str]]) -> tuple[str, dict, bool]:
     """
     Converts parsed segments into a single <TEXT> tag containing mixed content
@@ -86,70 +97,49 @@ def create_translation_xml(segments: list[tuple[str, str]]) -> tuple[str, dict,
             - Placeholder map: id -> original placeholder content.
             - ph_only: True if there is no translatable text, only placeholders.
     """
-    ph_only = len([1 for el in segments if el[0] == 'text']) == 0
-    # -- Step 1: Coalesce consecutive placeholders --
     # Consecutive placeholder segments are merged into one <PH> tag, EXCEPT for
     # bare '\n' placeholders which are kept as individual tags so that structural
     # line breaks are never silently absorbed into surrounding syntax.
-    merged_segments = []
+    # Merging and serializing are done in the same pass over the segments; the
+    # output is the one ElementTree would serialize (text escaped the same way,
+    # an empty <TEXT />).
+    parts = ['<document><TEXT>']
+    placeholders = {}
     pending: list[str] = []   # accumulates non-'\n' placeholder content
+    ph_only = True
+
+    def _emit_placeholder(content: str) -> None:
+        ph_id = str(len(placeholders) + 1)
+        parts.append(f'<PH id="{ph_id}">{_escape_text(content)}</PH>')
+        placeholders[ph_id] = content
 
     def _flush_pending() -> None:
         if pending:
             merged = "".join(pending)
             if merged:
-                merged_segments.append(('placeholder', merged))
+                _emit_placeholder(merged)
             pending.clear()
 
     for seg_type, content in segments:
         if seg_type == 'text':
+            ph_only = False
             _flush_pending()
-            merged_segments.append(('text', content))
+            parts.append(_escape_text(content))
         elif content == '\n':
             # Bare newline placeholder: flush any accumulated content first,
             # then emit this newline as its own placeholder.
             _flush_pending()
-            merged_segments.append(('placeholder', '\n'))
+            _emit_placeholder('\n')
         else:
             # Regular placeholder: accumulate for merging with neighbours.
             pending.append(content)
 
     _flush_pending()
 
-
-    # -- Step 2: Build the Mixed-Content XML --
-    root = ET.Element('document')
-    # All content will go inside a single <TEXT> tag
-    text_container = ET.SubElement(root, 'TEXT')
-
-    placeholders = {}
-    ph_id = 1
-    last_element = None # Keep track of the last <PH> element added
-
-    for seg_type, content in merged_segments:
-        if seg_type == 'text':
-            if last_element is not None:
-                # If text follows a <PH> tag, it becomes the .tail of that tag.
-                last_element.tail = (last_element.tail or '') + content
-            else:
-                # If it's the first piece of text, it becomes the .text of the container.
-                text_container.text = (text_container.text or '') + content
-
-        elif seg_type == 'placeholder':
-            # Create the placeholder element
-            current_ph_id = str(ph_id)
-            ph_elem = ET.SubElement(text_container, 'PH', id=current_ph_id)
-            ph_elem.text = content
-
-            placeholders[current_ph_id] = content
-            ph_id += 1
-            last_element = ph_elem # This is now the most recent element
-
-    # -- Step 3: Finalize and Save --
-    # Use method='xml' and short_empty_elements=True for self-closing tags like <PH ... />
-    xml_string = ET.tostring(root, encoding='unicode', method='xml', short_empty_elements=True)
-
-    # Ensure the output directory exists
-    # output_dir.mkdir(parents=True, exist_ok=True)
+    if not any(parts[1:]):
+        xml_string = '<document><TEXT /></document>'
+    else:
+        parts.append('</TEXT></document>')
+        xml_string = "".join(parts)
 
     return xml_string, placeholders, ph_only
@@ -0,0 +1,276 @@
+import csv
+import os
+from pathlib import Path
+
+from trans_lib.constants import CONF_DIR
+from trans_lib.enums import Language
+from trans_lib.helpers import calculate_path_checksum
+from trans_lib.translation_cache.cache_backend import (
+    PATH_CHECKSUM_COLUMN,
+    add_contents_to_cache,
+    do_translations_correspond_to_sources,
+    find_correspondent_checksum,
+    flush_correspondence_cache,
+    flush_path_map,
+    get_correspondence_cache_path,
+    get_path_map_path,
+    migrate_legacy_correspondence_rows,
+    open_correspondence_cache_row_writer,
+    open_correspondence_cache_writer,
+    read_contents_from_cache_by_checksum,
+    read_correspondence_cache,
+    register_path_hash,
+    set_checksum_pair_in_correspondence_cache,
+    stream_correspondence_cache,
+    stream_correspondence_cache_rows,
+    write_correspondence_cache,
+)
+from trans_lib.translation_cache.translation_cache import TranslationCacheCsv
+
+
+def _make_root(tmp_path: Path) -> Path:
+    root = tmp_path / "proj"
+    (root / CONF_DIR).mkdir(parents=True)
+    return root
+
+
+def _read_csv_rows(path: Path) -> list[dict]:
+    with open(path, newline="") as csvfile:
+        return list(csv.DictReader(csvfile))
+
+
+def test_pair_updates_are_written_on_flush(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    set_checksum_pair_in_correspondence_cache(root, "aaa", Language.ENGLISH, "bbb", Language.FRENCH, "p1")
+
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.FRENCH, "p1") == "bbb"
+    file_path = get_correspondence_cache_path(root)
+    assert _read_csv_rows(file_path) == []
+
+    flush_correspondence_cache(root)
+
+    assert _read_csv_rows(file_path) == [
+        {PATH_CHECKSUM_COLUMN: "p1", "English": "aaa", "French": "bbb"},
+    ]
+
+
+def test_external_edit_is_picked_up(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    write_correspondence_cache(
+        root,
+        [{PATH_CHECKSUM_COLUMN: "p1", "English": "aaa", "French": "bbb"}],
+        [PATH_CHECKSUM_COLUMN, "English", "French"],
+    )
+    flush_correspondence_cache(root)
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.FRENCH, "p1") == "bbb"
+
+    file_path = get_correspondence_cache_path(root)
+    with open(file_path, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=[PATH_CHECKSUM_COLUMN, "English", "French"])
+        writer.writeheader()
+        writer.writerow({PATH_CHECKSUM_COLUMN: "p1", "English": "aaa", "French": "ccc"})
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.FRENCH, "p1") == "ccc"
+
+
+def test_read_returns_copies(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    set_checksum_pair_in_correspondence_cache(root, "aaa", Language.ENGLISH, "bbb", Language.FRENCH, "p1")
+
+    cache_data = read_correspondence_cache(root)
+    assert cache_data is not None
+    _, data_list = cache_data
+    data_list[0]["French"] = ""
+
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.FRENCH, "p1") == "bbb"
+
+
+def test_legacy_row_is_matched_and_takes_the_path_hash(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    write_correspondence_cache(
+        root,
+        [
+            {PATH_CHECKSUM_COLUMN: "p2", "English": "aaa", "French": "other"},
+            {PATH_CHECKSUM_COLUMN: "", "English": "aaa", "French": "bbb"},
+        ],
+        [PATH_CHECKSUM_COLUMN, "English", "French"],
+    )
+
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.FRENCH, "p1") == "bbb"
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.FRENCH, "p2") == "other"
+
+    set_checksum_pair_in_correspondence_cache(root, "aaa", Language.ENGLISH, "ccc", Language.FRENCH, "p1")
+
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.FRENCH, "p1") == "ccc"
+    assert find_correspondent_checksum(root, "ccc", Language.FRENCH, Language.ENGLISH, "p1") == "aaa"
+    assert find_correspondent_checksum(root, "bbb", Language.FRENCH, Language.ENGLISH, "p1") is None
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.FRENCH, "p3") is None
+    cache_data = read_correspondence_cache(root)
+    assert cache_data is not None
+    assert cache_data[1][1] == {PATH_CHECKSUM_COLUMN: "p1", "English": "aaa", "French": "ccc"}
+
+
+def test_flush_appends_new_rows_and_rewrites_updated_ones(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    set_checksum_pair_in_correspondence_cache(root, "aaa", Language.ENGLISH, "bbb", Language.FRENCH, "p1")
+    flush_correspondence_cache(root)
+    file_path = get_correspondence_cache_path(root)
+
+    set_checksum_pair_in_correspondence_cache(root, "ccc", Language.ENGLISH, "ddd", Language.FRENCH, "p1")
+    flush_correspondence_cache(root)
+    assert _read_csv_rows(file_path) == [
+        {PATH_CHECKSUM_COLUMN: "p1", "English": "aaa", "French": "bbb"},
+        {PATH_CHECKSUM_COLUMN: "p1", "English": "ccc", "French": "ddd"},
+    ]
+
+    set_checksum_pair_in_correspondence_cache(root, "aaa", Language.ENGLISH, "eee", Language.FRENCH, "p1")
+    set_checksum_pair_in_correspondence_cache(root, "aaa", Language.ENGLISH, "fff", Language.GERMAN, "p1")
+    flush_correspondence_cache(root)
+    assert _read_csv_rows(file_path) == [
+        {PATH_CHECKSUM_COLUMN: "p1", "English": "aaa", "French": "eee", "German": "fff"},
+        {PATH_CHECKSUM_COLUMN: "p1", "English": "ccc", "French": "ddd", "German": ""},
+    ]
+
+
+def test_registered_paths_are_appended_once_on_flush(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    path_hash = register_path_hash(root, "docs/a.md")
+    assert register_path_hash(root, Path("docs") / "a.md") == path_hash
+    register_path_hash(root, "docs/b.md")
+
+    path_map = get_path_map_path(root)
+    assert _read_csv_rows(path_map) == []
+
+    flush_path_map(root)
+    flush_path_map(root)
+
+    assert _read_csv_rows(path_map) == [
+        {PATH_CHECKSUM_COLUMN: path_hash, "relative_path": "docs/a.md"},
+        {PATH_CHECKSUM_COLUMN: calculate_path_checksum("docs/b.md"), "relative_path": "docs/b.md"},
+    ]
+
+
+def test_read_contents_by_checksum_across_languages(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    en_checksum = add_contents_to_cache(root, "Hello", Language.ENGLISH, "p1")
+    assert read_contents_from_cache_by_checksum(root, en_checksum) == "Hello"
+
+    fr_checksum = add_contents_to_cache(root, "Bonjour", Language.FRENCH, "p2")
+    assert read_contents_from_cache_by_checksum(root, fr_checksum) == "Bonjour"
+    assert read_contents_from_cache_by_checksum(root, "missing") is None
+
+
+def test_batched_correspondence_check(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    fr_checksum = add_contents_to_cache(root, "Bonjour", Language.FRENCH, "p1")
+    set_checksum_pair_in_correspondence_cache(root, "aaa", Language.ENGLISH, fr_checksum, Language.FRENCH, "p1")
+
+    assert do_translations_correspond_to_sources(
+        root,
+        [
+            ("aaa", Language.ENGLISH, "Bonjour", Language.FRENCH, "p1"),
+            ("aaa", Language.ENGLISH, "Salut", Language.FRENCH, "p1"),
+            ("aaa", Language.ENGLISH, "Bonjour", Language.FRENCH, "p2"),
+            ("aaa", Language.ENGLISH, "Bonjour", Language.ENGLISH, "p1"),
+        ],
+    ) == [True, False, False, False]
+
+
+def test_path_map_is_recreated_after_removal(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    register_path_hash(root, "docs/a.md")
+    flush_path_map(root)
+
+    path_map = get_path_map_path(root)
+    path_map.unlink()
+    register_path_hash(root, "docs/b.md")
+    flush_path_map(root)
+
+    assert _read_csv_rows(path_map) == [
+        {PATH_CHECKSUM_COLUMN: calculate_path_checksum("docs/b.md"), "relative_path": "docs/b.md"},
+    ]
+
+
+def test_legacy_rows_are_migrated_to_the_path_of_their_chunks(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    en_checksum = add_contents_to_cache(root, "Hello", Language.ENGLISH, "p1")
+    fr_checksum = add_contents_to_cache(root, "Bonjour", Language.FRENCH, "p1")
+    write_correspondence_cache(
+        root,
+        [
+            {PATH_CHECKSUM_COLUMN: "", "English": en_checksum, "French": fr_checksum},
+            {PATH_CHECKSUM_COLUMN: "", "English": "unknown", "French": fr_checksum},
+        ],
+        [PATH_CHECKSUM_COLUMN, "English", "French"],
+    )
+
+    assert migrate_legacy_correspondence_rows(root) == 1
+    assert migrate_legacy_correspondence_rows(root) == 0
+    assert [row[PATH_CHECKSUM_COLUMN] for row in _read_csv_rows(get_correspondence_cache_path(root))] == ["p1", ""]
+
+    cache_data = read_correspondence_cache(root)
+    assert cache_data is not None
+    assert [row[PATH_CHECKSUM_COLUMN] for row in cache_data[1]] == ["p1", ""]
+    assert find_correspondent_checksum(root, en_checksum, Language.ENGLISH, Language.FRENCH, "p1") == fr_checksum
+
+
+def test_cache_writer_keeps_the_file_on_error(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    set_checksum_pair_in_correspondence_cache(root, "aaa", Language.ENGLISH, "bbb", Language.FRENCH, "p1")
+    fields = [PATH_CHECKSUM_COLUMN, "English", "French"]
+
+    try:
+        with open_correspondence_cache_writer(root, fields) as writer:
+            for row in stream_correspondence_cache(root):
+                writer.writerow(row)
+            raise RuntimeError("interrupted")
+    except RuntimeError:
+        pass
+
+    file_path = get_correspondence_cache_path(root)
+    assert _read_csv_rows(file_path) == [{PATH_CHECKSUM_COLUMN: "p1", "English": "aaa", "French": "bbb"}]
+    assert not file_path.with_name(file_path.name + ".tmp").exists()
+
+    with open_correspondence_cache_writer(root, fields) as writer:
+        for row in stream_correspondence_cache(root):
+            row["French"] = "ccc"
+            writer.writerow(row)
+
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.FRENCH, "p1") == "ccc"
+
+
+def test_cache_rows_are_streamed_in_the_requested_column_order(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    write_correspondence_cache(
+        root,
+        [{PATH_CHECKSUM_COLUMN: "p1", "English": "aaa", "French": "bbb"}],
+        [PATH_CHECKSUM_COLUMN, "English", "French"],
+    )
+    fields = [PATH_CHECKSUM_COLUMN, "French", "German", "English"]
+
+    with open_correspondence_cache_row_writer(root, fields) as writer:
+        for row in stream_correspondence_cache_rows(root, fields):
+            assert row == ["p1", "bbb", "", "aaa"]
+            row[2] = "ccc"
+            writer.writerow(row)
+
+    assert _read_csv_rows(get_correspondence_cache_path(root)) == [
+        {PATH_CHECKSUM_COLUMN: "p1", "French": "bbb", "German": "ccc", "English": "aaa"},
+    ]
+    assert find_correspondent_checksum(root, "aaa", Language.ENGLISH, Language.GERMAN, "p1") == "ccc"
+
+
+def test_store_flushes_after_a_batch_of_persisted_pairs(tmp_path: Path) -> None:
+    root = _make_root(tmp_path)
+    store = TranslationCacheCsv(root)
+    store.FLUSH_EVERY_PAIRS = 2
+    file_path = get_correspondence_cache_path(root)
+
+    store.persist_pair("s1", "t1", Language.ENGLISH, Language.FRENCH, "one", "un", "doc.md")
+    assert not file_path.exists() or _read_csv_rows(file_path) == []
+
+    store.persist_pair("s2", "t2", Language.ENGLISH, Language.FRENCH, "two", "deux", "doc.md")
+    rows = _read_csv_rows(file_path)
+    assert [(row[str(Language.ENGLISH)], row[str(Language.FRENCH)]) for row in rows] == [("s1", "t1"), ("s2", "t2")]
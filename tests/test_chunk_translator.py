@@ -1,5 +1,7 @@
 import asyncio
 import sys
+import threading
+import time
 import types
 
 import pytest
@@ -67,6 +69,7 @@ from trans_lib.translator_retrieval import (
     Meta,
     ModelOverloadedError,
     _split_typst_chunk_for_internal_translation,
+    gather_bounded,
 )
 from trans_lib.xml_manipulator_mod.mod import typst_to_xml_mod
 from unified_model_caller.errors import ApiCallError
@@ -287,6 +290,77 @@ def test_chunk_with_ph_only_doesnt_call_model_latex():
     assert store.persisted == [(chunk, chunk)]
 
 
+def test_chunk_without_natural_language_doesnt_call_model():
+    store = InMemoryStore()
+    caller = RaisingCaller()
+    translator = ChunkTranslator(store, caller)
+
+    chunk = "1. 2 + 2 = 4 ; (3 * 7) - 1 = 20\n"
+    meta = Meta(
+        chunk=chunk,
+        src_lang=Language.ENGLISH,
+        tgt_lang=Language.FRENCH,
+        doc_type=DocumentType.Other,
+        chunk_type=ChunkType.Other,
+        vocab=None,
+        rel_path="docs/example.txt",
+    )
+
+    translated, from_cache = asyncio.run(translator.translate_or_fetch(meta))
+
+    assert translated == chunk
+    assert from_cache is True
+    assert caller.called is False
+    assert store.persisted == [(chunk, chunk)]
+
+
+def test_chunk_in_the_target_language_doesnt_call_model():
+    store = InMemoryStore()
+    caller = RaisingCaller()
+    translator = ChunkTranslator(store, caller)
+
+    chunk = "This sentence is already written in English.\n"
+    meta = Meta(
+        chunk=chunk,
+        src_lang=Language.ENGLISH,
+        tgt_lang=Language.ENGLISH,
+        doc_type=DocumentType.Other,
+        chunk_type=ChunkType.Other,
+        vocab=None,
+        rel_path="docs/example.txt",
+    )
+
+    translated, from_cache = asyncio.run(translator.translate_or_fetch(meta))
+
+    assert translated == chunk
+    assert from_cache is True
+    assert caller.called is False
+
+
+def test_repeated_passthrough_chunk_is_persisted_once():
+    store = InMemoryStore()
+    caller = RaisingCaller()
+    translator = ChunkTranslator(store, caller)
+
+    chunk = "---\n"
+    meta = Meta(
+        chunk=chunk,
+        src_lang=Language.ENGLISH,
+        tgt_lang=Language.FRENCH,
+        doc_type=DocumentType.Other,
+        chunk_type=ChunkType.Other,
+        vocab=None,
+        rel_path="docs/example.txt",
+    )
+
+    async def translate_twice():
+        return [await translator.translate_or_fetch(meta) for _ in range(2)]
+
+    assert asyncio.run(translate_twice()) == [(chunk, True), (chunk, True)]
+    assert caller.called is False
+    assert store.persisted == [(chunk, chunk)]
+
+
 def test_model_overloaded_retries_then_succeeds(monkeypatch):
     store = InMemoryStore()
     caller = OverloadedThenSucceedCaller(fail_times=2)
@@ -296,6 +370,7 @@ def test_model_overloaded_retries_then_succeeds(monkeypatch):
         overload_retry_attempts=4,
         overload_retry_initial_delay=0.01,
         overload_retry_max_delay=0.02,
+        overload_retry_jitter=False,
     )
 
     monkeypatch.setattr(
@@ -330,6 +405,46 @@ def test_model_overloaded_retries_then_succeeds(monkeypatch):
     assert store.persisted == [(chunk, translated)]
 
 
+def test_model_overloaded_retries_wait_a_jittered_delay(monkeypatch):
+    store = InMemoryStore()
+    caller = OverloadedThenSucceedCaller(fail_times=3)
+    translator = ChunkTranslator(
+        store,
+        caller,
+        overload_retry_attempts=4,
+        overload_retry_initial_delay=1.0,
+        overload_retry_max_delay=2.0,
+    )
+
+    monkeypatch.setattr(
+        "trans_lib.translator_retrieval.chunk_contains_ph_only",
+        lambda *args, **kwargs: False,
+    )
+
+    observed_sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        observed_sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    meta = Meta(
+        chunk="Translate me please.\n",
+        src_lang=Language.ENGLISH,
+        tgt_lang=Language.FRENCH,
+        doc_type=DocumentType.Other,
+        chunk_type=ChunkType.Other,
+        vocab=None,
+        rel_path="docs/example.md",
+    )
+
+    asyncio.run(translator.translate_or_fetch(meta))
+
+    assert len(observed_sleeps) == 3
+    for sleep, backoff in zip(observed_sleeps, [1.0, 2.0, 2.0]):
+        assert 0 <= sleep <= backoff
+
+
 def test_model_overloaded_exhausts_retries(monkeypatch):
     store = InMemoryStore()
     caller = AlwaysOverloadedCaller()
@@ -370,6 +485,64 @@ def test_model_overloaded_exhausts_retries(monkeypatch):
     assert caller.calls == 2
 
 
+class FailOnceCaller:
+    def __init__(self, error: Exception):
+        self.error = error
+        self.calls = 0
+
+    def call(self, prompt: str) -> str:
+        self.calls += 1
+        if self.calls == 1:
+            raise self.error
+        return "<output>Translated chunk</output>"
+
+    def wait_cooldown(self) -> None:
+        pass
+
+
+@pytest.mark.parametrize(
+    "error, retried",
+    [
+        (ApiCallError("503 UNAVAILABLE: The model is overloaded."), True),
+        (ApiCallError("Malformed response from the provider"), True),
+        (ApiCallError("Gemini API call failed: missing api key"), False),
+    ],
+)
+def test_transient_api_errors_are_retried(monkeypatch, error, retried):
+    store = InMemoryStore()
+    caller = FailOnceCaller(error)
+    translator = ChunkTranslator(store, caller, overload_retry_initial_delay=0.01)
+
+    monkeypatch.setattr(
+        "trans_lib.translator_retrieval.chunk_contains_ph_only",
+        lambda *args, **kwargs: False,
+    )
+
+    async def fake_sleep(_: float) -> None:
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    meta = Meta(
+        chunk="Translate me please.\n",
+        src_lang=Language.ENGLISH,
+        tgt_lang=Language.FRENCH,
+        doc_type=DocumentType.Other,
+        chunk_type=ChunkType.Other,
+        vocab=None,
+        rel_path="docs/example.md",
+    )
+
+    if retried:
+        translated, _ = asyncio.run(translator.translate_or_fetch(meta))
+        assert translated == "Translated chunk"
+        assert caller.calls == 2
+    else:
+        with pytest.raises(ChunkTranslationFailed):
+            asyncio.run(translator.translate_or_fetch(meta))
+        assert caller.calls == 1
+
+
 def test_myst_chunk_metadata_tagged_on_failure():
     chunk = "Paragraph needing translation.\n"
     cell = {"metadata": {}, "source": chunk}
@@ -567,3 +740,238 @@ def test_oversized_typst_subchunking_skips_model_for_placeholder_only_subchunks(
     assert from_cache is False
     assert len(calls) == 2
     assert all("```python\n" not in call for call in calls)
+
+
+class BlockingCaller:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def call(self, prompt: str) -> str:
+        assert self.release.wait(timeout=5)
+        return "<output>Translated chunk</output>"
+
+    def wait_cooldown(self) -> None:
+        pass
+
+
+def test_blocking_model_call_doesnt_block_the_event_loop(monkeypatch):
+    monkeypatch.setattr(
+        "trans_lib.translator_retrieval.chunk_contains_ph_only",
+        lambda *args, **kwargs: False,
+    )
+    caller = BlockingCaller()
+    translator = ChunkTranslator(InMemoryStore(), caller)
+    meta = Meta(
+        chunk="Some text\n",
+        src_lang=Language.ENGLISH,
+        tgt_lang=Language.FRENCH,
+        doc_type=DocumentType.Other,
+        chunk_type=ChunkType.Other,
+        vocab=None,
+        rel_path="docs/example.txt",
+    )
+
+    async def translate_then_release():
+        task = asyncio.create_task(translator.translate_or_fetch(meta))
+        # the caller holds its thread until released, the loop has to keep running meanwhile
+        await asyncio.sleep(0.01)
+        caller.release.set()
+        return await task
+
+    assert asyncio.run(translate_then_release()) == ("Translated chunk", False)
+
+
+def test_gather_bounded_keeps_order_and_bounds_concurrency():
+    running = 0
+    max_running = 0
+
+    async def work(index: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return index
+
+    results = asyncio.run(gather_bounded((work(index) for index in range(7)), max_concurrency=3))
+
+    assert results == list(range(7))
+    assert max_running == 3
+
+
+class NamedCaller:
+    def __init__(self, name: str):
+        self.name = name
+
+    def call(self, prompt: str) -> str:
+        return f"<output>{self.name}</output>"
+
+    def wait_cooldown(self) -> None:
+        pass
+
+
+def test_concurrent_translators_keep_their_own_caller(monkeypatch):
+    monkeypatch.setattr(
+        "trans_lib.translator_retrieval.chunk_contains_ph_only",
+        lambda *args, **kwargs: False,
+    )
+    first = ChunkTranslator(InMemoryStore(), NamedCaller("first"))
+    second = ChunkTranslator(InMemoryStore(), NamedCaller("second"))
+
+    def meta(chunk: str) -> Meta:
+        return Meta(
+            chunk=chunk,
+            src_lang=Language.ENGLISH,
+            tgt_lang=Language.FRENCH,
+            doc_type=DocumentType.Other,
+            chunk_type=ChunkType.Other,
+            vocab=None,
+            rel_path="docs/example.txt",
+        )
+
+    async def run_both():
+        return await asyncio.gather(
+            asyncio.gather(*(first.translate_or_fetch(meta(f"first chunk {index}\n")) for index in range(4))),
+            asyncio.gather(*(second.translate_or_fetch(meta(f"second chunk {index}\n")) for index in range(4))),
+        )
+
+    first_results, second_results = asyncio.run(run_both())
+
+    assert first_results == [("first", False)] * 4
+    assert second_results == [("second", False)] * 4
+
+
+class SerialCheckingCaller:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.cooldowns = 0
+        self._lock = threading.Lock()
+
+    def call(self, prompt: str) -> str:
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.01)
+        with self._lock:
+            self.running -= 1
+        return "<output>Translated chunk</output>"
+
+    def wait_cooldown(self) -> None:
+        self.cooldowns += 1
+
+
+def test_concurrent_chunks_take_turns_on_the_caller_without_rate_limit(monkeypatch):
+    monkeypatch.setattr(
+        "trans_lib.translator_retrieval.chunk_contains_ph_only",
+        lambda *args, **kwargs: False,
+    )
+    caller = SerialCheckingCaller()
+    translator = ChunkTranslator(InMemoryStore(), caller)
+
+    def meta(chunk: str) -> Meta:
+        return Meta(
+            chunk=chunk,
+            src_lang=Language.ENGLISH,
+            tgt_lang=Language.FRENCH,
+            doc_type=DocumentType.Other,
+            chunk_type=ChunkType.Other,
+            vocab=None,
+            rel_path="docs/example.txt",
+        )
+
+    async def translate_all():
+        return await asyncio.gather(*(translator.translate_or_fetch(meta(f"chunk {index}\n")) for index in range(4)))
+
+    results = asyncio.run(translate_all())
+
+    assert results == [("Translated chunk", False)] * 4
+    assert caller.max_running == 1
+    assert caller.cooldowns == 4
+
+
+def test_identical_chunks_in_flight_are_translated_once(monkeypatch):
+    store = InMemoryStore()
+    translator = ChunkTranslator(store, model_caller=None)
+
+    monkeypatch.setattr(
+        "trans_lib.translator_retrieval.chunk_contains_ph_only",
+        lambda *args, **kwargs: False,
+    )
+
+    calls: list[str] = []
+
+    async def fake_run_with_caller(self, strategy, meta, caller):
+        calls.append(meta.chunk)
+        await asyncio.sleep(0.01)
+        return meta.chunk.upper()
+
+    monkeypatch.setattr(ChunkTranslator, "_run_with_caller", fake_run_with_caller)
+
+    metas = [
+        Meta(
+            chunk=chunk,
+            src_lang=Language.ENGLISH,
+            tgt_lang=Language.FRENCH,
+            doc_type=DocumentType.Other,
+            chunk_type=ChunkType.Other,
+            vocab=None,
+            rel_path="docs/example.txt",
+        )
+        for chunk in ["same\n", "other\n", "same\n", "same\n"]
+    ]
+
+    async def translate_all():
+        return await asyncio.gather(*(translator.translate_or_fetch(meta) for meta in metas))
+
+    results = asyncio.run(translate_all())
+
+    assert results == [("SAME\n", False), ("OTHER\n", False), ("SAME\n", False), ("SAME\n", False)]
+    assert sorted(calls) == ["other\n", "same\n"]
+    assert len(store.persisted) == 2
+
+
+def test_duplicate_translates_the_chunk_when_the_first_request_is_cancelled(monkeypatch):
+    store = InMemoryStore()
+    translator = ChunkTranslator(store, model_caller=None)
+
+    monkeypatch.setattr(
+        "trans_lib.translator_retrieval.chunk_contains_ph_only",
+        lambda *args, **kwargs: False,
+    )
+
+    calls: list[str] = []
+
+    async def fake_run_with_caller(self, strategy, meta, caller):
+        calls.append(meta.chunk)
+        await asyncio.sleep(0.01)
+        return meta.chunk.upper()
+
+    monkeypatch.setattr(ChunkTranslator, "_run_with_caller", fake_run_with_caller)
+
+    meta = Meta(
+        chunk="same\n",
+        src_lang=Language.ENGLISH,
+        tgt_lang=Language.FRENCH,
+        doc_type=DocumentType.Other,
+        chunk_type=ChunkType.Other,
+        vocab=None,
+        rel_path="docs/example.txt",
+    )
+
+    async def run():
+        first = asyncio.create_task(translator.translate_or_fetch(meta))
+        while not calls:
+            await asyncio.sleep(0)
+        duplicate = asyncio.create_task(translator.translate_or_fetch(meta))
+        await asyncio.sleep(0)
+        first.cancel()
+        result = await duplicate
+        return first, result
+
+    first, result = asyncio.run(run())
+
+    assert first.cancelled()
+    assert result == ("SAME\n", False)
+    assert calls == ["same\n", "same\n"]
+    assert len(store.persisted) == 1
@@ -6,6 +6,7 @@ from pathlib import Path
 
 import jupytext
 import nbformat
+import pytest
 
 from trans_lib.enums import Language
 from trans_lib.helpers import calculate_checksum
@@ -49,6 +50,9 @@ class FakeTranslator:
     async def translate_or_fetch(self, meta):
         return self._result, self._from_cache
 
+    async def aclose(self):
+        pass
+
 
 def _patch(monkeypatch, module, from_cache: bool):
     monkeypatch.setattr(
@@ -294,6 +298,9 @@ class TestDuplicateChunkEdgeCases:
                 call_count[0] += 1
                 return TRANSLATED, False  # always LLM
 
+            async def aclose(self):
+                pass
+
         monkeypatch.setattr(
             myst_file_translator,
             "build_translator_with_model",
@@ -347,3 +354,29 @@ class TestDuplicateChunkEdgeCases:
         ))
         chunks = read_chunks_with_metadata_from_myst(tgt)
         assert all(c.get("needs_review") is None for c in chunks)
+
+
+def test_translator_is_closed_even_when_a_chunk_fails(monkeypatch, tmp_path):
+    src = tmp_path / "source.md"
+    src.write_text("Hello world.\n", encoding="utf-8")
+    tgt = tmp_path / "target.md"
+    closed = []
+
+    class FailingTranslator:
+        async def translate_or_fetch(self, meta):
+            raise RuntimeError("boom")
+
+        async def aclose(self):
+            closed.append(True)
+
+    monkeypatch.setattr(
+        myst_file_translator,
+        "build_translator_with_model",
+        lambda *a, **kw: FailingTranslator(),
+    )
+    with pytest.raises(RuntimeError):
+        asyncio.run(myst_file_translator.translate_file_async(
+            src.parent, src, SRC, tgt, TGT, "source.md", None, None,
+        ))
+
+    assert closed == [True]
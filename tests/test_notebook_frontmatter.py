@@ -19,6 +19,9 @@ class FakeTranslator:
     async def translate_or_fetch(self, meta):
         return "Texte traduit.", False
 
+    async def aclose(self):
+        pass
+
 
 def _patch(monkeypatch):
     monkeypatch.setattr(
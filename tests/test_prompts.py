@@ -0,0 +1,75 @@
+import textwrap
+import unicodedata
+
+import pytest
+
+from trans_lib import prompts
+from trans_lib.enums import ChunkType, DocumentType, Language
+from trans_lib.prompts import prompt4
+from trans_lib.translator_retrieval import Meta, _plain_prompt_builder
+
+
+MYST_EXAMPLE = ":::{admonition} Définition : Programmes"
+LATEX_EXAMPLE = r"\text{tq}"
+
+
+def _plain_prompt(doc_type: DocumentType, chunk_type: ChunkType) -> str:
+    meta = Meta(
+        chunk="Une phrase à traduire.\n",
+        src_lang=Language.FRENCH,
+        tgt_lang=Language.UKRAINIAN,
+        doc_type=doc_type,
+        chunk_type=chunk_type,
+        vocab=None,
+        rel_path="docs/example",
+    )
+    prompt, _ = _plain_prompt_builder(prompt4)(meta)
+    return prompt
+
+
+def test_myst_examples_are_selected_for_markdown_input():
+    prompt = _plain_prompt(DocumentType.Markdown, ChunkType.Myst)
+
+    assert MYST_EXAMPLE in prompt
+    assert "[ARGUMENT_EXAMPLES]" not in prompt
+    assert "[PHRASE_EXAMPLES]" not in prompt
+
+
+def test_myst_examples_are_left_out_for_latex_input():
+    prompt = _plain_prompt(DocumentType.LaTeX, ChunkType.LaTeX)
+
+    assert MYST_EXAMPLE not in prompt
+    assert LATEX_EXAMPLE in prompt
+
+
+def test_prompt_examples_keep_every_fitting_example_by_default():
+    examples = prompts.select_prompt_examples("phrase", "French", "English", "LaTeX")
+    fitting = [
+        example
+        for example in prompts.PROMPT4_EXAMPLES
+        if example.group == "phrase" and example.content_type in (None, "LaTeX")
+    ]
+
+    assert sorted(examples, key=fitting.index) == fitting
+    assert (examples[0].source_language, examples[0].target_language) == ("French", "English")
+    assert len(prompts.select_prompt_examples("phrase", "French", "English", "LaTeX", limit=2)) == 2
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "prompt4",
+        "prompt_jupyter_code",
+        "prompt_jupyter_md",
+        "xml_translation_prompt",
+        "xml_with_previous_translation_prompt",
+    ],
+)
+def test_prompt_templates_are_canonical(name):
+    # every stray character of a template is paid for in tokens on each call
+    prompt = getattr(prompts, name)
+
+    assert all(line == line.rstrip(" \t") for line in prompt.split("\n"))
+    assert "\n\n\n" not in prompt
+    assert textwrap.dedent(prompt) == prompt
+    assert unicodedata.normalize("NFC", prompt) == prompt
@@ -0,0 +1,116 @@
+import asyncio
+import types
+
+from trans_lib import rate_limiter
+from trans_lib.rate_limiter import (
+    AsyncRateLimiter,
+    SlidingWindowLimiter,
+    retry_after_seconds,
+    shared_rate_limiter,
+)
+
+
+def test_rate_limiter_spaces_requests_after_the_burst(monkeypatch):
+    now = 100.0
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+
+    limiter = AsyncRateLimiter(2, 1.0, burst=2)
+
+    async def acquire_five():
+        for _ in range(5):
+            async with limiter:
+                pass
+
+    asyncio.run(acquire_five())
+
+    assert sleeps == [0.5, 1.0, 1.5]
+
+
+def test_rate_limiter_doesnt_wait_when_requests_are_spread(monkeypatch):
+    clock = [0.0]
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+
+    limiter = AsyncRateLimiter(60, 60.0)
+
+    async def acquire_every_two_seconds():
+        for _ in range(3):
+            await limiter.acquire()
+            clock[0] += 2.0
+
+    asyncio.run(acquire_every_two_seconds())
+
+    assert sleeps == []
+
+
+def test_sliding_window_waits_for_the_token_budget(monkeypatch):
+    clock = [0.0]
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        clock[0] += delay
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+
+    limiter = SlidingWindowLimiter(max_requests=10, max_tokens=100, window=60.0)
+
+    async def acquire_all():
+        await limiter.acquire(60)
+        clock[0] += 5.0
+        await limiter.acquire(30)
+        await limiter.acquire(30)  # 120 tokens would exceed the budget until the first entry expires
+        await limiter.acquire(500)  # bigger than the budget: admitted once the window is empty
+
+    asyncio.run(acquire_all())
+
+    assert sleeps == [55.0, 5.0, 55.0]
+
+
+def test_shared_rate_limiter_is_reused_for_the_same_limits():
+    assert shared_rate_limiter(30, 1000) is shared_rate_limiter(30, 1000)
+    assert shared_rate_limiter(30, 1000) is not shared_rate_limiter(60, 1000)
+
+
+def test_paused_limiter_holds_requests_back(monkeypatch):
+    clock = [0.0]
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        clock[0] += delay
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+
+    limiter = SlidingWindowLimiter(100, None)
+    limiter.pause(7.5)
+
+    asyncio.run(limiter.acquire())
+
+    assert sleeps == [7.5]
+
+
+def test_retry_after_is_read_from_the_message_or_the_original_response():
+    assert retry_after_seconds(Exception("429 RESOURCE_EXHAUSTED. Please retry in 23.5s.")) == 23.5
+    assert retry_after_seconds(Exception("details: {'retryDelay': '12s'}")) == 12.0
+    assert retry_after_seconds(Exception("model overloaded")) is None
+
+    http_error = Exception("Too Many Requests")
+    http_error.response = types.SimpleNamespace(headers={"retry-after": "4"})
+    try:
+        raise RuntimeError("wrapped") from http_error
+    except RuntimeError as exc:
+        assert retry_after_seconds(exc) == 4.0
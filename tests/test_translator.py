@@ -0,0 +1,18 @@
+import asyncio
+
+from trans_lib import translator
+
+
+def test_model_clients_of_the_loop_are_closed():
+    async def open_and_close():
+        client = translator._get_aristote_client()
+        await translator.aclose_model_clients()
+        reopened = translator._get_aristote_client()
+        await translator.aclose_model_clients()
+        return client, reopened
+
+    client, reopened = asyncio.run(open_and_close())
+
+    assert client.is_closed
+    assert reopened is not client
+    assert client.timeout.read is not None
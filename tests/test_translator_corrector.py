@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from trans_lib.constants import CACHE_DIR_NAME, CONF_DIR
+from trans_lib.enums import Language
+from trans_lib.errors import ChecksumNotFoundError
+from trans_lib.helpers import calculate_checksum
+from trans_lib.translation_cache.translation_cache import TranslationCacheCsv
+from trans_lib.translator_corrector import correct_chunk_translation
+
+
+SRC_TEXT = "Hello"
+TGT_TEXT = "Bonjour"
+REL = "docs/example.md"
+
+
+def _make_root_with_pair(tmp_path: Path) -> Path:
+    root = tmp_path / "proj"
+    (root / CONF_DIR).mkdir(parents=True)
+    TranslationCacheCsv(root).persist_pair(
+        calculate_checksum(SRC_TEXT),
+        calculate_checksum(TGT_TEXT),
+        Language.ENGLISH,
+        Language.FRENCH,
+        SRC_TEXT,
+        TGT_TEXT,
+        REL,
+    )
+    return root
+
+
+def test_correcting_with_the_recorded_translation_keeps_the_pair(tmp_path: Path) -> None:
+    root = _make_root_with_pair(tmp_path)
+    src_checksum = calculate_checksum(SRC_TEXT)
+
+    correct_chunk_translation(root, src_checksum, Language.ENGLISH, TGT_TEXT, Language.FRENCH, REL)
+
+    assert TranslationCacheCsv(root).lookup(src_checksum, Language.ENGLISH, Language.FRENCH, REL) == TGT_TEXT
+
+
+def test_recorded_pair_without_source_chunk_raises(tmp_path: Path) -> None:
+    root = _make_root_with_pair(tmp_path)
+    src_checksum = calculate_checksum(SRC_TEXT)
+    for chunk_path in (root / CONF_DIR / CACHE_DIR_NAME / str(Language.ENGLISH)).rglob(src_checksum):
+        chunk_path.unlink()
+
+    with pytest.raises(ChecksumNotFoundError):
+        correct_chunk_translation(root, src_checksum, Language.ENGLISH, TGT_TEXT, Language.FRENCH, REL)
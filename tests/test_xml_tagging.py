@@ -3,6 +3,8 @@ import xml.etree.ElementTree as ET
 import pytest
 
 from trans_lib.enums import ChunkType
+from trans_lib.helpers import extract_translated_from_response
+from trans_lib.xml_manipulator_mod.latex import parse_latex
 from trans_lib.xml_manipulator_mod.mod import chunk_to_xml_with_placeholders, latex_to_xml, myst_to_xml
 from trans_lib.xml_manipulator_mod.xml import reconstruct_from_xml
 
@@ -85,6 +87,19 @@ def test_latex_to_xml_preserves_text_segments_and_placeholders():
     assert "\\begin{align}" in reconstructed
 
 
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("It's plain prose, isn't it? [1]\n", [("text", "It's plain prose, isn't it? [1]\n")]),
+        ("\n\n", [("placeholder", "\n\n")]),
+        ("a -- b", [("text", "a "), ("placeholder", "--"), ("text", " b")]),
+        ("50% off\n", [("text", "50"), ("placeholder", "% "), ("text", " off"), ("placeholder", "\n")]),
+    ],
+)
+def test_latex_plain_prose_matches_walker_segments(source, expected):
+    assert parse_latex(source) == expected
+
+
 def test_myst_chunk_to_xml_produces_valid_xml():
     xml_output, placeholders = chunk_to_xml_with_placeholders(MYST_SAMPLE, ChunkType.Myst)
     print("---myst")
@@ -1046,3 +1061,17 @@ def test_myst_video_round_trip():
     xml_output, placeholders, _ = myst_to_xml(source)
     reconstructed = reconstruct_from_xml(xml_output, placeholders)
     assert reconstructed == source
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        ("noise <output>\nbody</output> trailer", "body"),
+        ("<output>\nfirst</output>\n<output>\nsecond</output>", "firstsecond"),
+        ("<output>\nunterminated", "unterminated"),
+        ("<document>kept</document>", "<document>kept</document>"),
+        ("no tags", ""),
+    ],
+)
+def test_extract_translated_from_response_segments(response, expected):
+    assert extract_translated_from_response(response) == expected